@@ -1,11 +1,19 @@
+import argparse
 import tkinter as tk
 from tkinter import ttk, messagebox
+from decimal import InvalidOperation
+
+import instrumentation
+from currency_engine import DEFAULT_EXCHANGE_RATES
+from currency_rates import RateStore
+from exact_money import ExactConverter
+from rate_fetcher import RateFetcher
 
 class CurrencyConverterApp:
     def __init__(self, master):
         self.master = master
         master.title("Currency Converter")
-        master.geometry("400x300") # Set a fixed window size
+        master.geometry("400x360") # Set a fixed window size
         master.resizable(False, False) # Make the window non-resizable
 
         # Define some colors for better aesthetics
@@ -20,13 +28,12 @@ class CurrencyConverterApp:
         # In a real application, you would fetch these from a reliable API.
         # Rates are relative to 1 GHS (Ghana Cedi).
         # Example: 1 USD = 10.5 GHS, so 1 GHS = 1/10.5 USD
-        self.exchange_rates = {
-            "GHS": 1.0,  # Ghana Cedi
-            "USD": 10.5, # US Dollar (1 USD = 10.5 GHS) - Bank of Ghana mid-rate
-            "EUR": 12.1166, # Euro (1 EUR = 12.1166 GHS) - Bank of Ghana mid-rate
-            "GBP": 13.9062, # British Pound (1 GBP = 13.9062 GHS) - Bank of Ghana mid-rate
-            # Add more currencies as needed
-        }
+        self.exchange_rates = dict(DEFAULT_EXCHANGE_RATES)
+        # Add more currencies in currency_engine.DEFAULT_EXCHANGE_RATES
+        # Cross rates for every pair are precomputed once; set_rate() refreshes a single currency
+        self.rate_store = RateStore(self.exchange_rates)
+        # Integer minor-unit converter for exact mode, built on first use
+        self.exact_converter = None
         self.currencies = sorted(list(self.exchange_rates.keys()))
 
         # --- GUI Elements ---
@@ -56,83 +63,118 @@ class CurrencyConverterApp:
         self.to_currency_menu = ttk.Combobox(master, textvariable=self.to_currency_var, values=self.currencies, state="readonly", width=17)
         self.to_currency_menu.grid(row=2, column=1, padx=10, pady=5, sticky="ew")
 
+        # Exact Mode Checkbox (integer minor-unit arithmetic instead of floats)
+        self.exact_mode_var = tk.BooleanVar(master, value=False)
+        self.exact_mode_check = tk.Checkbutton(master, text="Exact mode (rounded to the currency's minor unit)",
+                                               variable=self.exact_mode_var, bg=self.bg_color, fg=self.label_color,
+                                               font=('Arial', 9))
+        self.exact_mode_check.grid(row=3, column=0, columnspan=2, padx=10, sticky="w")
+
         # Convert Button
         self.convert_button = tk.Button(master, text="Convert", command=self.convert_currency,
                                         bg=self.button_color, fg=self.button_text_color,
                                         font=('Arial', 12, 'bold'), relief=tk.RAISED, bd=3)
-        self.convert_button.grid(row=3, column=0, columnspan=2, pady=20)
+        self.convert_button.grid(row=4, column=0, columnspan=2, pady=20)
 
         # Result Label
         self.result_label = tk.Label(master, text="Converted Amount: ", bg=self.bg_color, fg=self.label_color, font=('Arial', 12, 'bold'))
-        self.result_label.grid(row=4, column=0, columnspan=2, pady=10)
+        self.result_label.grid(row=5, column=0, columnspan=2, pady=10)
+
+        # Rate Status Label (shows where the current rates came from)
+        self.status_label = tk.Label(master, text="Using built-in rates.", bg=self.bg_color, fg=self.label_color, font=('Arial', 8))
+        self.status_label.grid(row=6, column=0, columnspan=2, pady=5)
 
         # Configure grid columns to expand
         master.grid_columnconfigure(1, weight=1)
 
+    @instrumentation.timed("command_seconds", app="converter", command="convert")
     def convert_currency(self):
         try:
-            amount = float(self.amount_entry.get())
+            amount_text = self.amount_entry.get().strip()
             from_currency = self.from_currency_var.get()
             to_currency = self.to_currency_var.get()
 
-            if from_currency not in self.exchange_rates or to_currency not in self.exchange_rates:
+            if from_currency not in self.rate_store or to_currency not in self.rate_store:
+                instrumentation.record_error("converter", "unsupported currency")
                 messagebox.showerror("Error", "Selected currencies are not supported.")
                 return
 
-            # Step 1: Convert the amount from the source currency to a common base (GHS in this case)
-            # If the source currency is GHS, amount_in_ghs is just the amount.
-            # Otherwise, amount_in_ghs = amount * rate_of_source_currency_to_GHS
-            amount_in_ghs = amount * self.exchange_rates[from_currency]
+            if self.exact_mode_var.get():
+                # Integer arithmetic in minor units; the result is already a rounded Decimal
+                if self.exact_converter is None:
+                    self.exact_converter = ExactConverter(self.exchange_rates)
+                with instrumentation.timer("conversion_seconds", mode="exact"):
+                    converted_amount = self.exact_converter.convert_decimal(amount_text, from_currency, to_currency)
+                self.result_label.config(text=f"Converted Amount: {converted_amount} {to_currency}")
+                return
 
-            # Step 2: Convert from the common base (GHS) to the target currency
-            # If the target currency is GHS, converted_amount is amount_in_ghs.
-            # Otherwise, converted_amount = amount_in_ghs / rate_of_target_currency_to_GHS
-            converted_amount = amount_in_ghs / self.exchange_rates[to_currency]
+            # One lookup in the precomputed cross-rate matrix (source_rate / target_rate)
+            with instrumentation.timer("conversion_seconds", mode="float"):
+                converted_amount = self.rate_store.convert(float(amount_text), from_currency, to_currency)
 
             self.result_label.config(text=f"Converted Amount: {converted_amount:.2f} {to_currency}")
 
-        except ValueError:
+        except (ValueError, InvalidOperation) as e:
+            instrumentation.record_error("converter", e)
             messagebox.showerror("Invalid Input", "Please enter a valid numeric amount.")
         except Exception as e:
+            instrumentation.record_error("converter", e)
             messagebox.showerror("Error", f"An unexpected error occurred: {e}")
 
     def fetch_realtime_rates(self):
         """
-        Placeholder function to demonstrate where you would fetch real-time rates.
-        You would typically use a library like 'requests' to call a currency exchange API.
-        Examples of APIs: Open Exchange Rates, Fixer.io, ExchangeRate-API, etc.
-
-        Example using 'requests':"""
-        import requests
-        API_KEY = "YOUR_API_KEY"
-        BASE_URL = "https://api.exchangerate-api.com/v4/latest/USD" # Or your chosen base currency
-
-        try:
-            response = requests.get(BASE_URL)
-            response.raise_for_status() # Raise an exception for HTTP errors
-            data = response.json()
-            # Assuming data['rates'] contains currency codes mapped to their rates relative to BASE_URL
-            # You would then process this data to update self.exchange_rates
-            # For this app, you'd likely want rates relative to GHS.
-            # If API provides rates relative to USD, then GHS_rate_vs_USD = data['rates']['GHS']
-            # And then update self.exchange_rates accordingly:
-            # self.exchange_rates = {currency: 1 / data['rates'][currency] * GHS_rate_vs_USD for currency in data['rates']}
-            # Or fetch rates directly relative to GHS if the API supports it.
-
-            messagebox.showinfo("Rates Updated", "Exchange rates have been updated successfully!")
-
-        except requests.exceptions.RequestException as e:
-            messagebox.showerror("Network Error", f"Could not fetch real-time rates: {e}")
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred while parsing rates: {e}")
-        
-        messagebox.showinfo("Real-time Rates", "This function would fetch real-time rates from an API. For this demo, rates are static.")
+        Loads cached rates straight away and refreshes them in the background.
+        The network request runs on a worker thread, so the window never freezes;
+        results come back through a queue that is polled with after().
+        """
+        self.rate_fetcher = RateFetcher()
+        self.rate_updates = self.rate_fetcher.updates_queue()
+        cached_rates = self.rate_fetcher.start()
+        if cached_rates:
+            self.apply_rates(cached_rates)
+            self.status_label.config(text="Using cached rates.")
+        self.master.after(200, self.poll_rate_updates)
+
+    def poll_rate_updates(self):
+        """
+        Applies any rate updates delivered by the background fetcher.
+        Runs on the Tk main thread and reschedules itself.
+        """
+        while not self.rate_updates.empty():
+            rates, error = self.rate_updates.get_nowait()
+            if error is not None:
+                self.status_label.config(text=f"Could not fetch real-time rates: {error}")
+            else:
+                try:
+                    self.apply_rates(rates)
+                except ValueError as e:  # The old rates stay in place
+                    self.status_label.config(text=f"Could not use the fetched rates: {e}")
+                else:
+                    self.status_label.config(text="Exchange rates have been updated.")
+        # Stale rates are revalidated in the background on the next read
+        self.rate_fetcher.get_rates()
+        self.master.after(1000, self.poll_rate_updates)
+
+    @instrumentation.timed("command_seconds", app="converter", command="apply_rates")
+    def apply_rates(self, rates):
+        """Replaces the rate table and refreshes the currency dropdowns."""
+        self.rate_store.load(rates)  # Raises ValueError before changing anything
+        self.exchange_rates = dict(rates)
+        self.exact_converter = None  # Rebuilt from the new rates on next exact conversion
+        self.currencies = sorted(self.exchange_rates)
+        self.from_currency_menu.config(values=self.currencies)
+        self.to_currency_menu.config(values=self.currencies)
 
 
 # --- Main execution block ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Currency converter.")
+    instrumentation.add_arguments(parser)  # Timings of conversions, rate fetches and cache files
+    instrumentation.configure(parser.parse_args())
     root = tk.Tk()
     app = CurrencyConverterApp(root)
-    # You could add a button to trigger fetch_realtime_rates or call it on app start
-    app.fetch_realtime_rates() # Uncomment to see the info message on startup
+    # With metrics on: F9 starts / stops a profile, F10 takes a memory snapshot
+    instrumentation.bind_keys(root, report=lambda message: app.status_label.config(text=message))
+    # Starts the background rate refresh; the window opens without waiting for it
+    app.fetch_realtime_rates()
     root.mainloop()
\ No newline at end of file
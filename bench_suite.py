@@ -0,0 +1,439 @@
+import argparse
+import contextlib
+import datetime
+import fnmatch
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+import types
+
+import numpy as np
+
+# --- Benchmark Suite ---
+# Times the pure parts of every script, headlessly (no Tkinter, no stdin):
+#
+#   calculator.*   calc_core arithmetic, expressions, NumPy paths and batch lines
+#   currency.*     the converter's per-call and batch math, float and exact
+#   todo.*         "to do list.py" load_tasks / save_tasks at scale, and edits
+#   guessing.*     the guessing loop driven by a solver, and the simulator
+#   script.*       only what the original scripts already had: the calculator
+#                  functions, convert_currency and the to-do load/save API
+#
+# Each case is timed like timeit: autorange picks a call count that runs for
+# at least 0.2 s, one untimed round warms up, then that is repeated and the
+# median per-call time kept.
+# Results are JSON. A run is compared with a stored baseline (default
+# bench_baseline.json), flagging cases more than --threshold slower; the exit
+# status is 1 if any regressed. Baselines only mean something on the machine
+# that recorded them, so the machine is stored with the results.
+#
+#   python bench_suite.py                  run, compare with the baseline
+#   python bench_suite.py --save-baseline  run and record a new baseline
+#   python bench_suite.py -k "todo.*" --json results.json
+#
+# The script.* cases also run against the scripts of another checkout, such
+# as the original commit, so today's scripts can be compared with them:
+#
+#   git worktree add /tmp/original 5ed4ddf
+#   python bench_suite.py --scripts /tmp/original --baseline bench_baseline_original.json --save-baseline
+#   python bench_suite.py -k "script.*" --baseline bench_baseline_original.json
+
+BASELINE_FILE = "bench_baseline.json"
+ORIGINAL_BASELINE_FILE = "bench_baseline_original.json"  # script.* cases on the original commit
+THRESHOLD = 0.25  # Flag cases more than 25% slower than the baseline
+REPEAT = 5
+
+CASES = {}  # name -> setup(stack) returning the function to time
+SCRIPTS_DIR = None  # Where _script() loads the scripts from; None for this project
+
+
+def case(name):
+    """Registers a setup function. It gets an ExitStack for cleanup and returns a no-argument callable."""
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _script(filename):
+    from calc_core.stream import load_script
+    return load_script(filename, SCRIPTS_DIR)
+
+
+# --- Calculator ---
+
+@case("calculator.scalar_ops")
+def _calculator_scalar_ops(stack):
+    from calc_core import add, divide, multiply, power, square_root, subtract
+
+    def run():
+        add(1.5, 2.25, 3.0)
+        subtract(10.0, 4.5)
+        multiply(2.0, 3.5, 4.0)
+        divide(22.0, 7.0)
+        power(2.0, 10.0)
+        square_root(2.0)
+    return run
+
+
+@case("calculator.expression")
+def _calculator_expression(stack):
+    from calc_core.expr import evaluate
+    return lambda: evaluate("3 * x ^ 2 + 2 * x * y - y / 4 + √(x * x + 1)", x=1.5, y=-2.0)
+
+
+@case("calculator.sqrt_array_1e6")
+def _calculator_sqrt_array(stack):
+    from calc_core.ufuncs import square_root_masked
+    numbers = np.random.default_rng(0).uniform(-1, 100, 1_000_000)
+    return lambda: square_root_masked(numbers)
+
+
+@case("calculator.batch_lines_1e4")
+def _calculator_batch_lines(stack):
+    from calc_core.batch import process_chunk, run_batch
+    # A quote inside an unquoted field is literal: it must not swallow the rows after it
+    results = io.StringIO()
+    run_batch(io.StringIO('add,1"2,3\nadd,1,2\nadd,"1\n",2\n'), results, "csv", workers=1)
+    assert results.getvalue().splitlines()[1:] == ["3.0,", "3.0,"]
+    lines = [f"{('add', 'divide', 'power', 'sqrt')[i % 4]},{i},{i % 7 + 1}\n" for i in range(10_000)]
+    lines = [line if not line.startswith("sqrt") else line.rsplit(",", 1)[0] + "\n" for line in lines]
+    return lambda: process_chunk(lines, "csv")
+
+
+# --- Currency ---
+
+@case("currency.convert_amount")
+def _currency_convert_amount(stack):
+    from currency_engine import DEFAULT_EXCHANGE_RATES, convert_amount
+    return lambda: convert_amount(125.0, "USD", "EUR", DEFAULT_EXCHANGE_RATES)
+
+
+@case("currency.rate_store_convert")
+def _currency_rate_store_convert(stack):
+    # What the GUI's convert_currency does for the float result
+    from currency_engine import DEFAULT_EXCHANGE_RATES
+    from currency_rates import RateStore
+    store = RateStore(DEFAULT_EXCHANGE_RATES)
+    return lambda: store.convert(125.0, "USD", "EUR")
+
+
+@case("currency.exact_convert")
+def _currency_exact_convert(stack):
+    # The GUI's exact mode
+    from currency_engine import DEFAULT_EXCHANGE_RATES
+    from exact_money import ExactConverter
+    converter = ExactConverter(DEFAULT_EXCHANGE_RATES)
+    return lambda: converter.convert_decimal("125.37", "USD", "EUR")
+
+
+@case("currency.batch_convert_1e6")
+def _currency_batch_convert(stack):
+    from currency_engine import DEFAULT_EXCHANGE_RATES, BatchConverter
+    converter = BatchConverter(DEFAULT_EXCHANGE_RATES)
+    rng = np.random.default_rng(0)
+    codes = np.array(list(DEFAULT_EXCHANGE_RATES))
+    amounts = rng.uniform(0, 1000, 1_000_000)
+    from_codes = codes[rng.integers(0, len(codes), 1_000_000)]
+    to_codes = codes[rng.integers(0, len(codes), 1_000_000)]
+    return lambda: converter.convert(amounts, from_codes, to_codes)
+
+
+@case("currency.exact_batch_1e6")
+def _currency_exact_batch(stack):
+    # Minor units in and out; exact_money.py also checks it against the float batch
+    from currency_engine import DEFAULT_EXCHANGE_RATES
+    from exact_money import ExactConverter
+    converter = ExactConverter(DEFAULT_EXCHANGE_RATES)
+    rng = np.random.default_rng(0)
+    minor_units = rng.integers(-10**12, 10**12, 1_000_000)
+    pairs = converter.pair_indexes(rng.integers(0, len(converter.codes), 1_000_000),
+                                   rng.integers(0, len(converter.codes), 1_000_000))
+    return lambda: converter.convert_pairs(minor_units, pairs)
+
+
+@case("currency.service_requests_1e4")
+def _currency_service_requests(stack):
+    # What the CLI and HTTP service do per batch of parsed JSON requests
+    from currency_service import ConversionCore
+    core = ConversionCore()
+    bad = [{"amount": 10 ** 400, "from": "USD", "to": "EUR"}, {"amount": "ten", "from": "USD", "to": "EUR"},
+           {"amount": 1, "from": ["USD"], "to": "EUR"}, {"amount": 1, "from": "USD", "to": "XXX"},
+           {"amount": 1e308, "from": "EUR", "to": "GHS"}]
+    assert all("error" in result for result in core.convert_requests(bad))
+    codes = list(core.converter.codes)
+    requests = [{"amount": i * 0.5, "from": codes[i % len(codes)], "to": codes[(i // 3) % len(codes)]}
+                for i in range(10_000)]
+    return lambda: core.convert_requests(requests)
+
+
+# --- To-Do List ---
+
+def _todo_script(stack, task_count):
+    """The to-do script pointed at a temporary list of task_count tasks."""
+    from todo_journal import JournaledTaskStore
+    todo = _script("to do list.py")
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    todo.TODO_FILE = os.path.join(directory, "todo_list.txt")
+    todo.TODO_DB_FILE = os.path.join(directory, "todo_list.db")
+    store = JournaledTaskStore(todo.TODO_FILE)
+    store.add_many(f"Task {i} !{i % 5 + 1} due:2025-{i % 12 + 1:02d}-{i % 28 + 1:02d} #tag{i % 20}"
+                   for i in range(task_count))
+    store.compact(wait=True)
+    store.close()
+    return todo
+
+
+@case("todo.load_save_1e5")
+def _todo_load_save(stack):
+    todo = _todo_script(stack, 100_000)
+    return lambda: todo.save_tasks(todo.load_tasks())
+
+
+@case("todo.add_delete")
+def _todo_add_delete(stack):
+    todo = _todo_script(stack, 100_000)
+    tasks = todo.load_tasks()
+    stack.callback(todo.save_tasks, tasks)
+    return lambda: tasks.delete(tasks.add("Benchmark task !2 due:2025-06-01 #bench"))
+
+
+@case("todo.next_due_1e5")
+def _todo_next_due(stack):
+    todo = _todo_script(stack, 100_000)
+    tasks = todo.load_tasks()
+    stack.callback(todo.save_tasks, tasks)
+    return lambda: tasks.index.next_due(20)
+
+
+# --- Guessing Game ---
+
+@case("guessing.solver_games_1e3")
+def _guessing_solver_games(stack):
+    from guessing_engine import BinarySearch, GuessingGame, play
+    from guessing_rng import SecretSource
+    strategy = BinarySearch()
+
+    def run():
+        source = SecretSource(0)
+        for _ in range(1000):
+            play(strategy, GuessingGame(1, 100, rng=source))
+    return run
+
+
+@case("guessing.script_solver_game")
+def _guessing_script_game(stack):
+    # The script's own loop, with a solver in place of stdin
+    game = _script("number guesssing using python.py")
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            game.main(["--solver", "binary", "--seed", "1"])
+    return run
+
+
+@case("guessing.simulate_1e6")
+def _guessing_simulate(stack):
+    from guessing_engine import BinarySearch, simulate
+    strategy = BinarySearch()
+    return lambda: simulate(strategy, 1_000_000, seed=0)
+
+
+# --- Original Script API ---
+# These only use names the original scripts already had, so they run against
+# either tree (see --scripts).
+
+class _Field:
+    """Stands in for a Tk entry, variable or label in a headless run."""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def config(self, **options):
+        self.value = options.get("text", self.value)
+
+
+@case("script.calculator_functions")
+def _script_calculator_functions(stack):
+    calculator = _script("python assignment2.py")
+
+    def run():
+        calculator.add(1.5, 2.25, 3.0)
+        calculator.subtract(10.0, 4.5)
+        calculator.multiply(2.0, 3.5, 4.0)
+        calculator.divide(22.0, 7.0)
+        calculator.power(2.0, 10.0)
+        calculator.square_root(2.0)
+    return run
+
+
+@case("script.convert_currency")
+def _script_convert_currency(stack):
+    # The Convert button's handler on a stand-in for the window; the original's rates
+    from currency_rates import RateStore
+    converter = _script("MoneyCONVERTER GUI APP.py")
+    rates = {"GHS": 1.0, "USD": 10.5, "EUR": 12.1166, "GBP": 13.9062}
+    app = types.SimpleNamespace(
+        amount_entry=_Field("125.37"), from_currency_var=_Field("USD"), to_currency_var=_Field("EUR"),
+        result_label=_Field(), exchange_rates=rates, rate_store=RateStore(rates),
+        exact_mode_var=_Field(False), exact_converter=None)
+    convert_currency = converter.CurrencyConverterApp.convert_currency
+    convert_currency(app)
+    assert app.result_label.get() == "Converted Amount: 108.64 EUR", app.result_label.get()
+    return lambda: convert_currency(app)
+
+
+@case("script.todo_load_save_1e5")
+def _script_todo_load_save(stack):
+    # Starts from a plain one-task-per-line file, the original format
+    todo = _script("to do list.py")
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    todo.TODO_FILE = os.path.join(directory, "todo_list.txt")
+    with open(todo.TODO_FILE, "w") as file:
+        file.writelines(f"Task {i}\n" for i in range(100_000))
+    return lambda: todo.save_tasks(todo.load_tasks())
+
+
+# --- Running and Comparing ---
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_case(name, repeat=REPEAT):
+    """Times one case. Returns {"seconds": median per call, "min", "max", "number", "repeat"}."""
+    with contextlib.ExitStack() as stack:
+        function = CASES[name](stack)
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        timer.timeit(number)  # Warm-up round, not counted: the first rounds of a fresh module run slow
+        times = [seconds / number for seconds in timer.repeat(repeat, number)]
+    return {"seconds": statistics.median(times), "min": min(times), "max": max(times),
+            "number": number, "repeat": repeat}
+
+
+def run_suite(patterns=None, repeat=REPEAT, progress=None):
+    """Runs every case matching one of the glob patterns (all if None). Returns the results document."""
+    names = [name for name in CASES if not patterns or any(fnmatch.fnmatch(name, p) for p in patterns)]
+    results = {}
+    for name in names:
+        results[name] = run_case(name, repeat)
+        if progress:
+            progress(name, results[name])
+    return {"created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "machine": machine_info(), "results": results}
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """
+    Compares two results documents. Returns rows of (name, baseline seconds,
+    current seconds, ratio, verdict); verdict is "regression", "faster", "ok",
+    "new" (no baseline) or "missing" (not run this time).
+    """
+    rows = []
+    old_results, new_results = baseline["results"], current["results"]
+    for name in dict.fromkeys([*new_results, *old_results]):
+        old = old_results.get(name, {}).get("seconds")
+        new = new_results.get(name, {}).get("seconds")
+        if old is None or new is None:
+            rows.append((name, old, new, None, "new" if old is None else "missing"))
+            continue
+        ratio = new / old
+        verdict = "regression" if ratio > 1 + threshold else "faster" if ratio < 1 / (1 + threshold) else "ok"
+        rows.append((name, old, new, ratio, verdict))
+    return rows
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark suite for every script, with baseline comparison.")
+    parser.add_argument("-k", dest="patterns", action="append", help="Only cases matching this glob (repeatable).")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit.")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON ('-' for stdout).")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help=f"Baseline to compare with (default {BASELINE_FILE}).")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"Slowdown that counts as a regression (default {THRESHOLD:.0%}).")
+    parser.add_argument("--scripts", metavar="DIR",
+                        help="Load the scripts from DIR, e.g. a checkout of the original commit "
+                             "(runs the script.* cases only).")
+    args = parser.parse_args(argv)
+    global SCRIPTS_DIR
+    if args.scripts:
+        if not os.path.isdir(args.scripts):
+            parser.error(f"{args.scripts} is not a directory.")
+        if args.patterns and not all(pattern.startswith("script.") for pattern in args.patterns):
+            parser.error("--scripts only runs the script.* cases.")
+        SCRIPTS_DIR = os.path.abspath(args.scripts)
+        args.patterns = args.patterns or ["script.*"]
+
+    if args.list:
+        print("\n".join(CASES))
+        return 0
+    log = sys.stderr if args.json == "-" else sys.stdout
+
+    def progress(name, result):
+        print(f"  {name:<32} {_format_seconds(result['seconds']):>10}  "
+              f"(min {_format_seconds(result['min'])}, {result['number']} x {result['repeat']})", file=log)
+
+    current = run_suite(args.patterns, args.repeat, progress)
+    if args.json == "-":
+        json.dump(current, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+            file.write("\n")
+        print(f"Saved baseline to {args.baseline}.", file=log)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --save-baseline.", file=log)
+        return 0
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    if baseline.get("machine") != current["machine"]:
+        print("Note: the baseline was recorded on a different machine or setup.", file=log)
+    print(f"\nAgainst {args.baseline} (recorded {baseline.get('created', '?')}):", file=log)
+    regressions = 0
+    for name, old, new, ratio, verdict in compare(current, baseline, args.threshold):
+        if args.patterns and verdict == "missing":
+            continue  # Filtered out, not gone
+        change = f"{ratio:6.2f}x" if ratio is not None else "      "
+        flag = {"regression": "  <-- REGRESSION", "faster": "  (faster)"}.get(verdict, f"  ({verdict})" if ratio is None else "")
+        print(f"  {name:<32} {_format_seconds(old):>10} -> {_format_seconds(new):>10} {change}{flag}", file=log)
+        regressions += verdict == "regression"
+    if regressions:
+        print(f"{regressions} case(s) more than {args.threshold:.0%} slower than the baseline.", file=log)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
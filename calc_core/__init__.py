@@ -0,0 +1,34 @@
+"""
+Shared arithmetic kernel for the calculator front ends.
+
+The scalar operations are imported straight away (they only need math).
+Heavier submodules are loaded on first attribute access, so importing
+calc_core never pulls in NumPy:
+
+    calc_core.ufuncs   array-aware versions of every operation (NumPy)
+    calc_core.stream   streaming and chunked reductions over iterables
+    calc_core.expr     expression parser and compiled evaluator
+    calc_core.bignum   high-precision power and multiply
+    calc_core.batch    file-driven batch mode over a process pool
+    calc_core.worker   cancellable background process for GUI calculations
+    calc_core.history  persistent calculation history with a result memo
+"""
+import importlib
+
+from .scalar import add, subtract, multiply, divide, power, square_root
+
+_LAZY_SUBMODULES = ("ufuncs", "stream", "expr", "bignum", "batch", "worker", "history")
+
+__all__ = ["add", "subtract", "multiply", "divide", "power", "square_root", *_LAZY_SUBMODULES]
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_SUBMODULES))
@@ -0,0 +1,48 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+# --- Import Time Check ---
+# python -m calc_core importtime
+# Measures how long "import calc_core" takes in a fresh interpreter, so the
+# calculator CLI startup stays small, and checks that NumPy is not imported.
+
+IMPORT_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import calc_core\n"
+    "elapsed = time.perf_counter() - start\n"
+    "print(elapsed, 'numpy' in sys.modules)\n"
+)
+
+
+def measure_import_time(runs=10):
+    """Returns (median_seconds, numpy_was_imported) over fresh interpreters."""
+    timings = []
+    numpy_loaded = False
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], capture_output=True, text=True, check=True)
+        seconds, loaded = output.stdout.split()
+        timings.append(float(seconds))
+        numpy_loaded = numpy_loaded or loaded == "True"
+    return statistics.median(timings), numpy_loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m calc_core", description="calc_core maintenance commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    importtime_parser = subparsers.add_parser("importtime", help="Measure the package import time.")
+    importtime_parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    seconds, numpy_loaded = measure_import_time(args.runs)
+    print(f"import calc_core: {seconds * 1000:.2f} ms (median of {args.runs})")
+    if numpy_loaded:
+        print("Warning: importing calc_core pulled in NumPy.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
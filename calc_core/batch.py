@@ -0,0 +1,219 @@
+import argparse
+import collections
+import csv
+import io
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .scalar import add, subtract, multiply, divide, power, square_root
+
+# --- Batch Calculator ---
+# Replays recorded calculations without prompts. Input is one calculation per line:
+#   CSV:     op,operand1,operand2,...            e.g.  add,1,2,3
+#   NDJSON:  {"op": "add", "operands": [1, 2, 3]}
+# Operations may be given by name or symbol: add +, subtract -, multiply *,
+# divide /, power ^, sqrt √. Results are written in input order, one line each:
+#   CSV:     result,error
+#   NDJSON:  the input object plus "result" or "error"
+# A row fails on its own (an error instead of a result) for bad input and for
+# results that are not a finite real number, such as (-8) ^ 0.5 or an overflow.
+# Large inputs are split into chunks and spread across a process pool; CSV
+# input is split between records, so quoted fields may contain newlines.
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+OPERATIONS = {
+    "add": add, "+": add,
+    "subtract": subtract, "-": subtract,
+    "multiply": multiply, "*": multiply,
+    "divide": divide, "/": divide,
+    "power": power, "^": power,
+    "sqrt": square_root, "square_root": square_root, "√": square_root,
+}
+
+
+def calculate(op, operands):
+    """Runs one operation. Raises ValueError for unknown operations or bad operands."""
+    function = OPERATIONS.get(str(op).strip().lower())
+    if function is None:
+        raise ValueError(f"Unknown operation: {op!r}")
+    operands = [float(operand) for operand in operands]
+    if function is power:
+        if len(operands) != 2:
+            raise ValueError("power needs exactly 2 operands.")
+    elif function is square_root:
+        if len(operands) != 1:
+            raise ValueError("sqrt needs exactly 1 operand.")
+    return function(*operands)
+
+
+def _real_result(op, operands):
+    # Batch output is a plain number: complex, infinite and NaN results are row errors
+    result = calculate(op, operands)
+    if isinstance(result, complex):
+        raise ValueError("The result is not a real number.")
+    if not math.isfinite(result):
+        raise OverflowError("The result is too large.")
+    return result
+
+
+def _error_message(error):
+    if isinstance(error, OverflowError) and len(error.args) != 1:
+        return "The result is too large."  # math errors carry (errno, text) args
+    return str(error)
+
+
+def _csv_lines(records):
+    # csv module on both sides, so quoted fields and errors containing commas round-trip.
+    # Each record is one row's text; a malformed row is reported and the rest go on
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    rows = csv.reader(records)
+    for _ in records:
+        try:
+            fields = next(rows)
+            writer.writerow((repr(_real_result(fields[0], fields[1:])), ""))
+        except csv.Error as e:
+            writer.writerow(("", f"Malformed CSV row: {e}"))
+        except (ValueError, ArithmeticError) as e:
+            writer.writerow(("", _error_message(e)))
+    return buffer.getvalue().splitlines()
+
+
+def _ndjson_line(line):
+    try:
+        record = json.loads(line)
+        operation, operands = record["op"], record.get("operands", [])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return json.dumps({"error": "Each line needs a JSON object with 'op' and 'operands'."})
+    try:
+        record["result"] = _real_result(operation, operands)
+    except (ValueError, ArithmeticError, TypeError) as e:
+        record["error"] = _error_message(e)
+    return json.dumps(record)
+
+
+def process_chunk(lines, input_format):
+    """Computes one chunk of input lines and returns the output lines (top-level, so it pickles)."""
+    if input_format == "ndjson":
+        return [_ndjson_line(line) for line in lines]
+    return _csv_lines(lines)
+
+
+def detect_format(first_line):
+    return "ndjson" if first_line.lstrip().startswith("{") else "csv"
+
+
+def _csv_records(lines):
+    # Joins physical lines into records. A line without quotes is a record by
+    # itself; from a line with quotes, the csv reader decides where the record
+    # ends (only a quote that opens a field carries it onto the next line), and
+    # the record is the text of the lines it read.
+    lines = iter(lines)
+    consumed = []
+
+    def feed():
+        yield consumed[0]
+        for line in lines:
+            consumed.append(line)
+            yield line
+
+    for line in lines:
+        if '"' not in line:
+            yield line
+            continue
+        consumed = [line]
+        try:
+            next(csv.reader(feed()))
+        except csv.Error:
+            pass  # _csv_lines reports it when it parses the record again
+        yield "".join(consumed)
+
+
+def _chunks(lines, chunk_size):
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(infile, outfile, input_format=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Streams calculations from infile to outfile in input order.
+    workers=1 computes inline; otherwise chunks go to a process pool, with at most
+    two chunks per worker in flight so memory stays bounded on huge inputs.
+    Returns (line_count, elapsed_seconds).
+    """
+    start = time.perf_counter()
+    lines = iter(infile)
+    first = next((line for line in lines if line.strip()), None)
+    if first is None:
+        return 0, time.perf_counter() - start
+    if input_format is None:
+        input_format = detect_format(first)
+    lines = itertools.chain([first], lines)
+    records = _csv_records(lines) if input_format == "csv" else (line.rstrip("\r\n") for line in lines)
+    chunks = _chunks((record for record in records if record.strip()), chunk_size)
+    workers = workers or os.cpu_count() or 1
+    count = 0
+
+    if workers == 1:
+        for chunk in chunks:
+            outfile.write("\n".join(process_chunk(chunk, input_format)) + "\n")
+            count += len(chunk)
+        return count, time.perf_counter() - start
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append((len(chunk), executor.submit(process_chunk, chunk, input_format)))
+            if len(pending) >= workers * 2:
+                size, future = pending.popleft()
+                outfile.write("\n".join(future.result()) + "\n")
+                count += size
+        while pending:
+            size, future = pending.popleft()
+            outfile.write("\n".join(future.result()) + "\n")
+            count += size
+    return count, time.perf_counter() - start
+
+
+def run_batch_files(input_path, output_path=None, input_format=None, workers=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE, report=sys.stderr):
+    """
+    run_batch on file paths ("-" or None for stdin/stdout) with a throughput report.
+    """
+    infile = sys.stdin if input_path in (None, "-") else open(input_path, "r", encoding="utf-8", newline="")
+    outfile = sys.stdout if output_path in (None, "-") else open(output_path, "w", encoding="utf-8")
+    try:
+        count, seconds = run_batch(infile, outfile, input_format, workers, chunk_size)
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    if report is not None:
+        rate = count / seconds if seconds else 0.0
+        print(f"Processed {count:,} calculations in {seconds:.2f}s ({rate:,.0f}/s)", file=report)
+    return count, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m calc_core.batch", description="Run calculations from a CSV or NDJSON file.")
+    parser.add_argument("input", nargs="?", default="-", help="Input file ('-' for stdin).")
+    parser.add_argument("-o", "--output", default="-", help="Output file ('-' for stdout).")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="Input format (detected from the first line by default).")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count, 1 = no pool).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Lines per chunk.")
+    args = parser.parse_args(argv)
+    run_batch_files(args.input, args.output, args.format, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import argparse
+import operator
+import random
+import time
+from decimal import Decimal, Context, InvalidOperation, MAX_EMAX, MIN_EMIN, ROUND_HALF_EVEN
+from functools import lru_cache
+
+from .scalar import multiply
+
+# --- High-Precision Power and Multiply ---
+# Integer operands stay Python ints (exact, any size). Non-integers are read as
+# Decimal and split into an integer coefficient and a power of ten, so products
+# are exact integer products too; only the final result is rounded to
+# `precision` significant digits.
+#
+#   power(base, exponent)      binary (square-and-multiply) exponentiation for
+#                              integer exponents, optional modulus, LRU-memoized
+#   multiply(*numbers)         balanced product tree instead of a left fold, so
+#                              big operands are multiplied in similar sizes
+
+DEFAULT_PRECISION = 50
+GUARD_DIGITS = 10
+POWER_CACHE_SIZE = 1024
+
+
+def _context(precision):
+    """A Decimal context with `precision` digits and the widest exponent range."""
+    return Context(prec=precision, rounding=ROUND_HALF_EVEN, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+
+def to_exact(value):
+    """
+    Converts an int, float, str or Decimal to an int when it is integral,
+    otherwise to a Decimal. Floats go through their shortest repr ("0.1" not
+    0.1000000000000000055...). Raises ValueError for anything else.
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    try:
+        number = Decimal(repr(value)) if isinstance(value, float) else Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Not a number: {value!r}") from None
+    if not number.is_finite():
+        raise ValueError(f"Not a finite number: {value!r}")
+    if number == number.to_integral_value():
+        return int(number)
+    return number
+
+
+def _split(number):
+    """Returns (coefficient, exponent) with number == coefficient * 10**exponent."""
+    if isinstance(number, int):
+        return number, 0
+    sign, digits, exponent = number.as_tuple()
+    coefficient = int("".join(map(str, digits))) if digits else 0
+    return (-coefficient if sign else coefficient), exponent
+
+
+def _int_to_decimal(value, precision):
+    """
+    Converts an int to a Decimal with `precision` significant digits. Huge ints
+    are approximated from their top bits (value ~= top * 2**shift), which avoids
+    a full int-to-decimal conversion that is quadratic in the number of digits.
+    """
+    if value.bit_length() <= (precision + GUARD_DIGITS) * 4:
+        return _context(precision).plus(Decimal(value))
+    shift = value.bit_length() - (precision + GUARD_DIGITS) * 4
+    context = _context(precision + GUARD_DIGITS)
+    approximate = context.multiply(Decimal(value >> shift), context.power(Decimal(2), shift))
+    return _context(precision).plus(approximate)
+
+
+def _round(coefficient, exponent, precision):
+    """Builds coefficient * 10**exponent, rounded to precision significant digits."""
+    if precision is None:
+        if exponent >= 0:
+            return coefficient * 10 ** exponent
+        return Decimal(coefficient).scaleb(exponent)
+    return _int_to_decimal(coefficient, precision).scaleb(exponent)
+
+
+def product_tree(values):
+    """Multiplies a list of ints pairwise, level by level (balanced tree)."""
+    values = list(values)
+    if not values:
+        return 1
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def multiply_exact(*numbers, precision=DEFAULT_PRECISION):
+    """
+    Multiplies any number of operands exactly with a product tree.
+    Integer inputs give an exact int. Otherwise the result is a Decimal
+    rounded to `precision` significant digits (precision=None keeps every digit).
+    Returns 1 if no numbers.
+    """
+    parts = [_split(to_exact(number)) for number in numbers]
+    coefficient = product_tree(part[0] for part in parts)
+    exponent = sum(part[1] for part in parts)
+    if exponent == 0 and all(isinstance(number, int) for number in numbers):
+        return coefficient
+    return _round(coefficient, exponent, precision)
+
+
+@lru_cache(maxsize=POWER_CACHE_SIZE)
+def _power_cached(base, exponent, precision, modulus):
+    precision = precision or DEFAULT_PRECISION
+    if isinstance(exponent, int):
+        if modulus is not None:
+            if not isinstance(base, int):
+                raise ValueError("A modulus needs an integer base.")
+            return pow(base, exponent, modulus)
+        if isinstance(base, int) and exponent >= 0:
+            return _binary_power(base, exponent)
+        if base == 0 and exponent < 0:
+            raise ValueError("Zero cannot be raised to a negative power.")
+        # Decimal square-and-multiply; every step rounds, so carry guard digits
+        # that grow with the number of steps
+        context = _context(precision + GUARD_DIGITS + abs(exponent).bit_length())
+        result = _binary_power(Decimal(base), abs(exponent), context.multiply)
+        if exponent < 0:
+            result = context.divide(Decimal(1), result)
+        return _context(precision).plus(result)
+
+    # Non-integer exponent: Decimal's correctly rounded power (needs base >= 0)
+    if modulus is not None:
+        raise ValueError("A modulus needs an integer exponent.")
+    if base < 0:
+        raise ValueError("A negative base needs an integer exponent.")
+    return _context(precision).power(Decimal(base), exponent)
+
+
+def _binary_power(base, exponent, multiply_pair=operator.mul):
+    """
+    Square-and-multiply exponentiation: O(log exponent) multiplications.
+    multiply_pair lets Decimal bases multiply within a context.
+    """
+    result = None
+    while exponent:
+        if exponent & 1:
+            result = base if result is None else multiply_pair(result, base)
+        exponent >>= 1
+        if exponent:
+            base = multiply_pair(base, base)
+    return 1 if result is None else result
+
+
+def power_exact(base, exponent, precision=DEFAULT_PRECISION, modulus=None):
+    """
+    Raises base to exponent in high precision.
+    Integer base and non-negative integer exponent give an exact int;
+    with modulus, (base ** exponent) % modulus via modular exponentiation.
+    Other results are Decimals with `precision` significant digits.
+    Repeated (base, exponent) pairs are served from an LRU cache.
+    """
+    return _power_cached(to_exact(base), to_exact(exponent), precision, modulus)
+
+
+def power_cache_info():
+    return _power_cached.cache_info()
+
+
+def format_number(value, max_digits=DEFAULT_PRECISION):
+    """
+    Formats a result for display. Numbers longer than max_digits are shown in
+    scientific notation with max_digits significant digits, without converting
+    huge ints to str in full.
+    """
+    if isinstance(value, int) and value.bit_length() > max_digits * 3.32:
+        return str(_int_to_decimal(value, max_digits))
+    if isinstance(value, Decimal) and len(value.as_tuple().digits) > max_digits:
+        return str(_context(max_digits).plus(value))
+    return str(value)
+
+
+# --- Benchmark ---
+
+def benchmark(digit_sizes=(100, 1_000, 10_000), count=64, exponents=(10**3, 10**4, 10**5)):
+    """
+    Shows how multiply and power scale with operand size.
+    multiply: left fold (calc_core.multiply) vs product tree over `count` operands.
+    power: exact binary exponentiation of 3 ** exponent, cold and memoized.
+    """
+    rng = random.Random(0)
+    multiply_rows = []
+    for digits in digit_sizes:
+        operands = [rng.randrange(10 ** (digits - 1), 10 ** digits) for _ in range(count)]
+        start = time.perf_counter()
+        folded = multiply(*operands)
+        fold_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        tree = multiply_exact(*operands)
+        tree_seconds = time.perf_counter() - start
+        assert folded == tree
+        multiply_rows.append((digits, fold_seconds, tree_seconds))
+
+    power_rows = []
+    for exponent in exponents:
+        _power_cached.cache_clear()
+        start = time.perf_counter()
+        power_exact(3, exponent)
+        cold_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        power_exact(3, exponent)
+        cached_seconds = time.perf_counter() - start
+        power_rows.append((exponent, cold_seconds, cached_seconds))
+    return multiply_rows, power_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m calc_core.bignum", description="Benchmark high-precision multiply and power.")
+    parser.add_argument("--count", type=int, default=64, help="Operands per multiply.")
+    args = parser.parse_args(argv)
+    multiply_rows, power_rows = benchmark(count=args.count)
+    print(f"multiply of {args.count} operands")
+    for digits, fold_seconds, tree_seconds in multiply_rows:
+        print(f"  {digits:>7} digits: left fold {fold_seconds * 1000:9.2f} ms, product tree {tree_seconds * 1000:9.2f} ms")
+    print("power 3 ** n")
+    for exponent, cold_seconds, cached_seconds in power_rows:
+        print(f"  n = {exponent:>7}: {cold_seconds * 1000:9.3f} ms, memoized {cached_seconds * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+import argparse
+import math
+import re
+import time
+from functools import lru_cache
+
+from .scalar import divide, power, square_root
+
+# --- Expression Engine ---
+# Parses calculator expressions such as "2 + 3 * (x - 1) ^ 2" or "√(a^2 + b^2)"
+# into an AST, folds constant subtrees, and compiles the result into a single
+# Python function. Compiled expressions are cached by their text, so evaluating
+# the same expression over many variable bindings never re-parses it.
+#
+# Grammar (lowest to highest precedence):
+#   expression := term (("+" | "-") term)*
+#   term       := unary (("*" | "/") unary)*
+#   unary      := ("-" | "+" | "√") unary | power
+#   power      := primary ("^" unary)?          right-associative, -2^2 == -(2^2)
+#   primary    := number | name | name "(" arguments ")" | "(" expression ")"
+#
+# Errors follow calc_core.scalar: bad syntax, unknown names, division by zero
+# and square roots of negative numbers all raise ValueError, as does nesting
+# (brackets, signs, powers) more than MAX_NESTING levels deep. A result too
+# large for a float raises OverflowError.
+
+COMPILE_CACHE_SIZE = 256
+# Deeper ASTs (e.g. a pasted sum of thousands of terms, which parses to a long
+# left-leaning chain) are beyond what compile() and the recursive passes can
+# handle; they are evaluated by an explicit-stack walk instead.
+MAX_COMPILE_DEPTH = 200
+# The parser recurses once per level of brackets, signs or powers, a few frames
+# each; this keeps it well inside Python's recursion limit
+MAX_NESTING = 100
+OVERFLOW_MESSAGE = "The result is too large."
+
+FUNCTIONS = {
+    "sqrt": (square_root, 1),
+    "abs": (abs, 1),
+    "min": (min, None),
+    "max": (max, None),
+}
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_][A-Za-z_0-9]*)
+      | (?P<op>\*\*|[-+*/^√(),])
+    )""", re.VERBOSE)
+
+
+def tokenize(text):
+    """Splits an expression into (kind, value) tokens."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid expression: unexpected {text[position:].strip()[:10]!r}.")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            value = float(value)
+        elif value == "**":
+            value = "^"
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+# --- Parser ---
+# AST nodes are tuples:
+#   ("num", value)  ("var", name)  ("neg", operand)  ("sqrt", operand)
+#   ("bin", op, left, right)  ("call", name, [arguments])
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+        self.nesting = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None or (value is not None and token[1] != value):
+            expected = f"{value!r}" if value else "more input"
+            found = "end of input" if token[0] is None else repr(token[1])
+            raise ValueError(f"Invalid expression: expected {expected}, found {found}.")
+        self.position += 1
+        return token
+
+    def expression(self):
+        node = self.term()
+        while self.peek()[1] in ("+", "-"):
+            op = self.take()[1]
+            node = ("bin", op, node, self.term())
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek()[1] in ("*", "/"):
+            op = self.take()[1]
+            node = ("bin", op, node, self.unary())
+        return node
+
+    def unary(self):
+        # Every nested construct (brackets, arguments, signs, exponents) comes through here
+        self.nesting += 1
+        if self.nesting > MAX_NESTING:
+            raise ValueError(f"Invalid expression: nested more than {MAX_NESTING} levels deep.")
+        try:
+            kind, value = self.peek()
+            if kind == "op" and value in ("-", "+", "√"):
+                self.take()
+                operand = self.unary()
+                if value == "-":
+                    return ("neg", operand)
+                if value == "√":
+                    return ("sqrt", operand)
+                return operand
+            return self.power()
+        finally:
+            self.nesting -= 1
+
+    def power(self):
+        node = self.primary()
+        if self.peek()[1] == "^":
+            self.take()
+            node = ("bin", "^", node, self.unary())
+        return node
+
+    def primary(self):
+        kind, value = self.take()
+        if kind == "number":
+            return ("num", value)
+        if kind == "name":
+            if self.peek()[1] != "(":
+                return ("var", value)
+            if value not in FUNCTIONS:
+                raise ValueError(f"Invalid expression: unknown function {value!r}.")
+            self.take("(")
+            arguments = [self.expression()]
+            while self.peek()[1] == ",":
+                self.take()
+                arguments.append(self.expression())
+            self.take(")")
+            arity = FUNCTIONS[value][1]
+            if arity is not None and len(arguments) != arity:
+                raise ValueError(f"Invalid expression: {value}() takes {arity} argument(s).")
+            return ("call", value, arguments)
+        if value == "(":
+            node = self.expression()
+            self.take(")")
+            return node
+        raise ValueError(f"Invalid expression: unexpected {value!r}.")
+
+
+def parse(text):
+    """Parses an expression into an AST. Raises ValueError on bad syntax."""
+    parser = _Parser(tokenize(text))
+    if not parser.tokens:
+        raise ValueError("Invalid expression: it is empty.")
+    node = parser.expression()
+    if parser.position != len(parser.tokens):
+        raise ValueError(f"Invalid expression: unexpected {parser.tokens[parser.position][1]!r}.")
+    return node
+
+
+# --- Constant Folding ---
+
+def _apply_binary(op, left, right):
+    if op == "+":
+        return left + right
+    if op == "-":
+        return left - right
+    if op == "*":
+        return left * right
+    if op == "/":
+        return divide(left, right)
+    return power(left, right)
+
+
+def fold(node):
+    """
+    Evaluates every constant subtree ahead of time.
+    Subtrees that would raise (e.g. 1/0) are left for evaluation time.
+    """
+    kind = node[0]
+    if kind in ("num", "var"):
+        return node
+    if kind in ("neg", "sqrt"):
+        operand = fold(node[1])
+        if operand[0] == "num":
+            try:
+                return ("num", -operand[1] if kind == "neg" else square_root(operand[1]))
+            except (ValueError, ArithmeticError):
+                pass
+        return (kind, operand)
+    if kind == "bin":
+        left, right = fold(node[2]), fold(node[3])
+        if left[0] == "num" and right[0] == "num":
+            try:
+                return ("num", _apply_binary(node[1], left[1], right[1]))
+            except (ValueError, ArithmeticError):
+                pass
+        return ("bin", node[1], left, right)
+    arguments = [fold(argument) for argument in node[2]]
+    if all(argument[0] == "num" for argument in arguments):
+        try:
+            return ("num", FUNCTIONS[node[1]][0](*(argument[1] for argument in arguments)))
+        except (ValueError, ArithmeticError):
+            pass
+    return ("call", node[1], arguments)
+
+
+def _children(node):
+    kind = node[0]
+    if kind in ("neg", "sqrt"):
+        return (node[1],)
+    if kind == "bin":
+        return (node[2], node[3])
+    if kind == "call":
+        return node[2]
+    return ()
+
+
+def variables(node, found=None):
+    """Returns the sorted variable names used in an AST."""
+    found = set() if found is None else found
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node[0] == "var":
+            found.add(node[1])
+        else:
+            stack.extend(_children(node))
+    return sorted(found)
+
+
+def depth(node):
+    """Returns the nesting depth of an AST (a single number or name is 1)."""
+    deepest = 0
+    stack = [(node, 1)]
+    while stack:
+        node, level = stack.pop()
+        deepest = max(deepest, level)
+        stack.extend((child, level + 1) for child in _children(node))
+    return deepest
+
+
+def evaluate_tree(node, bindings):
+    """
+    Evaluates an AST directly, using an explicit stack rather than recursion,
+    so any depth works. bindings maps variable names to values.
+    """
+    stack = [(node, False)]
+    results = []
+    while stack:
+        node, children_done = stack.pop()
+        kind = node[0]
+        if kind == "num":
+            results.append(node[1])
+        elif kind == "var":
+            try:
+                results.append(bindings[node[1]])
+            except KeyError:
+                raise ValueError(f"No value given for variable {node[1]!r}.") from None
+        elif not children_done:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(_children(node)))
+        elif kind == "neg":
+            results.append(-results.pop())
+        elif kind == "sqrt":
+            results.append(square_root(results.pop()))
+        elif kind == "bin":
+            right = results.pop()
+            results.append(_apply_binary(node[1], results.pop(), right))
+        else:
+            count = len(node[2])
+            arguments = results[-count:]
+            del results[-count:]
+            results.append(FUNCTIONS[node[1]][0](*arguments))
+    return results[0]
+
+
+# --- Compilation ---
+# The folded AST is turned into the source of one Python function and compiled
+# with compile(). Only numbers, validated variable names and the helper
+# functions below can appear in the generated source.
+
+def _divide_pair(left, right):
+    # Two-operand divide() without the *numbers packing, for the hot path
+    if right == 0:
+        raise ValueError("Division by zero is not allowed.")
+    return left / right
+
+
+_HELPERS = {"_div": _divide_pair, "_sqrt": square_root, "inf": math.inf, "nan": math.nan}  # inf/nan: folded overflow
+_HELPERS.update({f"_fn_{name}": function for name, (function, _) in FUNCTIONS.items()})
+
+
+def _to_source(node, names):
+    kind = node[0]
+    if kind == "num":
+        return repr(node[1])
+    if kind == "var":
+        return names[node[1]]
+    if kind == "neg":
+        return f"(-{_to_source(node[1], names)})"
+    if kind == "sqrt":
+        return f"_sqrt({_to_source(node[1], names)})"
+    if kind == "bin":
+        left, right = _to_source(node[2], names), _to_source(node[3], names)
+        if node[1] == "/":
+            return f"_div({left}, {right})"
+        if node[1] == "^":
+            return f"({left} ** {right})"  # Same as calc_core.power
+        return f"({left} {node[1]} {right})"
+    arguments = ", ".join(_to_source(argument, names) for argument in node[2])
+    return f"_fn_{node[1]}({arguments})"
+
+
+class CompiledExpression:
+    """
+    An expression compiled to a Python function of its variables.
+    Call it with keyword bindings, positional values in self.variables order,
+    or use evaluate_many() for a sequence of binding dicts.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        tree = parse(text)
+        if depth(tree) > MAX_COMPILE_DEPTH:
+            self.ast = tree
+            self.variables = variables(tree)
+            names = self.variables
+            self.function = lambda *values: evaluate_tree(tree, dict(zip(names, values)))
+            return
+        self.ast = fold(tree)
+        self.variables = variables(self.ast)
+        # Variables become plain positional parameters (v0, v1, ...) of the function
+        names = {name: f"v{index}" for index, name in enumerate(self.variables)}
+        parameters = ", ".join(names[name] for name in self.variables)
+        source = f"lambda {parameters}: {_to_source(self.ast, names)}"
+        self.function = eval(compile(source, f"<expression {text!r}>", "eval"), dict(_HELPERS))
+
+    def __call__(self, *values, **bindings):
+        if bindings:
+            try:
+                values = tuple(bindings[name] for name in self.variables)
+            except KeyError as e:
+                raise ValueError(f"No value given for variable {e.args[0]!r}.") from None
+        elif len(values) != len(self.variables):
+            raise ValueError(f"Expected values for {', '.join(self.variables) or 'no variables'}.")
+        try:
+            return self.function(*values)
+        except OverflowError:  # float ** raises it with an errno tuple as the message
+            raise OverflowError(OVERFLOW_MESSAGE) from None
+
+    def evaluate_many(self, bindings_list):
+        """Evaluates the expression once per bindings dict and returns a list."""
+        function = self.function
+        names = self.variables
+        try:
+            return [function(*[bindings[name] for name in names]) for bindings in bindings_list]
+        except KeyError as e:
+            raise ValueError(f"No value given for variable {e.args[0]!r}.") from None
+        except OverflowError:
+            raise OverflowError(OVERFLOW_MESSAGE) from None
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_expression(text):
+    """Parses, folds and compiles an expression, caching the result by its text."""
+    return CompiledExpression(text)
+
+
+def evaluate(text, **bindings):
+    """Evaluates an expression with the given variable values."""
+    return compile_expression(text)(**bindings)
+
+
+# --- Benchmark ---
+
+def benchmark(evaluations=1_000_000, text="3 * x ^ 2 + 2 * x * y - y / 4 + √(x * x + 1)"):
+    """
+    Times repeated evaluation of one expression over changing bindings:
+    compiled once (cached) versus parsed again for every evaluation.
+    Returns microseconds per evaluation for both.
+    """
+    compiled = compile_expression(text)
+    bindings = [{"x": float(i % 100), "y": float(i % 7 + 1)} for i in range(evaluations)]
+
+    start = time.perf_counter()
+    compiled.evaluate_many(bindings)
+    compiled_us = (time.perf_counter() - start) / evaluations * 1e6
+
+    reparse_count = min(evaluations, 20_000)
+    start = time.perf_counter()
+    for values in bindings[:reparse_count]:
+        CompiledExpression(text)(**values)
+    reparse_us = (time.perf_counter() - start) / reparse_count * 1e6
+    return {"evaluations": evaluations, "compiled_us": compiled_us, "reparse_us": reparse_us}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m calc_core.expr", description="Evaluate or benchmark expressions.")
+    parser.add_argument("expression", nargs="?", help="Expression to evaluate, e.g. '2 * (3 + x)'.")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="Variable binding.")
+    parser.add_argument("--bench", type=int, metavar="N", help="Benchmark N evaluations instead.")
+    args = parser.parse_args(argv)
+
+    if args.bench or not args.expression:
+        result = benchmark(args.bench or 1_000_000)
+        print(f"{result['evaluations']:,} evaluations")
+        print(f"Compiled (cached): {result['compiled_us']:.3f} us/eval")
+        print(f"Re-parsed each time: {result['reparse_us']:.3f} us/eval")
+        return
+    bindings = {}
+    for item in args.set:
+        name, _, value = item.partition("=")
+        bindings[name.strip()] = float(value)
+    try:
+        print(evaluate(args.expression, **bindings))
+    except ValueError as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import array
+import collections
+import itertools
+import json
+import os
+import tempfile
+import time
+
+# --- Calculation History Tape ---
+# Every evaluated expression and its outcome is appended to an NDJSON log, one
+# line per entry, so the tape survives restarts and is never rewritten.
+#
+#   in memory   the byte offset of every entry (8 bytes each), the newest
+#               `in_memory` entries in full, and an LRU memo of outcomes by
+#               normalized expression
+#   on disk     everything; older entries are read back by offset on recall
+#
+# Outcomes are (status, value) pairs as returned by calc_core.worker:
+# ("ok", result) or ("error", message). Timeouts and worker failures are
+# recorded but not memoized, since trying again may succeed. Complex results
+# are stored as {"complex": [real, imag]}. A line that cannot be parsed (e.g. an
+# edited file) reads back as a CORRUPT entry, which is skipped when listing.
+
+DEFAULT_IN_MEMORY = 1000
+DEFAULT_MEMO_SIZE = 4096
+MEMOIZED_STATUSES = ("ok", "error")
+CORRUPT = "corrupt"
+
+HistoryEntry = collections.namedtuple("HistoryEntry", "id expression status value timestamp")
+
+
+def normalize(expression):
+    """Memo key for an expression: whitespace is ignored, so "1+2" == "1 + 2"."""
+    return "".join(expression.split())
+
+
+def _encode_value(value):
+    return {"complex": [value.real, value.imag]} if isinstance(value, complex) else value
+
+
+def _decode_value(value):
+    return complex(*value["complex"]) if isinstance(value, dict) else value
+
+
+class HistoryTape:
+    """
+    Append-only, indexed calculation history backed by a log file.
+    tape[i] recalls entry i (0 = oldest), recent(n) lists the newest entries,
+    search(term) finds entries by expression or result text, and lookup(expression)
+    returns a memoized outcome so identical calculations need not be recomputed.
+    """
+
+    def __init__(self, path, in_memory=DEFAULT_IN_MEMORY, memo_size=DEFAULT_MEMO_SIZE):
+        self.path = path
+        self.in_memory = in_memory
+        self.memo_size = memo_size
+        self.memo_hits = 0
+        self._offsets = array.array("q")
+        self._recent = collections.OrderedDict()  # id -> HistoryEntry, oldest first
+        self._memo = collections.OrderedDict()    # normalized expression -> (status, value)
+        self._load()
+        self._file = open(path, "ab")
+
+    def _load(self):
+        """Indexes an existing log; only the newest entries are parsed."""
+        if not os.path.exists(self.path):
+            return
+        tail = collections.deque(maxlen=max(self.in_memory, self.memo_size))
+        offset = 0
+        with open(self.path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # Torn final write (e.g. a crash mid-append)
+                tail.append((len(self._offsets), line))
+                self._offsets.append(offset)
+                offset += len(line)
+        if offset != os.path.getsize(self.path):
+            os.truncate(self.path, offset)
+        first_recent = len(self._offsets) - self.in_memory
+        for entry_id, line in tail:
+            entry = self._parse(entry_id, line)
+            self._remember(entry)
+            if entry_id >= first_recent:
+                self._recent[entry_id] = entry
+
+    @staticmethod
+    def _parse(entry_id, line):
+        try:
+            record = json.loads(line)
+            return HistoryEntry(entry_id, record["expression"], record["status"],
+                                _decode_value(record["value"]), record["time"])
+        except (ValueError, KeyError, TypeError):
+            return HistoryEntry(entry_id, "", CORRUPT, "Unreadable history entry.", 0.0)
+
+    def _remember(self, entry):
+        if entry.status not in MEMOIZED_STATUSES:
+            return
+        key = normalize(entry.expression)
+        self._memo[key] = (entry.status, entry.value)
+        self._memo.move_to_end(key)
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def record(self, expression, status, value):
+        """Appends one calculation to the tape and returns its HistoryEntry."""
+        entry = HistoryEntry(len(self._offsets), expression, status, value, time.time())
+        line = json.dumps({"expression": expression, "status": status, "value": _encode_value(value),
+                           "time": entry.timestamp})
+        self._offsets.append(self._file.tell())
+        self._file.write(line.encode("utf-8") + b"\n")
+        self._file.flush()
+        self._recent[entry.id] = entry
+        if len(self._recent) > self.in_memory:
+            self._recent.popitem(last=False)  # Still on disk, recalled by offset
+        self._remember(entry)
+        return entry
+
+    def lookup(self, expression):
+        """Returns the memoized (status, value) for an expression, or None."""
+        key = normalize(expression)
+        outcome = self._memo.get(key)
+        if outcome is not None:
+            self._memo.move_to_end(key)
+            self.memo_hits += 1
+        return outcome
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, entry_id):
+        if entry_id < 0:
+            entry_id += len(self._offsets)
+        if not 0 <= entry_id < len(self._offsets):
+            raise IndexError("History entry out of range.")
+        entry = self._recent.get(entry_id)
+        if entry is not None:
+            return entry
+        with open(self.path, "rb") as file:
+            file.seek(self._offsets[entry_id])
+            return self._parse(entry_id, file.readline())
+
+    def recent(self, count=20):
+        """Returns up to `count` of the newest entries, newest first."""
+        entries = (self[entry_id] for entry_id in range(len(self._offsets) - 1, -1, -1))
+        return list(itertools.islice((entry for entry in entries if entry.status != CORRUPT), count))
+
+    def search(self, term, limit=20):
+        """
+        Returns up to `limit` entries whose expression or value contains term,
+        newest first. In-memory entries are searched first; the log file is
+        only streamed (constant memory) if more matches are needed.
+        """
+        term = term.lower()
+        matches = lambda entry: entry.status != CORRUPT and (
+            term in entry.expression.lower() or term in str(entry.value).lower())
+        found = [entry for entry in reversed(self._recent.values()) if matches(entry)][:limit]
+        oldest_in_memory = next(iter(self._recent), len(self._offsets))
+        if len(found) >= limit or oldest_in_memory == 0:
+            return found
+        older = collections.deque(maxlen=limit - len(found))
+        with open(self.path, "rb") as file:
+            for entry_id in range(oldest_in_memory):
+                line = file.readline()
+                if term in line.decode("utf-8", "replace").lower():  # Cheap filter before parsing
+                    entry = self._parse(entry_id, line)
+                    if matches(entry):
+                        older.append(entry)
+        return found + list(reversed(older))
+
+    def close(self):
+        self._file.close()
+
+
+# --- Benchmark ---
+
+def benchmark(entries=200_000, in_memory=DEFAULT_IN_MEMORY):
+    """
+    Fills a tape in a temporary directory and times appends, reopening
+    (index rebuild), memo lookups, and recall of evicted entries from disk.
+    Returns {name: seconds}.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.ndjson")
+        tape = HistoryTape(path, in_memory=in_memory)
+        timings = {}
+        start = time.perf_counter()
+        for i in range(entries):
+            tape.record(f"{i % 5000} * 3", "ok", (i % 5000) * 3.0)
+        timings["append"] = time.perf_counter() - start
+        tape.close()
+
+        start = time.perf_counter()
+        tape = HistoryTape(path, in_memory=in_memory)
+        timings["reopen"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(entries):
+            tape.lookup(f"{i % 5000} * 3")
+        timings["memo_lookup"] = time.perf_counter() - start
+
+        recalls = min(entries, 10_000)
+        start = time.perf_counter()
+        for i in range(recalls):
+            tape[(i * 7919) % entries]
+        timings["recall"] = time.perf_counter() - start
+        tape.close()
+    return timings, entries, recalls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m calc_core.history", description="Show or benchmark the calculation history tape.")
+    parser.add_argument("path", nargs="?", help="History file to show (omit to run the benchmark).")
+    parser.add_argument("--search", help="Only show entries containing this text.")
+    parser.add_argument("--limit", type=int, default=20, help="Entries to show.")
+    parser.add_argument("--bench", type=int, metavar="N", default=200_000, help="Entries for the benchmark.")
+    args = parser.parse_args(argv)
+
+    if args.path is None:
+        timings, entries, recalls = benchmark(args.bench)
+        print(f"append      {entries / timings['append']:12,.0f} entries/s")
+        print(f"reopen      {timings['reopen'] * 1000:12.1f} ms for {entries:,} entries")
+        print(f"memo lookup {entries / timings['memo_lookup']:12,.0f} lookups/s")
+        print(f"disk recall {recalls / timings['recall']:12,.0f} recalls/s")
+        return
+    tape = HistoryTape(args.path)
+    entries = tape.search(args.search, args.limit) if args.search else tape.recent(args.limit)
+    for entry in entries:
+        outcome = entry.value if entry.status == "ok" else f"{entry.status}: {entry.value}"
+        print(f"{entry.id:>8}  {entry.expression} = {outcome}")
+    tape.close()
+
+
+if __name__ == "__main__":
+    main()
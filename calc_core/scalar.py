@@ -0,0 +1,65 @@
+import math
+
+# --- Basic Arithmetic Functions (Variadic) ---
+# Shared by "python assignment2.py" and "simple calculator.py".
+# Invalid input (division by zero, square root of a negative number)
+# raises ValueError; the front ends decide how to show the message.
+
+def add(*numbers):
+    """Adds a variable number of numbers. Returns 0 if no numbers."""
+    if not numbers:
+        return 0
+    return sum(numbers)
+
+def subtract(*numbers):
+    """Subtracts a variable number of numbers.
+    The first number is the initial value, and subsequent numbers are subtracted from it.
+    Returns 0 if no numbers. If one number, returns that number."""
+    if not numbers:
+        return 0
+    if len(numbers) == 1:
+        return numbers[0]
+
+    result = numbers[0]
+    for num in numbers[1:]:
+        result -= num
+    return result
+
+def multiply(*numbers):
+    """Multiplies a variable number of numbers. Returns 1 if no numbers."""
+    if not numbers:
+        return 1
+
+    result = 1
+    for num in numbers:
+        result *= num
+    return result
+
+def divide(*numbers):
+    """Divides the first number by subsequent numbers.
+    Handles division by zero errors by raising a ValueError.
+    Returns 1 if no numbers. If one number, returns that number."""
+    if not numbers:
+        return 1
+    if len(numbers) == 1:
+        return numbers[0]
+
+    result = numbers[0]
+    for num in numbers[1:]:
+        if num == 0:
+            raise ValueError("Division by zero is not allowed.")
+        result /= num
+    return result
+
+# --- Advanced Math Functions (Bonus) ---
+
+def power(base, exponent):
+    """Calculates the base raised to the power of the exponent."""
+    return base ** exponent
+
+def square_root(number):
+    """Calculates the square root of a number.
+    Handles negative numbers by raising a ValueError."""
+    if number < 0:
+        raise ValueError("Cannot calculate the square root of a negative number.")
+    return math.sqrt(number)
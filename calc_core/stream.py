@@ -0,0 +1,308 @@
+import argparse
+import importlib.util
+import itertools
+import math
+import os
+import tempfile
+import time
+
+try:
+    import numpy as np
+except ImportError:  # The NumPy fast path is optional
+    np = None
+
+# --- Streaming Variadic Reductions ---
+# Versions of add/subtract/multiply/divide that take any iterable (a generator,
+# a file of numbers, ...) instead of *numbers, so inputs never have to fit in a
+# tuple. Memory use stays constant: values are consumed one chunk at a time.
+# Sums are compensated (math.fsum, or pairwise NumPy sums joined with
+# Neumaier summation), so accuracy holds for very long inputs.
+
+DEFAULT_CHUNK_SIZE = 65536
+MIN_NORMAL = 2.2250738585072014e-308  # Smallest full-precision float (sys.float_info.min)
+
+
+def _neumaier_add(total, compensation, value):
+    """One step of Neumaier compensated summation. Returns (total, compensation)."""
+    new_total = total + value
+    if abs(total) >= abs(value):
+        compensation += (total - new_total) + value
+    else:
+        compensation += (value - new_total) + total
+    return new_total, compensation
+
+
+def iter_chunks(numbers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Groups an iterable of numbers into float64 NumPy arrays of chunk_size.
+    NumPy arrays (or lists of arrays) already in memory are passed through in slices.
+    """
+    if np is None:
+        raise ImportError("The chunked fast path needs NumPy.")
+    if isinstance(numbers, np.ndarray):
+        flat = numbers.ravel()
+        for start in range(0, len(flat), chunk_size):
+            yield flat[start:start + chunk_size].astype(np.float64, copy=False)
+        return
+    iterator = iter(numbers)
+    while True:
+        chunk = np.fromiter(itertools.islice(iterator, chunk_size), dtype=np.float64)
+        if not len(chunk):
+            return
+        yield chunk
+
+
+def iter_file_numbers(path, block_size=1 << 20):
+    """
+    Yields floats from a text file of whitespace- or newline-separated numbers,
+    reading block_size bytes at a time.
+    """
+    for chunk in iter_file_chunks(path, block_size, as_arrays=False):
+        yield from chunk
+
+
+def iter_file_chunks(path, block_size=1 << 20, as_arrays=True):
+    """
+    Yields the numbers in a text file block by block, as float64 arrays
+    (or lists of floats with as_arrays=False). A number split across two
+    blocks is carried over to the next one.
+    """
+    if as_arrays and np is None:
+        raise ImportError("Reading files as arrays needs NumPy.")
+    carry = b""
+    with open(path, "rb") as file:
+        while True:
+            block = file.read(block_size)
+            if not block:
+                break
+            block = carry + block
+            cut = max(block.rfind(b" "), block.rfind(b"\n"), block.rfind(b"\t"))
+            if cut < 0:
+                carry = block
+                continue
+            carry = block[cut + 1:]
+            tokens = block[:cut].split()
+            if tokens:
+                yield np.array(tokens, dtype=np.float64) if as_arrays else [float(token) for token in tokens]
+    tokens = carry.split()
+    if tokens:
+        yield np.array(tokens, dtype=np.float64) if as_arrays else [float(token) for token in tokens]
+
+
+# --- Reductions over iterables ---
+
+def add_stream(numbers):
+    """
+    Adds every number from an iterable with exactly-rounded summation (math.fsum).
+    Returns 0 if the iterable is empty.
+    """
+    return math.fsum(numbers)
+
+
+def subtract_stream(numbers):
+    """
+    Subtracts every following number from the first one.
+    Returns 0 if empty; if one number, returns that number.
+    The subtracted values are summed with math.fsum before the single subtraction.
+    """
+    iterator = iter(numbers)
+    first = next(iterator, None)
+    if first is None:
+        return 0
+    rest = iter_peek(iterator)
+    if rest is None:
+        return first
+    return math.fsum(itertools.chain([first], (-value for value in rest)))
+
+
+def multiply_stream(numbers):
+    """Multiplies every number from an iterable. Returns 1 if empty."""
+    result = 1
+    for value in numbers:
+        result *= value
+    return result
+
+
+def divide_stream(numbers):
+    """
+    Divides the first number by every following number, in order.
+    Returns 1 if empty; if one number, returns that number.
+    Raises ValueError on division by zero.
+    """
+    iterator = iter(numbers)
+    result = next(iterator, None)
+    if result is None:
+        return 1
+    for value in iterator:
+        if value == 0:
+            raise ValueError("Division by zero is not allowed.")
+        result /= value
+    return result
+
+
+def iter_peek(iterator):
+    """Returns an iterator over the same values, or None if iterator is exhausted."""
+    first = next(iterator, None)
+    if first is None:
+        return None
+    return itertools.chain([first], iterator)
+
+
+# --- Chunked NumPy fast path ---
+
+def add_chunked(numbers, chunk_size=DEFAULT_CHUNK_SIZE, exact=False):
+    """
+    Sums an iterable of numbers (or of NumPy chunks from iter_file_chunks)
+    chunk by chunk: NumPy's pairwise sum inside each chunk and Neumaier
+    compensation across chunks. exact=True feeds every chunk through one
+    math.fsum instead (exactly rounded, but at Python speed).
+    """
+    if exact:
+        return math.fsum(itertools.chain.from_iterable(chunk.tolist() for chunk in _chunks(numbers, chunk_size)))
+    total, compensation = 0.0, 0.0
+    for chunk in _chunks(numbers, chunk_size):
+        total, compensation = _neumaier_add(total, compensation, float(np.sum(chunk)))
+    return total + compensation
+
+
+def subtract_chunked(numbers, chunk_size=DEFAULT_CHUNK_SIZE, exact=False):
+    """Chunked subtract_stream: first - (sum of the rest), compensated."""
+    chunks = _chunks(numbers, chunk_size)
+    first = None
+    for chunk in chunks:
+        if len(chunk):
+            first = float(chunk[0])
+            break
+    if first is None:
+        return 0
+    rest = itertools.chain([chunk[1:]], chunks)
+    if exact:
+        return math.fsum(itertools.chain([first], (-value for part in rest for value in part.tolist())))
+    total, compensation = first, 0.0
+    for part in rest:
+        total, compensation = _neumaier_add(total, compensation, -float(np.sum(part)))
+    return total + compensation
+
+
+def multiply_chunked(numbers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Chunked multiply_stream using np.prod per chunk."""
+    result = 1.0
+    for chunk in _chunks(numbers, chunk_size):
+        result *= float(np.prod(chunk))
+    return result
+
+
+def divide_chunked(numbers, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Chunked divide_stream: the first number divided by the product of each
+    following chunk. A chunk whose product underflows or overflows is divided
+    one number at a time instead. Raises ValueError on division by zero.
+    """
+    result = None
+    for chunk in _chunks(numbers, chunk_size):
+        if result is None:
+            if not len(chunk):
+                continue
+            result, chunk = float(chunk[0]), chunk[1:]
+        if not chunk.all():
+            raise ValueError("Division by zero is not allowed.")
+        with np.errstate(over="ignore", under="ignore"):  # Like float division: inf or 0, no warning
+            product = float(np.prod(chunk))
+            if MIN_NORMAL <= abs(product) < math.inf:
+                result /= product
+            else:
+                result = float(np.divide.reduce(np.concatenate(([result], chunk))))
+    return 1 if result is None else result
+
+
+def _chunks(numbers, chunk_size):
+    # Accept an iterable of ready-made arrays (e.g. iter_file_chunks) as-is
+    if np is not None and not isinstance(numbers, np.ndarray):
+        iterator = iter(numbers)
+        first = next(iterator, None)
+        if first is None:
+            return
+        if isinstance(first, np.ndarray):
+            yield first
+            yield from iterator
+            return
+        numbers = itertools.chain([first], iterator)
+    yield from iter_chunks(numbers, chunk_size)
+
+
+# --- Benchmark ---
+
+def load_script(filename, directory=None):
+    """
+    Imports one of this project's scripts by file name (the names contain spaces,
+    so a normal import does not work). The __main__ block is not run.
+    directory defaults to the project directory.
+    """
+    if directory is None:
+        directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = os.path.join(directory, filename)
+    module_name = os.path.splitext(filename)[0].replace(" ", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def benchmark(sizes=(10**6, 10**7), directory=None):
+    """
+    Times add + multiply from "python assignment2.py" against the streaming
+    and chunked versions, reading the same text file of numbers each time.
+    The tuple-based calls need every number in memory to unpack into *numbers.
+    Returns a list of (size, {path_name: seconds}).
+    """
+    original = load_script("python assignment2.py")
+    for numbers in ([1e-300] + [1e-200] * 3, [1e300] + [1e200] * 3, [10.0, 4.0, 0.5]):
+        assert math.isclose(divide_chunked(numbers), divide_stream(numbers), rel_tol=1e-12)
+    rows = []
+    for size in sizes:
+        path = os.path.join(directory or tempfile.gettempdir(), f"calc_core_stream_bench_{size}.txt")
+        with open(path, "w") as file:
+            # Values near 1 so the product neither overflows nor underflows
+            for start in range(0, size, DEFAULT_CHUNK_SIZE):
+                stop = min(start + DEFAULT_CHUNK_SIZE, size)
+                file.write("\n".join(str(1 + ((i % 1000) - 500) * 1e-7) for i in range(start, stop)))
+                file.write("\n")
+
+        timings = {}
+        try:
+            start = time.perf_counter()
+            with open(path) as file:
+                numbers = [float(line) for line in file]
+            original.add(*numbers)
+            original.multiply(*numbers)
+            del numbers
+            timings["tuple"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            add_stream(iter_file_numbers(path))
+            multiply_stream(iter_file_numbers(path))
+            timings["stream"] = time.perf_counter() - start
+
+            if np is not None:
+                start = time.perf_counter()
+                add_chunked(iter_file_chunks(path))
+                multiply_chunked(iter_file_chunks(path))
+                timings["chunked"] = time.perf_counter() - start
+        finally:
+            os.remove(path)
+        rows.append((size, timings))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark streaming reductions against the tuple-based functions.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**6, 10**7],
+                        help="Input sizes (10**8 needs several GB for the tuple-based path).")
+    args = parser.parse_args(argv)
+    for size, timings in benchmark(args.sizes):
+        report = ", ".join(f"{name}: {seconds:.2f}s" for name, seconds in timings.items())
+        print(f"{size:>12,} numbers -> {report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import functools
+import math
+import time
+
+import numpy as np
+
+# --- Array-Aware Arithmetic (ufunc style) ---
+# Elementwise versions of the calculator operations. Operands can be scalars
+# or NumPy arrays of any broadcastable shape; each call is one vectorized pass
+# per operand. Errors follow calc_core.scalar: ValueError on division by zero
+# or the square root of a negative number. The *_masked variants never raise:
+# they return (result, valid), with NaN wherever valid is False.
+
+def add(*operands):
+    """Elementwise sum of the operands. Returns 0 if no operands."""
+    if not operands:
+        return 0
+    return functools.reduce(np.add, map(np.asarray, operands))
+
+def subtract(*operands):
+    """Elementwise first operand minus every following operand."""
+    if not operands:
+        return 0
+    result = np.asarray(operands[0])
+    for operand in operands[1:]:
+        result = np.subtract(result, operand)
+    return result
+
+def multiply(*operands):
+    """Elementwise product of the operands. Returns 1 if no operands."""
+    if not operands:
+        return 1
+    return functools.reduce(np.multiply, map(np.asarray, operands))
+
+def divide(*operands):
+    """Elementwise first operand divided by every following operand.
+    Raises ValueError if any divisor element is zero."""
+    if not operands:
+        return 1
+    result = np.asarray(operands[0], dtype=np.float64)
+    for operand in operands[1:]:
+        operand = np.asarray(operand)
+        if not np.all(operand):
+            raise ValueError("Division by zero is not allowed.")
+        result = np.divide(result, operand)
+    return result
+
+def power(base, exponent):
+    """Elementwise base ** exponent, computed in float64."""
+    return np.power(np.asarray(base, dtype=np.float64), exponent)
+
+def square_root(numbers):
+    """Elementwise square root.
+    Raises ValueError if any element is negative."""
+    numbers = np.asarray(numbers, dtype=np.float64)
+    if np.any(numbers < 0):
+        raise ValueError("Cannot calculate the square root of a negative number.")
+    return np.sqrt(numbers)
+
+
+# --- Masked Variants ---
+# For bulk data one bad element should not abort the whole batch. These compute
+# every element in one vectorized pass and report problems through a boolean
+# validity mask instead of raising.
+
+def square_root_masked(numbers):
+    """
+    Elementwise square root that never raises.
+    Returns (result, valid): valid is False for negative or NaN inputs,
+    and result holds NaN there.
+    """
+    numbers = np.asarray(numbers, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        result = np.sqrt(numbers)
+    return result, numbers >= 0
+
+def power_masked(base, exponent):
+    """
+    Elementwise base ** exponent that never raises.
+    Returns (result, valid): valid is False where the scalar version would fail,
+    i.e. a negative base with a fractional exponent, zero to a negative power,
+    or a result too large for float64. result holds NaN there.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    with np.errstate(all="ignore"):
+        result = np.power(base, exponent)
+        valid = np.isfinite(result)
+        # Infinite inputs may legitimately give infinite results
+        valid |= ~np.isfinite(base) | ~np.isfinite(exponent)
+    valid &= ~np.isnan(result)
+    result = np.where(valid, result, np.nan)
+    return result, valid
+
+
+# --- Benchmark ---
+
+def _scalar_square_root(values):
+    # The per-element loop the masked version replaces
+    results, valid = [], []
+    for value in values:
+        if value < 0:
+            results.append(math.nan)
+            valid.append(False)
+        else:
+            results.append(math.sqrt(value))
+            valid.append(True)
+    return results, valid
+
+def _scalar_power(bases, exponents):
+    results, valid = [], []
+    for base, exponent in zip(bases, exponents):
+        try:
+            result = base ** exponent
+            if isinstance(result, complex):
+                raise ValueError
+        except (ArithmeticError, ValueError):
+            results.append(math.nan)
+            valid.append(False)
+        else:
+            results.append(result)
+            valid.append(True)
+    return results, valid
+
+def benchmark(size=10_000_000, seed=0):
+    """
+    Times square_root_masked and power_masked against per-element Python loops
+    over the same `size` inputs (about 10% of them invalid).
+    Returns {name: (scalar_seconds, vector_seconds, invalid_count)}.
+    """
+    rng = np.random.default_rng(seed)
+    numbers = rng.uniform(-10.0, 90.0, size)
+    bases = rng.uniform(-1.0, 9.0, size)
+    exponents = rng.choice([0.5, 2.0, 3.0, -1.0], size)
+    number_list, base_list, exponent_list = numbers.tolist(), bases.tolist(), exponents.tolist()
+
+    rows = {}
+    for name, vector, scalar, arguments, scalar_arguments in (
+        ("square_root", square_root_masked, _scalar_square_root, (numbers,), (number_list,)),
+        ("power", power_masked, _scalar_power, (bases, exponents), (base_list, exponent_list)),
+    ):
+        start = time.perf_counter()
+        _, scalar_valid = scalar(*scalar_arguments)
+        scalar_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        _, valid = vector(*arguments)
+        vector_seconds = time.perf_counter() - start
+        assert np.array_equal(valid, scalar_valid)
+        rows[name] = (scalar_seconds, vector_seconds, int(size - np.count_nonzero(valid)))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m calc_core.ufuncs", description="Benchmark masked square_root/power against scalar loops.")
+    parser.add_argument("--size", type=int, default=10_000_000, help="Elements per input array.")
+    args = parser.parse_args(argv)
+    for name, (scalar_seconds, vector_seconds, invalid) in benchmark(args.size).items():
+        print(f"{name:>11}: scalar loop {args.size / scalar_seconds / 1e6:8.2f} M/s, "
+              f"vectorized {args.size / vector_seconds / 1e6:8.2f} M/s "
+              f"({scalar_seconds / vector_seconds:.0f}x, {invalid:,} invalid)")
+
+
+if __name__ == "__main__":
+    main()
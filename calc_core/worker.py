@@ -0,0 +1,133 @@
+import multiprocessing
+import queue
+import time
+
+from .batch import calculate
+from .expr import evaluate
+
+# --- Background Compute Worker ---
+# Runs calculator operations in a separate process, so a GUI event loop never
+# waits on a long computation. A process (not a thread) is used because it can
+# be stopped: cancel() and an expired timeout terminate it outright, and the
+# next submit() starts a fresh one. The caller polls for the outcome, e.g. from
+# Tk's master.after(). Besides the calculate() operations, op "expr" evaluates
+# a whole expression string with calc_core.expr.
+
+DEFAULT_TIMEOUT = 10.0
+
+
+def _serve(tasks, results):
+    # Child process loop: one (job_id, op, operands) task in, one outcome out
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        job_id, op, operands = task
+        try:
+            if op == "expr":
+                result = evaluate(operands[0])
+            else:
+                result = calculate(op, operands)
+            results.put((job_id, "ok", result))
+        except (ValueError, ArithmeticError) as e:
+            results.put((job_id, "error", str(e)))
+        except RecursionError:
+            results.put((job_id, "error", "Expression is nested too deeply."))
+        except Exception as e:  # Keep the worker alive for the next job
+            results.put((job_id, "failed", f"Unexpected error: {e}"))
+
+
+class ComputeWorker:
+    """
+    Runs one operation at a time in a worker process.
+    submit() returns immediately; poll() returns None while the job runs, then
+    ("ok", result), ("error", message), or ("timeout", message) once the job has
+    run longer than `timeout` seconds (the worker is then terminated).
+    ("failed", message) means the worker crashed or hit an unexpected error,
+    so trying again may give a different outcome.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        # spawn, not fork: forking a process that runs a Tk event loop is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._tasks = None
+        self._results = None
+        self._job_id = 0
+        self._started_at = None
+
+    @property
+    def busy(self):
+        return self._started_at is not None
+
+    @property
+    def elapsed(self):
+        """Seconds the current job has been running (0.0 when idle)."""
+        return time.monotonic() - self._started_at if self.busy else 0.0
+
+    def _ensure_process(self):
+        if self._process is None or not self._process.is_alive():
+            self._tasks = self._context.Queue()
+            self._results = self._context.Queue()
+            self._process = self._context.Process(target=_serve, args=(self._tasks, self._results), daemon=True)
+            self._process.start()
+
+    def start(self):
+        """Starts the worker process ahead of the first job (spawning takes a moment)."""
+        self._ensure_process()
+
+    def submit(self, op, *operands):
+        """Starts computing op(*operands). Raises RuntimeError if a job is already running."""
+        if self.busy:
+            raise RuntimeError("A calculation is already running.")
+        self._ensure_process()
+        self._job_id += 1
+        self._tasks.put((self._job_id, op, operands))
+        self._started_at = time.monotonic()
+
+    def poll(self):
+        """Returns the finished job's outcome, or None if it is still running (or idle)."""
+        if not self.busy:
+            return None
+        try:
+            while True:
+                job_id, status, value = self._results.get_nowait()
+                if job_id == self._job_id:  # Skip anything left over from an earlier job
+                    self._started_at = None
+                    return status, value
+        except queue.Empty:
+            pass
+        if self.elapsed > self.timeout:
+            self.cancel()
+            return "timeout", f"Calculation took longer than {self.timeout:g} seconds."
+        if not self._process.is_alive():
+            self._started_at = None
+            self._process = None
+            return "failed", "The calculation worker stopped unexpectedly."
+        return None
+
+    def cancel(self):
+        """Stops the running job by terminating the worker process."""
+        if not self.busy:
+            return
+        self._started_at = None
+        self._stop_process(force=True)
+
+    def close(self):
+        """Shuts the worker process down."""
+        self._started_at = None
+        self._stop_process(force=False)
+
+    def _stop_process(self, force):
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if not force and process.is_alive():
+            self._tasks.put(None)
+            process.join(0.5)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        self._tasks.close()
+        self._results.close()
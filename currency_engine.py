@@ -0,0 +1,240 @@
+import argparse
+import csv
+import itertools
+import time
+
+import numpy as np
+
+# --- Headless Currency Conversion Engine ---
+# This module holds the conversion math used by the Currency Converter GUI,
+# without any Tkinter dependency, so it can be used from scripts and batch jobs.
+# Rates are relative to 1 GHS (Ghana Cedi), the same way the GUI stores them.
+
+DEFAULT_EXCHANGE_RATES = {
+    "GHS": 1.0,  # Ghana Cedi
+    "USD": 10.5,  # US Dollar (1 USD = 10.5 GHS) - Bank of Ghana mid-rate
+    "EUR": 12.1166,  # Euro (1 EUR = 12.1166 GHS) - Bank of Ghana mid-rate
+    "GBP": 13.9062,  # British Pound (1 GBP = 13.9062 GHS) - Bank of Ghana mid-rate
+}
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def convert_amount(amount, from_currency, to_currency, exchange_rates):
+    """
+    Converts a single amount between two currencies through the GHS base.
+    This is the per-call path used by the GUI.
+    Raises KeyError if either currency is not in exchange_rates.
+    """
+    amount_in_ghs = amount * exchange_rates[from_currency]
+    return amount_in_ghs / exchange_rates[to_currency]
+
+
+class CodeTable:
+    """
+    Interns currency codes to integer indexes.
+    Whole arrays of codes are mapped with one vectorized binary search
+    over the (small) sorted code list instead of a dict lookup per row.
+    """
+
+    def __init__(self, codes=()):
+        self.codes = []
+        self.code_to_index = {}
+        self.add(codes)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.code_to_index
+
+    def add(self, codes):
+        """Appends new codes; existing codes keep their index."""
+        for code in codes:
+            if code not in self.code_to_index:
+                self.code_to_index[code] = len(self.codes)
+                self.codes.append(code)
+        order = sorted(range(len(self.codes)), key=self.codes.__getitem__)
+        self._sorted_codes = np.array([self.codes[i] for i in order])
+        self._sorted_indexes = np.array(order, dtype=np.intp)
+
+    def index(self, code):
+        """Returns the index of a single code. Raises KeyError if unknown."""
+        try:
+            return self.code_to_index[code]
+        except KeyError:
+            raise KeyError(f"Unsupported currency: {code}") from None
+
+    def intern(self, codes):
+        """
+        Maps a sequence of currency codes to an int array of indexes.
+        A single code string maps to a single index.
+        Integer arrays are taken as indexes and passed through unchanged.
+        Raises KeyError for an unknown code or an index out of range.
+        """
+        if isinstance(codes, str):
+            return self.index(codes)
+        codes = np.asarray(codes)
+        if codes.dtype.kind in "iu":
+            if codes.size and not (codes.min() >= 0 and codes.max() < len(self.codes)):
+                unknown = codes[(codes < 0) | (codes >= len(self.codes))].flat[0]
+                raise KeyError(f"Unsupported currency index: {unknown}")
+            return codes.astype(np.intp, copy=False)
+        if not self.codes:
+            raise KeyError("Unsupported currency: no currencies loaded")
+        positions = np.searchsorted(self._sorted_codes, codes)
+        positions = np.minimum(positions, len(self._sorted_codes) - 1)
+        matched = self._sorted_codes[positions] == codes
+        if not matched.all():
+            unknown = codes[~matched].flat[0]
+            raise KeyError(f"Unsupported currency: {unknown}")
+        return self._sorted_indexes[positions]
+
+
+class BatchConverter:
+    """
+    Converts whole arrays of amounts in one NumPy pass.
+    Currency codes are interned to integer indexes into a rate vector,
+    so a batch is a single gather-multiply-divide.
+    """
+
+    def __init__(self, exchange_rates=None):
+        if exchange_rates is None:
+            exchange_rates = DEFAULT_EXCHANGE_RATES
+        self.code_table = CodeTable()
+        self.rates = np.empty(0, dtype=np.float64)
+        self.update_rates(exchange_rates)
+
+    @property
+    def codes(self):
+        return self.code_table.codes
+
+    def update_rates(self, exchange_rates):
+        """
+        Loads (or refreshes) rates from a {code: rate_in_GHS} dict.
+        Existing codes keep their index, new codes are appended.
+        """
+        self.code_table.add(exchange_rates)
+        rates = np.full(len(self.code_table), np.nan, dtype=np.float64)
+        rates[: len(self.rates)] = self.rates
+        for code, rate in exchange_rates.items():
+            rates[self.code_table.code_to_index[code]] = rate
+        self.rates = rates
+
+    def intern(self, codes):
+        """Maps currency codes to integer indexes (see CodeTable.intern)."""
+        return self.code_table.intern(codes)
+
+    def convert(self, amounts, from_codes, to_codes):
+        """
+        Converts an array of amounts. from_codes and to_codes can be
+        arrays of codes/indexes or a single code applied to every row.
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        from_indexes = self.code_table.intern(from_codes)
+        to_indexes = self.code_table.intern(to_codes)
+        return amounts * self.rates[from_indexes] / self.rates[to_indexes]
+
+    def convert_csv(self, input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE,
+                    amount_column="amount", from_column="from", to_column="to",
+                    result_column="converted"):
+        """
+        Streams a CSV file through the converter in chunks of chunk_size rows,
+        so memory use does not grow with the file size.
+        Writes every input column plus result_column to output_path.
+        Returns (row_count, elapsed_seconds).
+        """
+        start = time.perf_counter()
+        row_count = 0
+        with open(input_path, newline="") as infile, open(output_path, "w", newline="") as outfile:
+            reader = csv.reader(infile)
+            writer = csv.writer(outfile)
+            header = next(reader)
+            amount_pos = header.index(amount_column)
+            from_pos = header.index(from_column)
+            to_pos = header.index(to_column)
+            writer.writerow(header + [result_column])
+
+            while True:
+                rows = list(itertools.islice(reader, chunk_size))
+                if not rows:
+                    break
+                columns = list(zip(*rows))
+                converted = self.convert(
+                    np.array(columns[amount_pos], dtype=np.float64),
+                    np.array(columns[from_pos]),
+                    np.array(columns[to_pos]),
+                )
+                writer.writerows(row + [f"{value:.2f}"] for row, value in zip(rows, converted.tolist()))
+                row_count += len(rows)
+
+        return row_count, time.perf_counter() - start
+
+
+# --- Benchmark ---
+
+def benchmark(row_count=1_000_000, exchange_rates=None):
+    """
+    Compares rows per second of the per-call path (convert_amount)
+    against BatchConverter.convert on random data.
+    Returns a dict with both rates.
+    """
+    if exchange_rates is None:
+        exchange_rates = DEFAULT_EXCHANGE_RATES
+    converter = BatchConverter(exchange_rates)
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(0, 10_000, row_count)
+    from_codes = np.array(converter.codes)[rng.integers(0, len(converter.codes), row_count)]
+    to_codes = np.array(converter.codes)[rng.integers(0, len(converter.codes), row_count)]
+
+    amount_list = amounts.tolist()
+    from_list = from_codes.tolist()
+    to_list = to_codes.tolist()
+    start = time.perf_counter()
+    for amount, from_currency, to_currency in zip(amount_list, from_list, to_list):
+        convert_amount(amount, from_currency, to_currency, exchange_rates)
+    per_call_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    converter.convert(amounts, from_codes, to_codes)
+    batch_seconds = time.perf_counter() - start
+
+    # Codes interned up front, as a job repricing the same ledger repeatedly would do
+    from_indexes = converter.intern(from_codes)
+    to_indexes = converter.intern(to_codes)
+    start = time.perf_counter()
+    converter.convert(amounts, from_indexes, to_indexes)
+    interned_seconds = time.perf_counter() - start
+    return {
+        "rows": row_count,
+        "per_call_rows_per_sec": row_count / per_call_seconds,
+        "batch_rows_per_sec": row_count / batch_seconds,
+        "interned_rows_per_sec": row_count / interned_seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch currency conversion.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert_parser = subparsers.add_parser("convert", help="Convert a CSV file in chunks.")
+    convert_parser.add_argument("input")
+    convert_parser.add_argument("output")
+    convert_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    bench_parser = subparsers.add_parser("bench", help="Compare per-call and batch throughput.")
+    bench_parser.add_argument("--rows", type=int, default=1_000_000)
+
+    args = parser.parse_args(argv)
+    if args.command == "convert":
+        rows, seconds = BatchConverter().convert_csv(args.input, args.output, chunk_size=args.chunk_size)
+        print(f"Converted {rows} rows in {seconds:.2f}s ({rows / max(seconds, 1e-9):,.0f} rows/s)")
+    else:
+        result = benchmark(args.rows)
+        print(f"Per-call: {result['per_call_rows_per_sec']:,.0f} rows/s")
+        print(f"Batch:    {result['batch_rows_per_sec']:,.0f} rows/s")
+        print(f"Interned: {result['interned_rows_per_sec']:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
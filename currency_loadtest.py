@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from currency_engine import DEFAULT_EXCHANGE_RATES
+from currency_service import ConversionCore, ConversionServer, DEFAULT_HOST
+
+# --- Load Test Harness for the Currency Service ---
+# Opens `concurrency` keep-alive connections, each sending requests back to back
+# for a fixed duration, and reports latency percentiles and throughput.
+# Without --port it starts a server in-process on a free port.
+
+DEFAULT_LEVELS = (1, 4, 16, 64, 256)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def build_request(host, body):
+    return (
+        f"POST /convert HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode("latin-1") + body
+
+
+async def client(host, port, bodies, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(build_request(host, random.choice(bodies)))
+            await writer.drain()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, concurrency, duration, bodies):
+    latencies = []
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, bodies, deadline, latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def make_bodies(batch_size, distinct=100):
+    """
+    A pool of request bodies. A small pool with batches of at least
+    currency_service.EXECUTOR_THRESHOLD requests exercises request coalescing.
+    """
+    codes = list(DEFAULT_EXCHANGE_RATES)
+    rng = random.Random(0)
+    bodies = []
+    for _ in range(distinct):
+        requests = [
+            {"amount": round(rng.uniform(1, 10_000), 2), "from": rng.choice(codes), "to": rng.choice(codes)}
+            for _ in range(batch_size)
+        ]
+        bodies.append(json.dumps(requests[0] if batch_size == 1 else requests).encode("utf-8"))
+    return bodies
+
+
+async def run(args):
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        server = await ConversionServer(ConversionCore(), host, 0).start()
+        port = server.port
+    bodies = make_bodies(args.batch_size, args.distinct)
+    try:
+        print(f"{'conc':>6} {'requests':>10} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+        for level in args.levels:
+            result = await run_level(host, port, level, args.duration, bodies)
+            print(f"{result['concurrency']:>6} {result['requests']:>10} {result['throughput']:>10,.0f} "
+                  f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f}")
+        if server is not None:
+            print(f"Coalesced requests: {server.coalesced_count}")
+    finally:
+        if server is not None:
+            await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the currency conversion HTTP service.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=None, help="Port of a running service (default: start one).")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per concurrency level.")
+    parser.add_argument("--levels", type=int, nargs="+", default=list(DEFAULT_LEVELS))
+    parser.add_argument("--batch-size", type=int, default=1, help="Conversions per request body.")
+    parser.add_argument("--distinct", type=int, default=100, help="Number of distinct request bodies.")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+
+# --- Cross-Rate Store ---
+# Keeps a dense N x N matrix of cross rates built from base-relative rates
+# (rate = value of 1 unit in the base currency, GHS for this app).
+# cross[i, j] is how many units of currency j one unit of currency i buys,
+# so any pair lookup is one index into a contiguous float64 array.
+
+INITIAL_CAPACITY = 16
+
+
+class RateStore:
+    """
+    Dense cross-rate matrix with O(1) pair lookups.
+    Changing a single rate only rewrites that currency's row and column.
+    """
+
+    def __init__(self, base_rates=None, base_currency="GHS"):
+        self.base_currency = base_currency
+        self.codes = []
+        self.code_to_index = {}
+        self._base = np.empty(INITIAL_CAPACITY, dtype=np.float64)
+        self._cross = np.empty((INITIAL_CAPACITY, INITIAL_CAPACITY), dtype=np.float64)
+        if base_rates:
+            self.load(base_rates)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __contains__(self, code):
+        return code in self.code_to_index
+
+    @property
+    def base_rates(self):
+        """Base-relative rates of the loaded currencies, in index order (read-only view)."""
+        view = self._base[: len(self.codes)]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def matrix(self):
+        """The N x N cross-rate matrix (read-only view, C-contiguous rows)."""
+        n = len(self.codes)
+        view = self._cross[:n, :n]
+        view.flags.writeable = False
+        return view
+
+    def load(self, base_rates):
+        """
+        Replaces all rates with {code: base_rate} entries, rebuilding the whole
+        matrix once; currencies not in base_rates are dropped. Every rate is
+        checked first, so a bad one raises ValueError and leaves the store as
+        it was. Use set_rate for single updates.
+        """
+        for code, rate in base_rates.items():
+            self._check_rate(code, rate)
+        codes = list(base_rates)
+        n = len(codes)
+        capacity = INITIAL_CAPACITY
+        while capacity < n:
+            capacity *= 2
+        base = np.empty(capacity, dtype=np.float64)
+        base[:n] = [base_rates[code] for code in codes]
+        cross = np.empty((capacity, capacity), dtype=np.float64)
+        # Outer division: cross[i, j] = base[i] / base[j]
+        np.divide.outer(base[:n], base[:n], out=cross[:n, :n])
+        self.codes, self.code_to_index = codes, {code: index for index, code in enumerate(codes)}
+        self._base, self._cross = base, cross
+
+    def set_rate(self, code, rate):
+        """
+        Sets (or adds) one currency's base-relative rate.
+        Only row and column `index` of the matrix are recomputed, O(N).
+        """
+        self._check_rate(code, rate)
+        index = self._index_for(code)
+        n = len(self.codes)
+        self._base[index] = rate
+        base = self._base[:n]
+        np.divide(rate, base, out=self._cross[index, :n])
+        np.divide(base, rate, out=self._cross[:n, index])
+        self._cross[index, index] = 1.0
+
+    def cross_rate(self, from_currency, to_currency):
+        """
+        Returns the rate to multiply an amount in from_currency by
+        to get to_currency. Raises KeyError for unknown currencies.
+        """
+        return self._cross[self.code_to_index[from_currency], self.code_to_index[to_currency]]
+
+    def convert(self, amount, from_currency, to_currency):
+        """Converts a single amount with one matrix lookup."""
+        return amount * float(self.cross_rate(from_currency, to_currency))
+
+    def convert_indexes(self, amounts, from_indexes, to_indexes):
+        """Converts arrays of amounts given interned from/to index arrays."""
+        n = len(self.codes)
+        return np.asarray(amounts, dtype=np.float64) * self._cross[:n, :n][from_indexes, to_indexes]
+
+    def _check_rate(self, code, rate):
+        try:
+            valid = 0 < rate < math.inf
+        except TypeError:
+            valid = False
+        if not valid:
+            raise ValueError(f"Rate for {code} must be a positive number, got {rate!r}.")
+
+    def _index_for(self, code):
+        index = self.code_to_index.get(code)
+        if index is not None:
+            return index
+        index = len(self.codes)
+        if index == len(self._base):
+            self._grow()
+        self.codes.append(code)
+        self.code_to_index[code] = index
+        return index
+
+    def _grow(self):
+        # Double the capacity so adding currencies one by one stays amortized O(N)
+        old_capacity = len(self._base)
+        new_capacity = old_capacity * 2
+        base = np.empty(new_capacity, dtype=np.float64)
+        base[:old_capacity] = self._base
+        cross = np.empty((new_capacity, new_capacity), dtype=np.float64)
+        cross[:old_capacity, :old_capacity] = self._cross
+        self._base = base
+        self._cross = cross
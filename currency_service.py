@@ -0,0 +1,251 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import sys
+import urllib.parse
+
+import numpy as np
+
+from currency_engine import DEFAULT_EXCHANGE_RATES, BatchConverter
+
+# --- Headless Currency Conversion Service ---
+# The conversion core of the Currency Converter GUI, usable from back-end jobs:
+#   python currency_service.py cli      NDJSON on stdin -> NDJSON on stdout
+#   python currency_service.py serve    asyncio HTTP service on localhost
+#
+# A request is {"amount": 10, "from": "USD", "to": "GHS"}; the reply adds
+# "converted". A list of requests is converted as one vectorized batch.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CLI_CHUNK_SIZE = 1000
+MAX_BODY_BYTES = 256 * 1024 * 1024
+EXECUTOR_THRESHOLD = 10_000  # Batches at least this big run off the event loop
+
+
+class ConversionCore:
+    """
+    Converts request dicts with the vectorized engine.
+    Invalid rows get an "error" field instead of failing the whole batch.
+    """
+
+    def __init__(self, exchange_rates=None):
+        self.converter = BatchConverter(exchange_rates or DEFAULT_EXCHANGE_RATES)
+
+    def convert_requests(self, requests):
+        """Converts a list of request dicts and returns a list of result dicts."""
+        results = [None] * len(requests)
+        valid_rows, amounts, from_codes, to_codes = [], [], [], []
+        code_table = self.converter.code_table
+        for row, request in enumerate(requests):
+            try:
+                amount = float(request["amount"])
+                from_currency, to_currency = request["from"], request["to"]
+                if not isinstance(from_currency, str) or not isinstance(to_currency, str):
+                    raise TypeError
+            except (KeyError, TypeError, ValueError, OverflowError):  # OverflowError: an integer too big for a float
+                results[row] = {"error": "Each request needs a numeric 'amount' plus 'from' and 'to' codes."}
+                continue
+            if from_currency not in code_table or to_currency not in code_table:
+                results[row] = dict(request, error="Selected currencies are not supported.")
+                continue
+            valid_rows.append(row)
+            amounts.append(amount)
+            from_codes.append(from_currency)
+            to_codes.append(to_currency)
+
+        if valid_rows:
+            with np.errstate(over="ignore", invalid="ignore"):  # Reported per row below
+                converted = self.converter.convert(np.array(amounts), from_codes, to_codes).tolist()
+            for row, value in zip(valid_rows, converted):
+                if math.isfinite(value):
+                    results[row] = dict(requests[row], converted=value)
+                else:  # JSON has no infinity or NaN
+                    results[row] = dict(requests[row], error="The converted amount is not a finite number.")
+        return results
+
+
+# --- Streaming CLI ---
+
+def run_cli(core, infile=sys.stdin, outfile=sys.stdout, chunk_size=DEFAULT_CLI_CHUNK_SIZE):
+    """
+    Reads NDJSON requests and writes one NDJSON result per input line, in order.
+    Lines are converted in chunks, and output is flushed after every chunk.
+    """
+    lines = (line for line in infile if line.strip())
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            break
+        requests = []
+        for line in chunk:
+            try:
+                requests.append(json.loads(line))
+            except ValueError:
+                requests.append(None)
+        for result in core.convert_requests(requests):
+            outfile.write(json.dumps(result) + "\n")
+        outfile.flush()
+
+
+# --- HTTP Service ---
+
+class ConversionServer:
+    """
+    Minimal HTTP/1.1 server (keep-alive, Content-Length bodies) on asyncio.
+    GET  /convert?amount=10&from=USD&to=GHS
+    POST /convert with a JSON object, a JSON list, or NDJSON lines
+    Batches of EXECUTOR_THRESHOLD requests or more are converted in a worker
+    thread, and identical batches that arrive meanwhile share its result.
+    (Smaller requests are answered before the next one is read.)
+    """
+
+    def __init__(self, core, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.core = core
+        self.host = host
+        self.port = port
+        self.server = None
+        self._in_flight = {}
+        self.coalesced_count = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line."}, close=True)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = headers.get("content-length", "0") or "0"
+                if not length.isdigit():  # Also rejects a sign
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length."}, close=True)
+                    break
+                length = int(length)
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {"error": "Request body is too large."}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                status, payload = await self._dispatch(method, target, body)
+                await self._respond(writer, status, payload, close=not keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        parts = urllib.parse.urlsplit(target)
+        if parts.path != "/convert":
+            return 404, {"error": "Not found."}
+        if method not in ("GET", "POST"):
+            return 405, {"error": "Use GET or POST."}
+        if method == "GET":
+            params = dict(urllib.parse.parse_qsl(parts.query))
+            return 200, self.core.convert_requests([params])[0]
+        return await self._compute(body)
+
+    async def _compute(self, body):
+
+        try:
+            text = body.decode("utf-8")
+            stripped = text.lstrip()
+            if stripped.startswith("["):
+                requests, single = json.loads(text), False
+            elif stripped.startswith("{") and "\n" not in text.strip():
+                requests, single = [json.loads(text)], True
+            else:
+                requests, single = [json.loads(line) for line in text.splitlines() if line.strip()], False
+        except ValueError:
+            return 400, {"error": "Body must be a JSON object, a JSON list or NDJSON."}
+
+        if len(requests) >= EXECUTOR_THRESHOLD:
+            results = await self._convert_off_loop(body, requests)
+        else:
+            results = self.core.convert_requests(requests)
+        return 200, results[0] if single else results
+
+    async def _convert_off_loop(self, body, requests):
+        # Large batches run in a worker thread so other clients are not held up.
+        # An identical body that arrives meanwhile waits for the same result
+        future = self._in_flight.get(body)
+        if future is not None:
+            self.coalesced_count += 1
+            return await asyncio.shield(future)
+        future = asyncio.get_running_loop().run_in_executor(None, self.core.convert_requests, requests)
+        self._in_flight[body] = future
+        try:
+            return await asyncio.shield(future)  # A client going away does not cancel it for the others
+        finally:
+            del self._in_flight[body]
+
+    async def _respond(self, writer, status, payload, close=False):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                   413: "Payload Too Large", 500: "Internal Server Error"}
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless currency conversion CLI and HTTP service.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    cli_parser = subparsers.add_parser("cli", help="Convert NDJSON from stdin to stdout.")
+    cli_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CLI_CHUNK_SIZE)
+
+    serve_parser = subparsers.add_parser("serve", help="Run the HTTP service on localhost.")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    args = parser.parse_args(argv)
+    core = ConversionCore()
+    if args.command == "cli":
+        run_cli(core, chunk_size=args.chunk_size)
+    else:
+        server = ConversionServer(core, args.host, args.port)
+        print(f"Serving currency conversions on http://{args.host}:{args.port}/convert")
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            print("Server stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+import argparse
+import math
+import sys
+import time
+from decimal import Context, Decimal, ROUND_HALF_EVEN, ROUND_HALF_UP
+from functools import lru_cache
+
+import numpy as np
+
+from currency_engine import DEFAULT_EXCHANGE_RATES, BatchConverter, CodeTable
+
+# --- Exact Fixed-Point Currency Conversion ---
+# Amounts are integers in minor units (pesewas, cents, ...) following the
+# ISO 4217 minor-unit exponent of each currency. Each pair's cross rate is
+# kept as an exact integer ratio, and every conversion is the amount times
+# that ratio with one rounding step, so the result is always the correctly
+# rounded one and reconverting a ledger never accumulates drift.
+#
+# The batch path avoids integer division, which is what keeps it ahead of the
+# float path: each result is first taken as q = rint(amount * float rate). That
+# float product is within |amount| * rate * 2**-51 of the exact value, so q is
+# already the correctly rounded result unless the product lands within that
+# distance of a rounding boundary. Only those rows (and every exact tie) are
+# checked exactly: the residual amount * numerator - q * denominator, computed
+# in wrapping int64 arithmetic, is exact because its true value is below
+# 1.5 * denominator, and it says which way to round. Pairs whose ratio does not
+# fit in int64, and batches with huge amounts, are converted one by one.
+
+FLOAT_GUESS_LIMIT = 2 ** 51  # Results below this are guessed within 1.5 by float
+MAX_DENOMINATOR = 2 ** 61  # Keeps twice the residual inside int64
+# Adding 1.5 * 2**52 to a float below 2**51 rounds it to the nearest integer
+# (half-even), which then sits in the low bits of the sum: rint and the
+# float-to-int conversion in one add and one integer subtract
+ROUNDING_MAGIC = 1.5 * 2 ** 52
+ROUNDING_MAGIC_BITS = int(np.float64(ROUNDING_MAGIC).view(np.int64))
+BATCH_CHUNK_SIZE = 1 << 14  # Rows per chunk; keeps the scratch buffers in cache
+
+# ISO 4217 minor-unit exponents; currencies not listed use DEFAULT_EXPONENT
+MINOR_UNIT_EXPONENTS = {
+    "BHD": 3, "BIF": 0, "CLP": 0, "DJF": 0, "GNF": 0, "IQD": 3, "ISK": 0,
+    "JOD": 3, "JPY": 0, "KMF": 0, "KRW": 0, "KWD": 3, "LYD": 3, "OMR": 3,
+    "PYG": 0, "RWF": 0, "TND": 3, "UGX": 0, "VND": 0, "VUV": 0, "XAF": 0,
+    "XOF": 0, "XPF": 0,
+}
+DEFAULT_EXPONENT = 2
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def minor_unit_exponent(currency):
+    """Number of decimal places used by the currency's minor unit."""
+    return MINOR_UNIT_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+@lru_cache(maxsize=None)
+def quantization_context(currency, rounding=ROUND_HALF_EVEN):
+    """
+    Returns (quantum, context) for a currency, e.g. (Decimal('0.01'), ctx).
+    Cached, so building Decimal objects is not repeated on every conversion.
+    """
+    quantum = Decimal(1).scaleb(-minor_unit_exponent(currency))
+    return quantum, Context(prec=38, rounding=rounding)
+
+
+def to_minor_units(amount, currency, rounding=ROUND_HALF_EVEN):
+    """
+    Converts an amount (str, int, float or Decimal) to an integer number of minor units.
+    Floats go through their shortest repr, so 0.1 means exactly 0.1.
+    """
+    quantum, context = quantization_context(currency, rounding)
+    value = Decimal(repr(amount)) if isinstance(amount, float) else Decimal(amount)
+    return int(value.quantize(quantum, context=context).scaleb(minor_unit_exponent(currency)))
+
+
+def from_minor_units(minor_units, currency):
+    """Converts an integer number of minor units back to a Decimal amount."""
+    quantum, _ = quantization_context(currency)
+    return Decimal(int(minor_units)).scaleb(-minor_unit_exponent(currency)).quantize(quantum)
+
+
+def rate_to_decimal(rate):
+    """Converts a rate to Decimal; floats go through their shortest repr."""
+    return Decimal(repr(rate)) if isinstance(rate, float) else Decimal(rate)
+
+
+def _round_div(numerator, denominator, rounding):
+    """Integer division of Python ints with half-even or half-up (away from zero) rounding."""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator:
+        quotient += 1
+    elif twice == denominator:
+        if rounding == ROUND_HALF_UP:
+            quotient += 0 if quotient < 0 else 1
+        elif quotient % 2:
+            quotient += 1
+    return quotient
+
+
+class ExactConverter:
+    """
+    Converts minor-unit integer amounts between currencies with integer arithmetic.
+    rates: {code: base_rate} as in the GUI (value of 1 unit in GHS).
+    rounding: optional {code: ROUND_HALF_EVEN or ROUND_HALF_UP} applied
+    by target currency; others use default_rounding.
+    """
+
+    def __init__(self, rates=None, rounding=None, default_rounding=ROUND_HALF_EVEN):
+        if rates is None:
+            rates = DEFAULT_EXCHANGE_RATES
+        self.rounding = dict(rounding or {})
+        self.default_rounding = default_rounding
+        self.update_rates(rates)
+
+    @property
+    def codes(self):
+        return self.code_table.codes
+
+    def update_rates(self, rates):
+        """Rebuilds the scaled cross-rate tables from {code: base_rate}."""
+        self.code_table = CodeTable(rates)
+        codes = self.code_table.codes
+        # Exact rationals: every Decimal is numerator / denominator
+        ratios = [rate_to_decimal(rates[code]).as_integer_ratio() for code in codes]
+        exponents = [minor_unit_exponent(code) for code in codes]
+        n = len(codes)
+
+        # _ratios[i][j] = (numerator, denominator) of rate_i / rate_j * 10**(exp_j - exp_i);
+        # the batch path keeps that as a float plus int64 numerator and denominator,
+        # which are 0 for a pair too big for int64 (so every row of it is redone exactly)
+        self._ratios = [[None] * n for _ in range(n)]
+        cross = np.empty((n, n), dtype=np.float64)
+        numerators = np.zeros((n, n), dtype=np.int64)
+        denominators = np.zeros((n, n), dtype=np.int64)
+        for i in range(n):
+            for j in range(n):
+                shift = exponents[j] - exponents[i]
+                numerator = ratios[i][0] * ratios[j][1] * 10 ** max(shift, 0)
+                denominator = ratios[i][1] * ratios[j][0] * 10 ** max(-shift, 0)
+                common = math.gcd(numerator, denominator)
+                numerator, denominator = numerator // common, denominator // common
+                self._ratios[i][j] = (numerator, denominator)
+                cross[i, j] = numerator / denominator  # Correctly rounded
+                if numerator <= INT64_MAX and denominator < MAX_DENOMINATOR:
+                    numerators[i, j], denominators[i, j] = numerator, denominator
+        self._cross, self._numerators, self._denominators = cross.ravel(), numerators.ravel(), denominators.ravel()
+        self._max_rate = float(cross.max()) if n else 0.0
+        self._half_up = np.array([self.rounding_for(code) == ROUND_HALF_UP for code in codes], dtype=bool)
+
+    def rounding_for(self, currency):
+        return self.rounding.get(currency, self.default_rounding)
+
+    def set_rounding(self, currency, rounding):
+        """Changes the rounding mode used when converting into a currency."""
+        self.rounding[currency] = rounding
+        if currency in self.code_table:
+            self._half_up[self.code_table.index(currency)] = rounding == ROUND_HALF_UP
+
+    def convert_minor(self, minor_units, from_currency, to_currency):
+        """Converts one integer minor-unit amount, rounding the exact result once."""
+        numerator, denominator = self._ratios[self.code_table.index(from_currency)][self.code_table.index(to_currency)]
+        return _round_div(int(minor_units) * numerator, denominator, self.rounding_for(to_currency))
+
+    def convert_decimal(self, amount, from_currency, to_currency):
+        """
+        Converts an amount given in major units (str, int, float or Decimal)
+        and returns a Decimal quantized to the target currency's minor unit.
+        """
+        minor_units = to_minor_units(amount, from_currency, self.rounding_for(from_currency))
+        return from_minor_units(self.convert_minor(minor_units, from_currency, to_currency), to_currency)
+
+    def pair_indexes(self, from_codes, to_codes):
+        """
+        Interns (from, to) currency pairs to indexes into the cross-rate table.
+        Compute these once for a ledger that is converted repeatedly.
+        """
+        from_indexes = self.code_table.intern(from_codes)
+        to_indexes = self.code_table.intern(to_codes)
+        return from_indexes * len(self.code_table) + to_indexes
+
+    def convert_batch(self, minor_units, from_codes, to_codes):
+        """
+        Converts an int64 array of minor-unit amounts in one vectorized pass.
+        from_codes/to_codes are code arrays, index arrays or a single code.
+        """
+        return self.convert_pairs(minor_units, self.pair_indexes(from_codes, to_codes))
+
+    def convert_pairs(self, minor_units, pairs):
+        """
+        Converts minor-unit amounts given pair indexes from pair_indexes().
+        Returns an int64 array; raises OverflowError if a result does not fit.
+        """
+        amounts = np.asarray(minor_units, dtype=np.int64)
+        flat_amounts = amounts.ravel()
+        result = np.empty(flat_amounts.shape, dtype=np.int64)
+        size = min(BATCH_CHUNK_SIZE, len(flat_amounts))
+        product, nearest = np.empty(size, dtype=np.float64), np.empty(size, dtype=np.float64)
+        is_close = np.empty(size, dtype=bool)
+        close = {"rows": [], "amounts": [], "quotients": [], "pairs": []}  # Rows to check exactly
+        single_pair = np.ndim(pairs) == 0
+        if single_pair:
+            rate = float(self._cross[pairs])  # One pair for the whole batch: the rate is a scalar
+            largest_rate = rate
+        else:
+            flat_pairs = np.broadcast_to(pairs, amounts.shape).ravel()
+            rates = np.empty(size, dtype=np.float64)
+            largest_rate = self._max_rate
+
+        # Work through the batch in cache-sized chunks with reused scratch buffers:
+        # every step writes into preallocated memory instead of a fresh temporary
+        for start in range(0, len(flat_amounts), BATCH_CHUNK_SIZE):
+            stop = min(start + BATCH_CHUNK_SIZE, len(flat_amounts))
+            k = stop - start
+            a, quotient = flat_amounts[start:stop], result[start:stop]
+            chunk_pairs = pairs if single_pair else flat_pairs[start:stop]
+            largest = max(int(a.max()), -int(a.min()))
+            if largest * max(largest_rate, 1.0) >= FLOAT_GUESS_LIMIT:
+                quotient[:] = self._convert_pairs_python(a, chunk_pairs)
+                continue
+            x, q, is_near = product[:k], nearest[:k], is_close[:k]
+            if not single_pair:
+                # mode="clip" skips the bounds check (pairs are validated by interning)
+                # and lets take() write straight into the buffer
+                rate = rates[:k]
+                self._cross.take(chunk_pairs, out=rate, mode="clip")
+            np.copyto(x, a)
+            x *= rate
+            np.add(x, ROUNDING_MAGIC, out=q)
+            np.subtract(q.view(np.int64), ROUNDING_MAGIC_BITS, out=quotient)
+            q -= ROUNDING_MAGIC
+            x -= q  # Exact: x and its nearest integer are close
+            np.abs(x, out=x)
+            # Rows whose product is this close to halfway between integers could
+            # round the other way exactly: the product is off by at most
+            # |amount| * rate * 2**-52 * (1 + 2**-51)
+            np.greater_equal(x, 0.5 - largest * largest_rate * 2.0 ** -51, out=is_near)
+            rows = np.flatnonzero(is_near)
+            if rows.size:  # Gathered while the chunk is in cache, checked all at once below
+                close["rows"].append(rows + start)
+                close["amounts"].append(a[rows])
+                close["quotients"].append(quotient[rows])
+                if not single_pair:
+                    close["pairs"].append(chunk_pairs[rows])
+        if close["rows"]:
+            result[np.concatenate(close["rows"])] = self._fix_rows(
+                np.concatenate(close["amounts"]), np.concatenate(close["quotients"]),
+                pairs if single_pair else np.concatenate(close["pairs"]))
+        return result.reshape(amounts.shape)
+
+    def _fix_rows(self, amounts, quotients, pairs):
+        # Moves each guess q to the nearest integer using its exact residual (the
+        # exact value is q + residual / denominator), settles ties by the target
+        # currency's rounding mode, and returns the results
+        numerators = np.broadcast_to(self._numerators[pairs], quotients.shape)
+        denominators = np.broadcast_to(self._denominators[pairs], quotients.shape)
+        # Products wrap, but the residual itself is below 1.5 * denominator, so it comes out right
+        twice = amounts * numerators - quotients * denominators
+        twice += twice
+        below, above = twice <= -denominators, twice > denominators  # Below takes ties: they become q + 1/2
+        quotients -= below
+        quotients += above
+        twice += 2 * denominators * (below.astype(np.int64) - above)
+        # At q + 1/2, half-even goes up from an odd q, half-up (away from zero) from q >= 0
+        up = quotients & 1
+        if self._half_up.any():
+            up = np.where(self._half_up[pairs % len(self.code_table)], quotients >= 0, up)
+        np.add(quotients, up, out=quotients, where=twice == denominators)
+        no_ratio = denominators == 0  # Pairs without an int64 ratio
+        if no_ratio.any():
+            quotients[no_ratio] = self._convert_pairs_python(
+                amounts[no_ratio], pairs if np.ndim(pairs) == 0 else pairs[no_ratio])
+        return quotients
+
+    def _convert_pairs_python(self, amounts, pairs):
+        # Exact conversion row by row, for amounts too large for the int64
+        # fast path and for rows too close to a rounding boundary
+        n = len(self.code_table)
+        codes = self.code_table.codes
+        results = []
+        for amount, pair in zip(amounts.ravel().tolist(), np.broadcast_to(pairs, amounts.shape).ravel().tolist()):
+            numerator, denominator = self._ratios[pair // n][pair % n]
+            results.append(_round_div(amount * numerator, denominator, self.rounding_for(codes[pair % n])))
+        try:
+            return np.array(results, dtype=np.int64).reshape(amounts.shape)
+        except OverflowError:
+            raise OverflowError("A converted amount does not fit in a 64-bit integer.") from None
+
+
+# --- Benchmark ---
+
+def benchmark(row_count=1_000_000):
+    """
+    Times the exact integer batch path against the float batch path on the same
+    ledger: minor units in, minor units out (the float path rounds back to cents).
+    A sample of the exact results is checked against convert_minor.
+    """
+    rates = DEFAULT_EXCHANGE_RATES
+    exact = ExactConverter(rates)
+    floating = BatchConverter(rates)
+    rng = np.random.default_rng(0)
+    minor_units = rng.integers(-10**12, 10**12, row_count)
+    from_indexes = rng.integers(0, len(exact.codes), row_count)
+    to_indexes = rng.integers(0, len(exact.codes), row_count)
+    amounts = minor_units / 100
+
+    # Both converters intern the same dict, so the indexes line up.
+    # Pairs are interned once up front, like the float path's code indexes
+    pairs = exact.pair_indexes(from_indexes, to_indexes)
+
+    timings = {}
+    for name, run in (
+        ("float", lambda: np.rint(floating.convert(amounts, from_indexes, to_indexes) * 100).astype(np.int64)),
+        ("exact", lambda: exact.convert_pairs(minor_units, pairs)),
+    ):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        timings[name] = row_count / best
+
+    converted = exact.convert_pairs(minor_units, pairs)
+    for row in range(0, row_count, max(1, row_count // 1000)):
+        expected = exact.convert_minor(minor_units[row], exact.codes[from_indexes[row]], exact.codes[to_indexes[row]])
+        assert converted[row] == expected, (row, converted[row], expected)
+    return {"rows": row_count, "float_rows_per_sec": timings["float"], "exact_rows_per_sec": timings["exact"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark exact fixed-point conversion.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    result = benchmark(args.rows)
+    print(f"Float batch: {result['float_rows_per_sec']:,.0f} rows/s")
+    print(f"Exact batch: {result['exact_rows_per_sec']:,.0f} rows/s")
+    if result["exact_rows_per_sec"] < result["float_rows_per_sec"]:
+        print("The exact batch is slower than the float batch.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
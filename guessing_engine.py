@@ -0,0 +1,304 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from guessing_rng import SecretSource
+
+# --- Number Guessing Engine ---
+# The game from "number guesssing using python.py", usable from code:
+#
+#   game = GuessingGame(1, 100)
+#   game.guess(50)   -> TOO_LOW / TOO_HIGH / CORRECT
+#
+# A strategy picks the next guess from the range the secret can still be in
+# (low..high, narrowed by each answer). choose() works on plain ints and on
+# NumPy arrays alike, so simulate() can play millions of games at once: each
+# round is a handful of array operations over every game still running.
+#
+#   binary    guess the middle: the minimax strategy, never more than
+#             ceil(log2(n + 1)) guesses, and the best on average too when
+#             every number is equally likely
+#   optimal   the guess tree with the fewest expected guesses for a given
+#             prior (how likely each secret is), by dynamic programming
+#   random    any number still possible (a baseline)
+#
+# Secrets come from guessing_rng: pass a seed (or a SecretSource) to repeat a run.
+
+TOO_LOW = "too low"
+TOO_HIGH = "too high"
+CORRECT = "correct"
+
+OPTIMAL_MAX_RANGE = 2000  # The optimal strategy's table is O(n^2): a few seconds to build at 2000
+SIMULATION_CHUNK = 1 << 20
+
+
+class GuessingGame:
+    """
+    One game: a secret number between low and high (inclusive). The secret is
+    drawn with `rng` unless given: anything with randint(low, high), such as
+    a guessing_rng.SecretSource or a random.Random (default: module random).
+    """
+
+    __slots__ = ("low", "high", "secret", "guesses", "finished")  # The server holds thousands
+
+    def __init__(self, low=1, high=100, secret=None, rng=None):
+        if low > high:
+            raise ValueError("The range is empty: low must not be above high.")
+        self.low = low
+        self.high = high
+        self.secret = secret if secret is not None else (rng or random).randint(low, high)
+        if not low <= self.secret <= high:
+            raise ValueError(f"The secret must be between {low} and {high}.")
+        self.guesses = 0
+        self.finished = False
+
+    def guess(self, number):
+        """Returns TOO_LOW, TOO_HIGH or CORRECT. Raises ValueError outside the range."""
+        if self.finished:
+            raise ValueError("The game is over.")
+        if not self.low <= number <= self.high:
+            raise ValueError(f"Guess a number from {self.low}-{self.high}.")
+        self.guesses += 1
+        if number < self.secret:
+            return TOO_LOW
+        if number > self.secret:
+            return TOO_HIGH
+        self.finished = True
+        return CORRECT
+
+
+def worst_case_guesses(low, high):
+    """Guesses binary search needs at most, which no strategy can beat."""
+    return (high - low + 1).bit_length()
+
+
+# --- Strategies ---
+
+class BinarySearch:
+    """Guesses the middle of the remaining range."""
+
+    name = "binary"
+
+    def choose(self, low, high):
+        return (low + high) // 2
+
+
+class RandomGuess:
+    """Guesses any number still possible."""
+
+    name = "random"
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)  # Also takes a SeedSequence or Generator
+
+    def choose(self, low, high):
+        return self.rng.integers(low, high, endpoint=True)
+
+
+class OptimalStrategy:
+    """
+    Minimizes the expected number of guesses when secret k has probability
+    prior[k - low] (uniform if prior is None). This is the optimal binary
+    search tree problem: Knuth's O(n^2) dynamic program fills a table of the
+    best guess for every remaining range, so choose() is one lookup.
+    """
+
+    name = "optimal"
+
+    def __init__(self, low=1, high=100, prior=None):
+        size = high - low + 1
+        if not 1 <= size <= OPTIMAL_MAX_RANGE:
+            raise ValueError(f"The optimal strategy supports ranges of 1 to {OPTIMAL_MAX_RANGE} numbers.")
+        weights = np.ones(size) if prior is None else np.asarray(prior, dtype=float)
+        if weights.shape != (size,) or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError(f"The prior needs {size} non-negative weights, not all zero.")
+        weights = (weights / weights.sum()).tolist()
+        self.low = low
+        self.high = high
+
+        prefix = [0.0]
+        for weight in weights:
+            prefix.append(prefix[-1] + weight)
+        # cost[i][j] / root[i][j]: expected guesses / best first guess for secrets i..j-1
+        cost = [[0.0] * (size + 1) for _ in range(size + 1)]
+        root = [[0] * (size + 1) for _ in range(size + 1)]
+        for i in range(size):
+            cost[i][i + 1] = weights[i]
+            root[i][i + 1] = i
+        for length in range(2, size + 1):
+            for i in range(size - length + 1):
+                j = i + length
+                best_cost, best_root = float("inf"), i
+                # Knuth: the best root only moves right as the range grows
+                for r in range(root[i][j - 1], root[i + 1][j] + 1):
+                    candidate = cost[i][r] + cost[r + 1][j]
+                    if candidate < best_cost:
+                        best_cost, best_root = candidate, r
+                cost[i][j] = best_cost + prefix[j] - prefix[i]
+                root[i][j] = best_root
+        self.expected_guesses = cost[0][size]
+        # table[lo - low, hi - low] = guess for the range lo..hi
+        self.table = np.array([row[1:] for row in root[:size]], dtype=np.int64) + low
+
+    def choose(self, low, high):
+        return self.table[low - self.low, high - self.low]
+
+
+STRATEGIES = {
+    "binary": lambda low, high, prior, seed: BinarySearch(),
+    "optimal": lambda low, high, prior, seed: OptimalStrategy(low, high, prior),
+    "random": lambda low, high, prior, seed: RandomGuess(seed),
+}
+
+
+def make_strategy(name, low=1, high=100, prior=None, seed=None):
+    try:
+        return STRATEGIES[name](low, high, prior, seed)
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r}; choose from {', '.join(STRATEGIES)}.") from None
+
+
+def play(strategy, game):
+    """Lets a strategy play a game to the end. Returns the number of guesses."""
+    low, high = game.low, game.high
+    while True:
+        guess = int(strategy.choose(low, high))
+        result = game.guess(guess)
+        if result == CORRECT:
+            return game.guesses
+        if result == TOO_LOW:
+            low = guess + 1
+        else:
+            high = guess - 1
+
+
+# --- Monte Carlo Simulation ---
+
+def _prior_probabilities(prior):
+    weights = np.asarray(prior, dtype=float)
+    return weights / weights.sum()
+
+
+def simulate(strategy, games=1_000_000, low=1, high=100, prior=None, seed=None):
+    """
+    Plays `games` games with secrets drawn from the prior (uniform if None),
+    all at once with NumPy. Returns counts: counts[k] games took k guesses.
+    seed is anything np.random.default_rng takes (an int, a SeedSequence or a
+    Generator, such as SecretSource(...).generator). Raises ValueError if
+    games < 1.
+    """
+    if games < 1:
+        raise ValueError("Simulate at least one game.")
+    rng = np.random.default_rng(seed)
+    size = high - low + 1
+    max_guesses = size  # A strategy that guesses inside the range always finishes by then
+    counts = np.zeros(64, dtype=np.int64)
+    probabilities = None if prior is None else _prior_probabilities(prior)
+    for start in range(0, games, SIMULATION_CHUNK):
+        chunk = min(SIMULATION_CHUNK, games - start)
+        if probabilities is None:
+            secrets = rng.integers(low, high, size=chunk, endpoint=True)
+        else:
+            secrets = rng.choice(size, size=chunk, p=probabilities) + low
+        lows = np.full(chunk, low, dtype=np.int64)
+        highs = np.full(chunk, high, dtype=np.int64)
+        for guess_number in range(1, max_guesses + 1):
+            guesses = strategy.choose(lows, highs)
+            correct = guesses == secrets
+            if guess_number == len(counts):
+                counts = np.concatenate((counts, np.zeros_like(counts)))
+            counts[guess_number] += np.count_nonzero(correct)
+            running = ~correct
+            if not running.any():
+                break
+            # Keep only the games still running, with their narrowed ranges
+            secrets, guesses = secrets[running], guesses[running]
+            too_low = guesses < secrets
+            lows = np.where(too_low, guesses + 1, lows[running])
+            highs = np.where(too_low, highs[running], guesses - 1)
+        else:
+            raise RuntimeError(f"Strategy {strategy.name!r} did not finish within {max_guesses} guesses.")
+    return np.trim_zeros(counts, "b")
+
+
+def summarize(counts):
+    """Returns (mean, worst, {guesses: share of games}) for simulate() counts."""
+    games = counts.sum()
+    if games == 0:
+        raise ValueError("No games were played.")
+    guesses = np.arange(len(counts))
+    shares = {int(k): counts[k] / games for k in np.flatnonzero(counts)}
+    return float((counts * guesses).sum() / games), int(guesses[counts > 0].max()), shares
+
+
+def _named_prior(name, low, high):
+    if name == "uniform":
+        return None
+    if name == "low":
+        # People tend to pick small numbers: chance falls off like 1/k
+        return 1.0 / np.arange(1, high - low + 2)
+    raise ValueError(f"Unknown prior {name!r}.")
+
+
+def exact_mean(strategy, low, high, prior=None):
+    """Expected guesses of a deterministic strategy, by playing every secret once."""
+    guesses = np.array([play(strategy, GuessingGame(low, high, secret)) for secret in range(low, high + 1)])
+    weights = np.full(len(guesses), 1 / len(guesses)) if prior is None else _prior_probabilities(prior)
+    return float(guesses @ weights)
+
+
+def benchmark(games=1_000_000, low=1, high=100, prior_name="uniform", strategies=("binary", "optimal", "random"),
+              seed=None):
+    """
+    Simulates each strategy. Returns {name: (games per second, counts, exact
+    mean)}; the exact mean is None for the random strategy or huge ranges.
+    Each strategy gets its own child stream of `seed` (a SecretSource, or a
+    seed for one), so its results repeat whichever other strategies run.
+    """
+    prior = _named_prior(prior_name, low, high)
+    source = seed if isinstance(seed, SecretSource) else SecretSource(seed)
+    streams = dict(zip(STRATEGIES, source.spawn(len(STRATEGIES))))
+    results = {}
+    for name in strategies:
+        secrets, guesses = streams[name].spawn(2)
+        strategy = make_strategy(name, low, high, prior, guesses.seed_sequence)
+        start = time.perf_counter()
+        counts = simulate(strategy, games, low, high, prior, secrets.generator)
+        rate = games / (time.perf_counter() - start)
+        exact = exact_mean(strategy, low, high, prior) if name != "random" and high - low < OPTIMAL_MAX_RANGE else None
+        results[name] = (rate, counts, exact)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare number guessing strategies by simulation.")
+    parser.add_argument("--low", type=int, default=1)
+    parser.add_argument("--high", type=int, default=100)
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--prior", choices=("uniform", "low"), default="uniform",
+                        help="How secrets are picked (low: small numbers more likely).")
+    parser.add_argument("--strategies", nargs="+", choices=tuple(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("--seed", type=int, help="Repeat an earlier run (its seed is printed).")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1.")
+    if args.low > args.high:
+        parser.error("The range is empty: --low must not be above --high.")
+    source = SecretSource(args.seed)
+    print(f"{args.games:,} games, secrets {args.low}-{args.high} ({args.prior}), seed {source.seed}; "
+          f"worst case for binary search: {worst_case_guesses(args.low, args.high)}")
+    try:
+        results = benchmark(args.games, args.low, args.high, args.prior, args.strategies, source)
+    except ValueError as e:
+        parser.error(str(e))
+    for name, (rate, counts, exact) in results.items():
+        mean, worst, shares = summarize(counts)
+        exact = f" (exact {exact:.3f})" if exact is not None else ""
+        print(f"{name:>8}: mean {mean:6.3f}{exact} guesses, worst {worst:3d}, {rate:13,.0f} games/s")
+        print("          " + "  ".join(f"{k}:{share:6.2%}" for k, share in shares.items() if share >= 0.0005))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+# --- Random Secrets ---
+# Where the guessing game gets its secrets. A SecretSource wraps a NumPy
+# Generator seeded from a SeedSequence, so:
+#
+#   - a run is reproducible: pass the same seed (print source.seed to get the
+#     one a fresh source picked for itself)
+#   - spawn() hands out independent child streams (one per server session or
+#     per simulated strategy) that stay reproducible however they interleave
+#   - secrets are drawn in batches: one Generator call fills a list, and
+#     randint() just pops from it
+#
+# Anything with randint(low, high) can stand in for it (random.Random works),
+# which is how GuessingGame takes its rng.
+
+BATCH_SIZE = 4096
+
+
+class SecretSource:
+    """
+    Batched random integers from a seeded NumPy Generator. seed is an int, a
+    SeedSequence, or None for fresh entropy. The numbers drawn depend on the
+    seed and the batch size.
+    """
+
+    def __init__(self, seed=None, batch_size=BATCH_SIZE):
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.generator = np.random.default_rng(self.seed_sequence)
+        self.batch_size = batch_size
+        self._range = None
+        self._batch = []
+
+    @property
+    def seed(self):
+        """The entropy this source was seeded with; SecretSource(seed) repeats its top-level stream."""
+        return self.seed_sequence.entropy
+
+    def randint(self, low, high):
+        """A random integer in low..high (inclusive), like random.randint."""
+        if not self._batch or self._range != (low, high):
+            self._range = (low, high)
+            self._batch = self.draw(low, high, self.batch_size).tolist()
+            self._batch.reverse()  # pop() from the end hands them out in drawn order
+        return self._batch.pop()
+
+    def draw(self, low, high, count):
+        """An array of `count` random integers in low..high, in one call."""
+        return self.generator.integers(low, high, size=count, endpoint=True)
+
+    def spawn(self, count=None, batch_size=None):
+        """
+        Independent child sources (one if count is None). Children are numbered
+        in spawn order, so the same seed gives the same children in the same order.
+        """
+        children = [SecretSource(child, batch_size or self.batch_size)
+                    for child in self.seed_sequence.spawn(1 if count is None else count)]
+        return children[0] if count is None else children
+
+
+# --- Benchmark ---
+
+def benchmark(count=1_000_000, low=1, high=100):
+    """Seconds to produce `count` secrets each way. Returns {name: seconds}."""
+    results = {}
+    start = time.perf_counter()
+    for _ in range(count):
+        random.randint(low, high)
+    results["random.randint per call"] = time.perf_counter() - start
+
+    generator = np.random.default_rng(0)
+    start = time.perf_counter()
+    for _ in range(count):
+        generator.integers(low, high, endpoint=True)
+    results["Generator.integers per call"] = time.perf_counter() - start
+
+    source = SecretSource(0)
+    start = time.perf_counter()
+    for _ in range(count):
+        source.randint(low, high)
+    results["SecretSource.randint (batched)"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    SecretSource(0).draw(low, high, count)
+    results["SecretSource.draw (one array)"] = time.perf_counter() - start
+
+    return results
+
+
+def spawn_cost(count=10_000, low=1, high=100):
+    """Seconds to spawn one child stream and draw its first secret (a seeded server session)."""
+    start = time.perf_counter()
+    for child in SecretSource(0).spawn(count, batch_size=16):
+        child.randint(low, high)
+    return (time.perf_counter() - start) / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ways of drawing guessing game secrets.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    results = benchmark(args.count)
+    baseline = results["random.randint per call"]
+    print(f"{args.count:,} secrets")
+    for name, seconds in results.items():
+        print(f"  {name:<32} {seconds * 1000:9.1f} ms  {args.count / seconds:14,.0f}/s  ({baseline / seconds:5.1f}x)")
+    print(f"  spawning a child stream: {spawn_cost() * 1e6:.0f} us each")
+
+
+if __name__ == "__main__":
+    main()
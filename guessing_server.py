@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import collections
+import itertools
+import time
+
+import numpy as np
+
+from guessing_engine import CORRECT, TOO_HIGH, TOO_LOW, BinarySearch, GuessingGame
+from guessing_rng import SecretSource
+
+# --- Guessing Game Server ---
+# Hosts many independent games over TCP with asyncio, one per connection.
+# The protocol is one line each way:
+#
+#   server: "guess 1-100"          a new game has started
+#   client: "50"
+#   server: "too low" / "too high" / "correct 6" (then "guess 1-100" again)
+#           or an error line starting with "error"
+#   client: "quit"                 ends the session
+#
+# Each session is a slotted Session holding a slotted GuessingGame. Sessions
+# sit in an OrderedDict, least recently active first, so the reaper evicts
+# idle ones by popping from the front: O(evicted), not a scan of every session.
+#
+# Secrets come from one batched SecretSource. A seeded server instead gives
+# every session its own spawned stream (about 1 KB), so the k-th session gets
+# the same secrets on every run, however the sessions interleave.
+#
+# "load" runs a client that plays many sessions at once with binary search and
+# reports sessions per second and reply latency percentiles; "bench" starts a
+# server in the same process and runs the load against it.
+
+DEFAULT_PORT = 7777
+IDLE_TIMEOUT = 60.0
+SESSION_BATCH_SIZE = 16  # Secrets drawn at a time by a session's own stream
+
+
+class Session:
+    __slots__ = ("game", "rng", "last_active", "writer")
+
+    def __init__(self, game, rng, last_active, writer):
+        self.game = game
+        self.rng = rng
+        self.last_active = last_active
+        self.writer = writer
+
+
+class GuessingServer:
+    """
+    Game sessions for a server started with serve(). Sessions idle for more
+    than idle_timeout seconds are closed.
+    """
+
+    def __init__(self, low=1, high=100, idle_timeout=IDLE_TIMEOUT, seed=None):
+        self.low = low
+        self.high = high
+        self.idle_timeout = idle_timeout
+        self.source = SecretSource(seed)
+        self.session_streams = seed is not None
+        self.sessions = collections.OrderedDict()  # id -> Session, least recently active first
+        self._ids = itertools.count()
+        self.games_won = 0
+        self.evicted = 0
+        self._tasks = set()  # Background tasks; the event loop only keeps weak references
+
+    def _new_game(self, rng):
+        return GuessingGame(self.low, self.high, rng=rng)
+
+    def respond(self, session, line):
+        """Returns the reply to one line from the client, or None to close the session."""
+        text = line.strip().lower()
+        if text == "quit":
+            return None
+        game = session.game
+        try:
+            number = int(text)
+        except ValueError:
+            digits = text.lstrip("+-")
+            if not (digits.isascii() and digits.isdigit()):
+                return "error not a number\n"
+            # Too many digits for int(): far outside the range either way
+            number = game.low - 1 if text.startswith("-") else game.high + 1
+        try:
+            result = game.guess(number)
+        except ValueError as e:
+            return f"error {e}\n"
+        if result != CORRECT:
+            return result + "\n"
+        self.games_won += 1
+        guesses = session.game.guesses
+        session.game = self._new_game(session.rng)
+        return f"correct {guesses}\nguess {self.low}-{self.high}\n"
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        session_id = next(self._ids)
+        rng = self.source.spawn(batch_size=SESSION_BATCH_SIZE) if self.session_streams else self.source
+        session = Session(self._new_game(rng), rng, loop.time(), writer)
+        self.sessions[session_id] = session
+        try:
+            writer.write(f"guess {self.low}-{self.high}\n".encode())
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                session.last_active = loop.time()
+                self.sessions.move_to_end(session_id)
+                reply = self.respond(session, line.decode("utf-8", "replace"))
+                if reply is None:
+                    break
+                writer.write(reply.encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # Client went away, or sent an over-long line
+        finally:
+            self.sessions.pop(session_id, None)
+            writer.close()
+
+    async def evict_idle(self):
+        """Closes idle sessions; runs until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(min(self.idle_timeout / 4, 1.0))
+            cutoff = loop.time() - self.idle_timeout
+            while self.sessions:
+                session_id, session = next(iter(self.sessions.items()))
+                if session.last_active >= cutoff:
+                    break
+                del self.sessions[session_id]
+                self.evicted += 1
+                session.writer.write(b"error idle timeout\n")
+                session.writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Starts listening; returns the asyncio server (the reaper stops when it closes)."""
+        server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        reaper = asyncio.create_task(self.evict_idle())
+        for task in (reaper, asyncio.create_task(self._stop_reaper(server, reaper))):
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return server
+
+    @staticmethod
+    async def _stop_reaper(server, reaper):
+        await server.wait_closed()
+        reaper.cancel()
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, low=1, high=100, idle_timeout=IDLE_TIMEOUT, seed=None):
+    game_server = GuessingServer(low, high, idle_timeout, seed)
+    server = await game_server.start(host, port)
+    print(f"Serving games {low}-{high} on {host}:{server.sockets[0].getsockname()[1]} "
+          f"(idle timeout {idle_timeout:g}s, seed {game_server.source.seed})")
+    async with server:
+        await server.serve_forever()
+
+
+# --- Load Generator ---
+
+async def _play_session(host, port, strategy, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        low, high = map(int, (await reader.readline()).split()[1].split(b"-"))
+        while True:
+            guess = strategy.choose(low, high)
+            start = time.perf_counter()
+            writer.write(b"%d\n" % guess)
+            reply = await reader.readline()
+            latencies.append(time.perf_counter() - start)
+            if reply.startswith(b"correct"):
+                break
+            if reply.startswith(TOO_LOW.encode()):
+                low = guess + 1
+            elif reply.startswith(TOO_HIGH.encode()):
+                high = guess - 1
+            else:
+                raise ConnectionError(f"Unexpected reply: {reply!r}")
+        writer.write(b"quit\n")
+    finally:
+        writer.close()
+
+
+async def load_test(host="127.0.0.1", port=DEFAULT_PORT, sessions=10_000, concurrency=1_000):
+    """
+    Plays `sessions` games over `concurrency` simultaneous connections, one
+    connection per game. Returns (sessions per second, latencies in seconds).
+    """
+    strategy = BinarySearch()
+    latencies = []
+    remaining = iter(range(sessions))
+
+    async def worker():
+        for _ in remaining:
+            await _play_session(host, port, strategy, latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, sessions))))
+    return sessions / (time.perf_counter() - start), np.array(latencies)
+
+
+def _raise_open_file_limit():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def benchmark(sessions=20_000, concurrency=2_000, idle_timeout=IDLE_TIMEOUT):
+    """
+    Runs a server and the load generator in this process.
+    Returns (sessions per second, latencies, peak simultaneous sessions).
+    """
+    game_server = GuessingServer(idle_timeout=idle_timeout)
+    server = await game_server.start(port=0)
+    peak = 0
+
+    async def watch():
+        nonlocal peak
+        while True:
+            peak = max(peak, len(game_server.sessions))
+            await asyncio.sleep(0.01)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        rate, latencies = await load_test(port=server.sockets[0].getsockname()[1],
+                                          sessions=sessions, concurrency=concurrency)
+    finally:
+        watcher.cancel()
+        server.close()
+        await server.wait_closed()
+    return rate, latencies, peak
+
+
+def _report(rate, latencies):
+    p50, p99, p999 = np.percentile(latencies, (50, 99, 99.9)) * 1000
+    print(f"{rate:,.0f} sessions/s, {len(latencies):,} guesses; reply latency "
+          f"p50 {p50:.2f} ms, p99 {p99:.2f} ms, p99.9 {p999:.2f} ms, max {latencies.max() * 1000:.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-session number guessing server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="Run the server.")
+    serve_parser.add_argument("--low", type=int, default=1)
+    serve_parser.add_argument("--high", type=int, default=100)
+    serve_parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    serve_parser.add_argument("--seed", type=int, help="Give each session its own reproducible stream of secrets.")
+    for name, help_text in (("load", "Load-test a running server."), ("bench", "Run a server and a load test here.")):
+        load_parser = subparsers.add_parser(name, help=help_text)
+        load_parser.add_argument("--sessions", type=int, default=20_000)
+        load_parser.add_argument("--concurrency", type=int, default=2_000)
+    args = parser.parse_args(argv)
+
+    _raise_open_file_limit()
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.low, args.high, args.idle_timeout, args.seed))
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "load":
+        _report(*asyncio.run(load_test(args.host, args.port, args.sessions, args.concurrency)))
+    else:
+        rate, latencies, peak = asyncio.run(benchmark(args.sessions, args.concurrency))
+        _report(rate, latencies)
+        print(f"peak simultaneous sessions: {peak:,}")
+
+
+if __name__ == "__main__":
+    main()
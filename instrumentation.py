@@ -0,0 +1,372 @@
+import atexit
+import bisect
+import cProfile
+import functools
+import http.server
+import json
+import os
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+
+# --- Opt-in Instrumentation ---
+# Timers, counters and latency histograms for the apps and CLIs, plus
+# on-demand cProfile and tracemalloc snapshots. Off unless switched on:
+#
+#   APP_METRICS=metrics.json       (or --metrics FILE) write metrics on exit;
+#                                  .json for JSON, anything else Prometheus text
+#   APP_METRICS_PORT=9464          (or --metrics-port PORT) serve them while
+#                                  running: http://127.0.0.1:PORT/metrics
+#                                  (Prometheus), /metrics.json, /memory
+#
+# While off, `registry` is None and every helper returns after one check:
+# timed() wrappers add well under a microsecond, timer() hands back a shared
+# no-op, and hook() returns None so latency hooks are never installed.
+#
+# When on, profiling is toggled with F9 in the Tk apps or SIGUSR1 in the CLIs
+# (writes profile-<pid>-<n>.prof, open with pstats or snakeviz). The first F10
+# / SIGUSR2 starts tracemalloc; later ones write the top allocation sites to
+# memory-<pid>-<time>.txt.
+#
+# Metric names: command_seconds{app, command}, conversion_seconds{mode},
+# calculation_seconds{op, status}, file_seconds{file, op}, fetch_seconds,
+# calculations_total{op, status} (memo hits) and errors_total{app, kind}, each
+# with an "app_" prefix when exported. A timer that exits with an exception
+# records under an extra status="error" label.
+
+METRICS_ENV_VAR = "APP_METRICS"
+PORT_ENV_VAR = "APP_METRICS_PORT"
+PREFIX = "app_"
+# Histogram bucket upper bounds in seconds (Prometheus "le"), 50 us to 10 s
+BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+           0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SNAPSHOT_LIMIT = 25
+
+registry = None  # The active Registry, or None while instrumentation is off
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # The last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (max for the +Inf bucket)."""
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKETS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Registry:
+    """
+    Counters and histograms keyed by (name, labels). Safe to update from any
+    thread (the rate fetcher records from its own).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}    # (name, labels) -> number
+        self.histograms = {}  # (name, labels) -> Histogram
+        self.started = time.time()
+
+    def count(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def to_json(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "uptime_seconds": time.time() - self.started,
+                "counters": [{"name": PREFIX + name, "labels": dict(labels), "value": value}
+                             for (name, labels), value in sorted(self.counters.items())],
+                "histograms": [{"name": PREFIX + name, "labels": dict(labels), "count": histogram.count,
+                                "sum": histogram.total, "max": histogram.max,
+                                "p50": histogram.quantile(0.5), "p99": histogram.quantile(0.99),
+                                "buckets": dict(zip([*map(str, BUCKETS), "+Inf"], histogram.counts))}
+                               for (name, labels), histogram in sorted(self.histograms.items())],
+            }
+
+    def to_prometheus(self):
+        """The Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            declared = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in declared:
+                    lines.append(f"# TYPE {PREFIX}{name} counter")
+                    declared.add(name)
+                lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in declared:
+                    lines.append(f"# TYPE {PREFIX}{name} histogram")
+                    declared.add(name)
+                cumulative = 0
+                for bound, bucket_count in zip([*map(str, BUCKETS), "+Inf"], histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {histogram.total}")
+                lines.append(f"{PREFIX}{name}_count{_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Writes the metrics to a file: JSON for .json, Prometheus text otherwise."""
+        text = json.dumps(self.to_json(), indent=2) if path.endswith(".json") else self.to_prometheus()
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temp_path, path)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+# --- Switching On ---
+
+def enabled():
+    return registry is not None
+
+
+def enable(path=None, port=None):
+    """
+    Turns instrumentation on (once) and returns the Registry. Metrics are
+    written to `path` on exit and served on 127.0.0.1:`port` if given.
+    """
+    global registry
+    if registry is None:
+        registry = Registry()
+        install_signal_handlers()
+    if path:
+        atexit.register(registry.write, path)
+    if port:
+        serve(port)
+    return registry
+
+
+def add_arguments(parser):
+    """Adds --metrics / --metrics-port to a CLI's argparse parser."""
+    parser.add_argument("--metrics", metavar="FILE",
+                        help=f"Record timings and write them to FILE on exit (or set {METRICS_ENV_VAR}).")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help=f"Serve timings on http://127.0.0.1:PORT/metrics (or set {PORT_ENV_VAR}).")
+
+
+def configure(args=None):
+    """Enables instrumentation from parsed --metrics flags or the environment. Returns enabled()."""
+    path = getattr(args, "metrics", None) or os.environ.get(METRICS_ENV_VAR)
+    port = getattr(args, "metrics_port", None) or os.environ.get(PORT_ENV_VAR)
+    if path or port:
+        enable(path, int(port) if port else None)
+    return enabled()
+
+
+# --- Recording ---
+
+def count(name, amount=1, **labels):
+    if registry is not None:
+        registry.count(name, amount, **labels)
+
+
+def observe(name, seconds, **labels):
+    if registry is not None:
+        registry.observe(name, seconds, **labels)
+
+
+def record_error(app, error):
+    """Counts an error shown to the user; `error` is an exception or a short message."""
+    if registry is not None:
+        kind = type(error).__name__ if isinstance(error, BaseException) else str(error)
+        registry.count("errors_total", app=app, kind=kind)
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        labels = self.labels if exc_type is None else {**self.labels, "status": "error"}
+        registry.observe(self.name, time.perf_counter() - self.start, **labels)
+        return False
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NO_TIMER = _NoTimer()
+
+
+def timer(name, **labels):
+    """A context manager timing its block into histogram `name` (a shared no-op while off)."""
+    if registry is None:
+        return _NO_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name, **labels):
+    """Decorator form of timer()."""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if registry is None:
+                return function(*args, **kwargs)
+            with _Timer(name, labels):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def hook(app):
+    """
+    A latency hook, callable(command, seconds), recording command_seconds for
+    `app`; None while off, so handlers are left unwrapped.
+    """
+    if registry is None:
+        return None
+    return lambda command, seconds: registry.observe("command_seconds", seconds, app=app, command=command)
+
+
+# --- Profiling and Memory Snapshots ---
+
+_profiler = None
+_profile_number = 0
+
+
+def toggle_profile(directory="."):
+    """
+    Starts cProfile on the calling thread, or stops it and writes the stats to
+    profile-<pid>-<n>.prof. Returns a one-line message.
+    """
+    global _profiler, _profile_number
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+        return "Profiling started."
+    _profiler.disable()
+    _profile_number += 1
+    path = os.path.join(directory, f"profile-{os.getpid()}-{_profile_number}.prof")
+    stats = pstats.Stats(_profiler)
+    stats.dump_stats(path)
+    _profiler = None
+    return f"Profile written to {path} ({stats.total_calls} calls, {stats.total_tt:.3f}s)."
+
+
+def memory_snapshot(path=None, limit=SNAPSHOT_LIMIT):
+    """
+    Returns the top allocation sites by size as text (and writes them to
+    `path` if given). The first call starts tracing and reports nothing yet.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        return "Memory tracing started; take another snapshot to see allocations."
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [f"traced memory: {current / 1e6:.1f} MB now, {peak / 1e6:.1f} MB peak"]
+    lines.extend(str(stat) for stat in snapshot.statistics("lineno")[:limit])
+    text = "\n".join(lines) + "\n"
+    if path:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+    return text
+
+
+def _snapshot_to_file():
+    if not tracemalloc.is_tracing():
+        return memory_snapshot()
+    path = f"memory-{os.getpid()}-{int(time.time())}.txt"
+    memory_snapshot(path)
+    return f"Memory snapshot written to {path}."
+
+
+def install_signal_handlers():
+    """SIGUSR1 toggles profiling and SIGUSR2 writes a memory snapshot (Unix, main thread only)."""
+    if not hasattr(signal, "SIGUSR1") or threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(signal.SIGUSR1, lambda signum, frame: print(toggle_profile(), flush=True))
+    signal.signal(signal.SIGUSR2, lambda signum, frame: print(_snapshot_to_file(), flush=True))
+
+
+def bind_keys(window, report=print):
+    """F9 toggles profiling and F10 writes a memory snapshot in a Tk app (when enabled)."""
+    if registry is None:
+        return
+    window.bind("<F9>", lambda event: report(toggle_profile()))
+    window.bind("<F10>", lambda event: report(_snapshot_to_file()))
+
+
+# --- HTTP Endpoint ---
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = json.dumps(registry.to_json(), indent=2), "application/json"
+        elif self.path == "/memory":
+            body, content_type = memory_snapshot(), "text/plain"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # Keep the apps' own output clean
+
+
+def serve(port, host="127.0.0.1"):
+    """Serves the metrics on a daemon thread. Returns the HTTP server."""
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -1,16 +1,62 @@
-import random
-number_to_guess=random.randint(1,100)
-while True:
-    
+import argparse
+import asyncio
+
+from guessing_engine import CORRECT, STRATEGIES, TOO_LOW, GuessingGame, make_strategy
+from guessing_rng import SecretSource
+from guessing_server import serve
+
+# The game itself lives in guessing_engine.py, which can also play it with a
+# solver strategy and simulate millions of games to compare strategies.
+# With --serve PORT the game is hosted over TCP for many players at once
+# on this machine (guessing_server.py --host opens it to others; try it with
+# "nc localhost PORT").
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Guess the secret number.")
+    parser.add_argument("--low", type=int, default=1)
+    parser.add_argument("--high", type=int, default=100)
+    parser.add_argument("--solver", choices=tuple(STRATEGIES),
+                        help="Watch a strategy play instead of guessing yourself.")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Host games over TCP instead.")
+    parser.add_argument("--seed", type=int, help="Pick the same secret(s) as an earlier run.")
+    args = parser.parse_args(argv)
+    if args.low > args.high:
+        parser.error("The range is empty: --low must not be above --high.")
+    if args.serve is not None:
+        try:
+            asyncio.run(serve("127.0.0.1", args.serve, args.low, args.high, seed=args.seed))
+        except KeyboardInterrupt:
+            pass
+        return
     try:
-        guess=int(input("Enter a number from 1-100: "))
-        if guess<number_to_guess:
-                  print("too low")
-        elif guess>number_to_guess:
-                  print("too high")
+        game = GuessingGame(args.low, args.high, rng=SecretSource(args.seed))
+        solver = make_strategy(args.solver, args.low, args.high) if args.solver else None
+    except ValueError as e:
+        parser.error(str(e))
+    low, high = args.low, args.high
+    while True:
+        if solver:
+            guess = int(solver.choose(low, high))
+            print(f"Guessing {guess}")
         else:
-                      print("congratulations")
-                      break
-    except ValueError:
-        print("invalid number")
-                  
+            try:
+                guess=int(input(f"Enter a number from {args.low}-{args.high}: "))
+            except ValueError:
+                print("invalid number")
+                continue
+        try:
+            result = game.guess(guess)
+        except ValueError as e:
+            print(e)
+            continue
+        if result == CORRECT:
+            print(f"congratulations ({game.guesses} guesses)")
+            break
+        print(result)
+        if result == TOO_LOW:
+            low = guess + 1
+        else:
+            high = guess - 1
+
+if __name__ == "__main__":
+    main()
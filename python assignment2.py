@@ -1,87 +1,23 @@
-import math
+import argparse
 
-# --- Basic Arithmetic Functions (Variadic) ---
+import instrumentation
+from calc_core import add, subtract, multiply, divide, power, square_root
+from calc_core.expr import evaluate
+from calc_core.bignum import format_number, multiply_exact, power_exact, to_exact
 
-def add(*numbers):
-    """
-    Adds a variable number of numbers.
-    If no numbers are provided, returns 0.
-    """
-    if not numbers:
-        return 0
-    return sum(numbers)
-
-def subtract(*numbers):
-    """
-    Subtracts a variable number of numbers.
-    The first number is the initial value, and subsequent numbers are subtracted from it.
-    If no numbers are provided, returns 0. If one number, returns that number.
-    """
-    if not numbers:
-        return 0
-    if len(numbers) == 1:
-        return numbers[0]
-    
-    result = numbers[0]
-    for num in numbers[1:]:
-        result -= num
-    return result
-
-def multiply(*numbers):
-    """
-    Multiplies a variable number of numbers.
-    If no numbers are provided, returns 1.
-    """
-    if not numbers:
-        return 1
-    
-    result = 1
-    for num in numbers:
-        result *= num
-    return result
-
-def divide(*numbers):
-    """
-    Divides the first number by subsequent numbers.
-    Handles division by zero errors.
-    If no numbers are provided, returns 1. If one number, returns that number.
-    """
-    if not numbers:
-        return 1
-    if len(numbers) == 1:
-        return numbers[0]
-    
-    result = numbers[0]
-    for num in numbers[1:]:
-        if num == 0:
-            return "Error: Division by zero is not allowed."
-        result /= num
-    return result
-
-# --- Advanced Math Functions (Bonus) ---
-
-def power(base, exponent):
-    """
-    Calculates the base raised to the power of the exponent.
-    """
-    return base ** exponent
-
-def square_root(number):
-    """
-    Calculates the square root of a number.
-    Handles negative numbers.
-    """
-    if number < 0:
-        return "Error: Cannot calculate the square root of a negative number."
-    return math.sqrt(number)
+# The arithmetic functions live in the shared calc_core package,
+# which "simple calculator.py" uses as well.
+# With --metrics FILE (or APP_METRICS) each calculation is timed and errors
+# are counted; see instrumentation.py.
 
 # --- Helper Function for User Input ---
 
-def get_numbers_input(operation_name, min_count=1):
+def get_numbers_input(operation_name, min_count=1, parse=float):
     """
     Prompts the user to enter numbers for an operation.
     Keeps asking until 'done' is entered and minimum count is met.
     Handles non-numeric input.
+    parse converts each entry (float by default, to_exact in high-precision mode).
     """
     numbers = []
     print(f"\nEnter numbers for {operation_name} (type 'done' when finished):")
@@ -93,8 +29,9 @@ def get_numbers_input(operation_name, min_count=1):
                 continue
             break
         try:
-            numbers.append(float(num_str))
-        except ValueError:
+            numbers.append(parse(num_str))
+        except ValueError as e:
+            instrumentation.record_error("calculator-cli", e)
             print("Invalid input. Please enter a valid number or 'done'.")
     return numbers
 
@@ -105,6 +42,8 @@ def run_calculator():
     Runs the main interactive calculator program.
     """
     print("Welcome to the Simple Python Calculator!")
+    # In high-precision mode, multiplication and power use exact ints / Decimals
+    high_precision = False
 
     while True:
         print("\n--- Select an operation ---")
@@ -114,45 +53,124 @@ def run_calculator():
         print("4. Division (/)")
         print("5. Power (^)")
         print("6. Square Root (√)")
-        print("7. Exit")
+        print("7. Expression (e.g. 2 + 3 * (4 - 1) ^ 2)")
+        print(f"8. High-precision mode for * and ^ ({'on' if high_precision else 'off'})")
+        print("9. Exit")
 
-        choice = input("Enter your choice (1-7): ").strip()
+        choice = input("Enter your choice (1-9): ").strip()
 
         if choice == '1':
             nums = get_numbers_input("addition", min_count=1)
             if nums:
-                print(f"Result: {add(*nums)}")
+                with instrumentation.timer("command_seconds", app="calculator-cli", command="add"):
+                    result = add(*nums)
+                print(f"Result: {result}")
         elif choice == '2':
             nums = get_numbers_input("subtraction", min_count=1)
             if nums:
-                print(f"Result: {subtract(*nums)}")
+                with instrumentation.timer("command_seconds", app="calculator-cli", command="subtract"):
+                    result = subtract(*nums)
+                print(f"Result: {result}")
         elif choice == '3':
-            nums = get_numbers_input("multiplication", min_count=1)
-            if nums:
-                print(f"Result: {multiply(*nums)}")
+            if high_precision:
+                nums = get_numbers_input("multiplication", min_count=1, parse=to_exact)
+                if nums:
+                    with instrumentation.timer("command_seconds", app="calculator-cli", command="multiply_exact"):
+                        result = format_number(multiply_exact(*nums))
+                    print(f"Result: {result}")
+            else:
+                nums = get_numbers_input("multiplication", min_count=1)
+                if nums:
+                    with instrumentation.timer("command_seconds", app="calculator-cli", command="multiply"):
+                        result = multiply(*nums)
+                    print(f"Result: {result}")
         elif choice == '4':
             nums = get_numbers_input("division", min_count=1)
             if nums:
-                print(f"Result: {divide(*nums)}")
+                try:
+                    with instrumentation.timer("command_seconds", app="calculator-cli", command="divide"):
+                        result = divide(*nums)
+                    print(f"Result: {result}")
+                except ValueError as e:
+                    instrumentation.record_error("calculator-cli", e)
+                    print(f"Error: {e}")
         elif choice == '5':
+            parse = to_exact if high_precision else float
             try:
-                base = float(input("Enter the base number: "))
-                exponent = float(input("Enter the exponent: "))
-                print(f"Result: {power(base, exponent)}")
-            except ValueError:
+                base = parse(input("Enter the base number: "))
+                exponent = parse(input("Enter the exponent: "))
+            except ValueError as e:
+                instrumentation.record_error("calculator-cli", e)
                 print("Invalid input. Please enter valid numbers.")
+            else:
+                try:
+                    if high_precision:
+                        with instrumentation.timer("command_seconds", app="calculator-cli", command="power_exact"):
+                            result = format_number(power_exact(base, exponent))
+                    else:
+                        with instrumentation.timer("command_seconds", app="calculator-cli", command="power"):
+                            result = power(base, exponent)
+                    print(f"Result: {result}")
+                except OverflowError as e:
+                    instrumentation.record_error("calculator-cli", e)
+                    print("Error: The result is too large. Try high-precision mode (option 8).")
+                except ValueError as e:
+                    instrumentation.record_error("calculator-cli", e)
+                    print(f"Error: {e}")
         elif choice == '6':
             try:
                 num = float(input("Enter the number to find the square root of: "))
-                print(f"Result: {square_root(num)}")
-            except ValueError:
+            except ValueError as e:
+                instrumentation.record_error("calculator-cli", e)
                 print("Invalid input. Please enter a valid number.")
+            else:
+                try:
+                    with instrumentation.timer("command_seconds", app="calculator-cli", command="square_root"):
+                        result = square_root(num)
+                    print(f"Result: {result}")
+                except ValueError as e:
+                    instrumentation.record_error("calculator-cli", e)
+                    print(f"Error: {e}")
         elif choice == '7':
+            expression = input("Enter an expression: ").strip()
+            try:
+                with instrumentation.timer("command_seconds", app="calculator-cli", command="expression"):
+                    result = evaluate(expression)
+                print(f"Result: {result}")
+            except (ValueError, ArithmeticError) as e:  # ArithmeticError: e.g. overflow in a huge power
+                instrumentation.record_error("calculator-cli", e)
+                print(f"Error: {e}")
+        elif choice == '8':
+            high_precision = not high_precision
+            print(f"High-precision mode is now {'on' if high_precision else 'off'}.")
+        elif choice == '9':
             print("Exiting calculator. Goodbye, Godfred!")
             break
         else:
-            print("Invalid choice. Please enter a number between 1 and 7.")
+            print("Invalid choice. Please enter a number between 1 and 9.")
+
+# --- Batch Mode ---
+
+def main(argv=None):
+    """
+    Starts the interactive calculator, or with --batch runs every calculation
+    in a CSV/NDJSON file (or stdin) without prompts. See calc_core.batch.
+    """
+    parser = argparse.ArgumentParser(description="Simple Python Calculator.")
+    parser.add_argument("--batch", metavar="FILE", help="Run calculations from FILE ('-' for stdin) instead of the menu.")
+    parser.add_argument("-o", "--output", default="-", help="Batch output file ('-' for stdout).")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="Batch input format (detected by default).")
+    parser.add_argument("--workers", type=int, help="Batch worker processes (default: CPU count).")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure(args)
+    if args.batch is None:
+        run_calculator()
+        return
+    from calc_core.batch import run_batch_files
+    with instrumentation.timer("command_seconds", app="calculator-cli", command="batch"):
+        run_batch_files(args.batch, args.output, args.format, args.workers)
 
 # Run the calculator when the script is executed
 if __name__ == "__main__":
-    run_calculator()
+    main()
@@ -0,0 +1,249 @@
+import http.client
+import json
+import math
+import os
+import queue
+import threading
+import time
+import urllib.parse
+
+import instrumentation
+
+# --- Background Exchange Rate Fetcher ---
+# Fetches rates off the Tk main thread, keeps them in a TTL cache persisted to
+# disk, and serves cached rates immediately (stale-while-revalidate), so the
+# app never waits on the network at startup.
+
+DEFAULT_RATES_URL = "https://api.exchangerate-api.com/v4/latest/USD"
+RATES_CACHE_FILE = "exchange_rates_cache.json"
+DEFAULT_TTL_SECONDS = 60 * 60  # Rates are refreshed at most once an hour
+DEFAULT_TIMEOUT_SECONDS = 10
+RETRY_INTERVAL_SECONDS = 60  # Minimum gap between refresh attempts after a failure
+
+
+class FetchError(Exception):
+    """Raised when rates cannot be fetched or parsed."""
+
+
+class ConnectionPool:
+    """
+    Keeps HTTP(S) keep-alive connections per host and reuses them across
+    requests instead of opening a new connection for every fetch.
+    """
+
+    def __init__(self, max_per_host=2, timeout=DEFAULT_TIMEOUT_SECONDS):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get_json(self, url):
+        """
+        Performs a GET request and returns the decoded JSON body.
+        Retries once on a fresh connection if a pooled one was closed by the server.
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        for attempt in range(2):
+            connection, reused = self._acquire(key)
+            try:
+                connection.request("GET", path, headers={"Accept": "application/json"})
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError) as e:
+                connection.close()
+                if reused and attempt == 0:
+                    continue  # A stale keep-alive connection; try once more on a new one
+                raise FetchError(f"Request to {url} failed: {e}") from e
+            except OSError as e:
+                connection.close()
+                raise FetchError(f"Request to {url} failed: {e}") from e
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            if response.status != 200:
+                raise FetchError(f"Request to {url} returned HTTP {response.status}.")
+            try:
+                return json.loads(body)
+            except ValueError as e:
+                raise FetchError(f"Response from {url} is not valid JSON: {e}") from e
+
+    def close(self):
+        """Closes every idle connection."""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+    def _acquire(self, key):
+        with self._lock:
+            connections = self._idle.get(key)
+            if connections:
+                return connections.pop(), True
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key, connection):
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < self.max_per_host:
+                connections.append(connection)
+                return
+        connection.close()
+
+
+class RateCache:
+    """
+    Rates plus the time they were fetched, persisted as JSON.
+    Writes go to a temporary file first and are renamed into place.
+    """
+
+    def __init__(self, path=RATES_CACHE_FILE, ttl=DEFAULT_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.rates = None
+        self.fetched_at = 0.0
+
+    @instrumentation.timed("file_seconds", file="rates_cache", op="load")
+    def load(self):
+        """Loads the cache from disk. A missing or corrupt file leaves it empty."""
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+            self.rates = {code: float(rate) for code, rate in data["rates"].items()}
+            self.fetched_at = float(data["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self.rates = None
+            self.fetched_at = 0.0
+
+    @instrumentation.timed("file_seconds", file="rates_cache", op="save")
+    def store(self, rates, fetched_at=None):
+        self.rates = rates
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"fetched_at": self.fetched_at, "rates": rates}, file)
+        os.replace(temp_path, self.path)
+
+    def is_stale(self, now=None):
+        if self.rates is None:
+            return True
+        now = time.time() if now is None else now
+        return now - self.fetched_at >= self.ttl
+
+
+def rebase_rates(quoted_rates, base_currency="GHS"):
+    """
+    Converts API rates quoted as "units of X per 1 quote currency"
+    into this app's format: the value of 1 unit of X in base_currency.
+    Raises FetchError for a malformed feed; rates that are zero, negative or
+    not finite are left out.
+    """
+    if not isinstance(quoted_rates, dict):
+        raise FetchError("The rate feed's 'rates' field is not an object.")
+    try:
+        quoted_rates = {code: float(rate) for code, rate in quoted_rates.items()}
+    except (TypeError, ValueError):
+        raise FetchError("The rate feed has a rate that is not a number.") from None
+    if base_currency not in quoted_rates:
+        raise FetchError(f"The rate feed does not include {base_currency}.")
+    base_per_quote = quoted_rates[base_currency]
+    if not (math.isfinite(base_per_quote) and base_per_quote > 0):
+        raise FetchError(f"The rate feed has no usable rate for {base_currency}.")
+    return {code: base_per_quote / rate for code, rate in quoted_rates.items() if math.isfinite(rate) and rate > 0}
+
+
+class RateFetcher:
+    """
+    Serves exchange rates from the cache and refreshes them on a background thread.
+    on_update(rates, error) is called from the worker thread after every refresh;
+    GUI code should hand the result to the Tk thread (see updates_queue()).
+    """
+
+    def __init__(self, url=DEFAULT_RATES_URL, cache_path=RATES_CACHE_FILE,
+                 ttl=DEFAULT_TTL_SECONDS, base_currency="GHS", on_update=None, pool=None):
+        self.url = url
+        self.base_currency = base_currency
+        self.on_update = on_update
+        self.pool = pool if pool is not None else ConnectionPool()
+        self.cache = RateCache(cache_path, ttl)
+        self.retry_interval = RETRY_INTERVAL_SECONDS
+        self._refreshing = False
+        self._last_attempt = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Loads the disk cache and starts a background refresh if it is stale.
+        Never blocks on the network. Returns the cached rates (or None).
+        """
+        self.cache.load()
+        return self.get_rates()
+
+    def get_rates(self):
+        """
+        Returns the cached rates straight away, even if stale,
+        and revalidates them in the background when the TTL has expired.
+        """
+        if self.cache.is_stale():
+            self.refresh_async()
+        return self.cache.rates
+
+    def refresh_async(self):
+        """
+        Starts a refresh thread unless one is already running
+        or the last attempt was less than retry_interval seconds ago.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._refreshing:
+                return False
+            if self._last_attempt is not None and now - self._last_attempt < self.retry_interval:
+                return False
+            self._refreshing = True
+            self._last_attempt = now
+        threading.Thread(target=self._refresh_worker, name="rate-fetcher", daemon=True).start()
+        return True
+
+    def refresh(self):
+        """Fetches rates synchronously, updates the cache and returns the new rates."""
+        with instrumentation.timer("fetch_seconds"):
+            data = self.pool.get_json(self.url)
+        try:
+            quoted_rates = data["rates"]
+        except (KeyError, TypeError):
+            raise FetchError("The rate feed response has no 'rates' field.") from None
+        rates = rebase_rates(quoted_rates, self.base_currency)
+        self.cache.store(rates)
+        return rates
+
+    def _refresh_worker(self):
+        rates, error = None, None
+        try:
+            rates = self.refresh()
+        except (FetchError, OSError) as e:
+            instrumentation.record_error("rate-fetcher", e)
+            error = e
+        finally:
+            with self._lock:
+                self._refreshing = False
+        if self.on_update is not None:
+            self.on_update(rates, error)
+
+    def updates_queue(self):
+        """
+        Sets on_update to put (rates, error) pairs on a queue and returns it,
+        so a Tk app can drain it from an after() callback on the main thread.
+        """
+        updates = queue.Queue()
+        self.on_update = lambda rates, error: updates.put((rates, error))
+        return updates
@@ -0,0 +1,173 @@
+import heapq
+import math
+from collections import OrderedDict
+
+# --- Currency Triangulation Graph ---
+# Currencies are nodes and quotes are directed edges. Every quote adds two
+# edges (base -> quote and quote -> base), each weighted by its log-rate and
+# by a spread cost of -log(1 - spread), so paths can be compared by adding
+# weights instead of multiplying rates.
+#
+# The cheapest path (lowest total spread cost, then fewest hops) is found with
+# Dijkstra. Each source's shortest-path tree is kept in an LRU cache, so repeated
+# lookups from the same currency are dictionary walks. When a quote changes,
+# only the trees that used the edge, or that the new edge would improve, are dropped.
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class NoPathError(KeyError):
+    """Raised when two currencies are not connected by any chain of quotes."""
+
+
+class RateGraph:
+    """
+    Quotes between arbitrary currency pairs, with cached cheapest-path lookups.
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.edges = {}  # node -> {neighbour: (log_rate, cost)}
+        self._trees = OrderedDict()  # source -> (distances, parents, log_rates)
+        self._edge_users = {}  # (u, v) -> set of sources whose tree uses the edge
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_base_rates(cls, base_rates, base_currency="GHS", spread=0.0, cache_size=DEFAULT_CACHE_SIZE):
+        """
+        Builds a star graph from GUI-style rates (value of 1 unit in base_currency).
+        Direct quotes can then be added on top with set_quote().
+        """
+        graph = cls(cache_size)
+        for code, rate in base_rates.items():
+            if code != base_currency:
+                graph.set_quote(code, base_currency, rate, spread)
+        return graph
+
+    def __contains__(self, code):
+        return code in self.edges
+
+    def set_quote(self, base, quote, rate, spread=0.0):
+        """
+        Adds or updates a quote: 1 base = rate quote, with a relative
+        bid/ask spread in [0, 1) charged on either direction.
+        """
+        if not rate > 0:
+            raise ValueError(f"Rate for {base}/{quote} must be a positive number, got {rate!r}.")
+        if not 0 <= spread < 1:
+            raise ValueError(f"Spread for {base}/{quote} must be in [0, 1), got {spread!r}.")
+        log_rate = math.log(rate)
+        cost = -math.log1p(-spread)
+        self._set_edge(base, quote, (log_rate, cost))
+        self._set_edge(quote, base, (-log_rate, cost))
+
+    def remove_quote(self, base, quote):
+        """Removes both directions of a quote. Raises KeyError if it does not exist."""
+        if quote not in self.edges.get(base, {}):
+            raise KeyError(f"No quote for {base}/{quote}.")
+        for u, v in ((base, quote), (quote, base)):
+            del self.edges[u][v]
+            self._invalidate_users(u, v)
+
+    def path(self, from_currency, to_currency):
+        """Returns the cheapest chain of currencies, e.g. ['EUR', 'USD', 'JPY']."""
+        _, parents, _ = self._tree(from_currency, to_currency)
+        path = [to_currency]
+        while path[-1] != from_currency:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return path
+
+    def rate(self, from_currency, to_currency, net=False):
+        """
+        Mid rate along the cheapest path (units of to_currency per from_currency).
+        With net=True the spread cost of the path is deducted.
+        """
+        distances, _, log_rates = self._tree(from_currency, to_currency)
+        log_rate = log_rates[to_currency]
+        if net:
+            log_rate -= distances[to_currency][0]
+        return math.exp(log_rate)
+
+    def convert(self, amount, from_currency, to_currency, net=False):
+        return amount * self.rate(from_currency, to_currency, net)
+
+    def cache_info(self):
+        return {"hits": self.hits, "misses": self.misses, "trees": len(self._trees), "max_trees": self.cache_size}
+
+    # --- Internals ---
+
+    def _tree(self, source, target):
+        if source not in self.edges:
+            raise NoPathError(f"Unknown currency: {source}")
+        tree = self._trees.get(source)
+        if tree is None:
+            self.misses += 1
+            tree = self._dijkstra(source)
+            self._store_tree(source, tree)
+        else:
+            self.hits += 1
+            self._trees.move_to_end(source)
+        if target not in tree[0]:
+            raise NoPathError(f"No chain of quotes from {source} to {target}.")
+        return tree
+
+    def _dijkstra(self, source):
+        # Keys are (spread cost, hop count) so equal-cost paths prefer fewer conversions
+        distances = {source: (0.0, 0)}
+        parents = {}
+        log_rates = {source: 0.0}
+        heap = [(0.0, 0, source)]
+        while heap:
+            cost, hops, node = heapq.heappop(heap)
+            if (cost, hops) > distances[node]:
+                continue
+            for neighbour, (log_rate, edge_cost) in self.edges[node].items():
+                candidate = (cost + edge_cost, hops + 1)
+                if neighbour not in distances or candidate < distances[neighbour]:
+                    distances[neighbour] = candidate
+                    parents[neighbour] = node
+                    log_rates[neighbour] = log_rates[node] + log_rate
+                    heapq.heappush(heap, (candidate[0], candidate[1], neighbour))
+        return distances, parents, log_rates
+
+    def _store_tree(self, source, tree):
+        self._trees[source] = tree
+        for v, u in tree[1].items():
+            self._edge_users.setdefault((u, v), set()).add(source)
+        while len(self._trees) > self.cache_size:
+            self._drop_tree(next(iter(self._trees)))
+
+    def _drop_tree(self, source):
+        _, parents, _ = self._trees.pop(source)
+        for v, u in parents.items():
+            users = self._edge_users.get((u, v))
+            if users is not None:
+                users.discard(source)
+                if not users:
+                    del self._edge_users[(u, v)]
+
+    def _invalidate_users(self, u, v):
+        for source in list(self._edge_users.get((u, v), ())):
+            self._drop_tree(source)
+
+    def _set_edge(self, u, v, edge):
+        self.edges.setdefault(u, {})
+        self.edges.setdefault(v, {})
+        old = self.edges[u].get(v)
+        self.edges[u][v] = edge
+        if old == edge:
+            return
+        # Trees that route through this edge have a stale rate or cost
+        self._invalidate_users(u, v)
+        if old is not None and edge[1] >= old[1]:
+            return  # The edge got no cheaper, so it cannot improve any other tree
+        # A new or cheaper edge only matters to trees where it shortens the path to v
+        for source in list(self._trees):
+            distances = self._trees[source][0]
+            if u not in distances:
+                continue
+            through_u = (distances[u][0] + edge[1], distances[u][1] + 1)
+            if v not in distances or through_u < distances[v]:
+                self._drop_tree(source)
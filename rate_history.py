@@ -0,0 +1,147 @@
+import json
+
+import numpy as np
+
+from currency_engine import CodeTable
+
+# --- Historical Exchange Rate Store ---
+# Daily base-relative rates (value of 1 unit in GHS) kept in one columnar
+# binary file and opened with a memory map, so reads are zero-copy and only
+# the pages that are actually touched get loaded from disk.
+#
+# File layout (all numbers little-endian):
+#   MAGIC (8 bytes) | header length (uint32) | JSON header, padded to 64 bytes
+#   dates:  int64[n_days]   days since 1970-01-01, strictly increasing
+#   rates:  float64[n_currencies][n_days]   one contiguous column per currency
+
+MAGIC = b"FXHIST01"
+ALIGNMENT = 64
+
+
+def _pad(length):
+    return (-length) % ALIGNMENT
+
+
+def write_history(path, dates, codes, rates):
+    """
+    Writes a history file.
+    dates: sequence convertible to datetime64[D], strictly increasing.
+    codes: list of currency codes.
+    rates: array of shape (len(dates), len(codes)), one row per day.
+    """
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    rates = np.asarray(rates, dtype=np.float64)
+    codes = list(codes)
+    if rates.shape != (len(days), len(codes)):
+        raise ValueError(f"rates must have shape {(len(days), len(codes))}, got {rates.shape}.")
+    if len(days) > 1 and not np.all(np.diff(days) > 0):
+        raise ValueError("dates must be strictly increasing.")
+
+    header = json.dumps({"codes": codes, "n_days": len(days)}).encode("utf-8")
+    prefix_length = len(MAGIC) + 4 + len(header)
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(np.uint32(len(header)).astype("<u4").tobytes())
+        file.write(header)
+        file.write(b"\0" * _pad(prefix_length))
+        file.write(days.astype("<i8").tobytes())
+        # Transposed so each currency's series is one contiguous column
+        file.write(np.ascontiguousarray(rates.T).astype("<f8").tobytes())
+
+
+def write_history_from_snapshots(path, snapshots):
+    """
+    Writes a history file from an iterable of (date, {code: rate}) pairs,
+    e.g. one cached rate snapshot per day. Missing rates are stored as NaN.
+    Snapshots are sorted by date; a later snapshot for the same date wins.
+    """
+    by_day = {}
+    for date, rates in snapshots:
+        by_day[np.datetime64(date, "D")] = rates
+    dates = sorted(by_day)
+    codes = sorted({code for rates in by_day.values() for code in rates})
+    column = {code: i for i, code in enumerate(codes)}
+    table = np.full((len(dates), len(codes)), np.nan)
+    for row, date in enumerate(dates):
+        for code, rate in by_day[date].items():
+            table[row, column[code]] = rate
+    write_history(path, dates, codes, table)
+
+
+class RateHistory:
+    """
+    Read-only, memory-mapped view of a history file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a rate history file.")
+            header_length = int(np.frombuffer(file.read(4), dtype="<u4")[0])
+            header = json.loads(file.read(header_length).decode("utf-8"))
+
+        self.code_table = CodeTable(header["codes"])
+        n_days = header["n_days"]
+        offset = len(MAGIC) + 4 + header_length
+        offset += _pad(offset)
+        if n_days:
+            self._days = np.memmap(path, dtype="<i8", mode="r", offset=offset, shape=(n_days,))
+            self._rates = np.memmap(path, dtype="<f8", mode="r", offset=offset + 8 * n_days,
+                                    shape=(len(self.code_table), n_days))
+        else:
+            self._days = np.empty(0, dtype=np.int64)
+            self._rates = np.empty((len(self.code_table), 0))
+
+    def __len__(self):
+        return len(self._days)
+
+    @property
+    def codes(self):
+        return self.code_table.codes
+
+    @property
+    def dates(self):
+        """All dates as datetime64[D] (a view over the mapped file)."""
+        return self._days.view("datetime64[D]")
+
+    def series(self, code):
+        """The full daily rate series for one currency (zero-copy)."""
+        return self._rates[self.code_table.index(code)]
+
+    def date_range(self, start, end):
+        """
+        Returns (dates, rates) for start <= date < end, where rates has one row
+        per currency in self.codes order. Both are views, nothing is copied.
+        """
+        first, last = np.searchsorted(self._days, self._to_days([start, end]))
+        return self.dates[first:last], self._rates[:, first:last]
+
+    def as_of_rows(self, timestamps):
+        """
+        Returns, for each timestamp, the index of the latest date on or before it.
+        Raises ValueError if any timestamp is before the first stored date.
+        """
+        rows = np.searchsorted(self._days, self._to_days(timestamps), side="right") - 1
+        if rows.size and rows.min() < 0:
+            raise ValueError("No rates are available before the first stored date.")
+        return rows
+
+    def rates_as_of(self, timestamps, codes):
+        """Base-relative rate of each code as of each timestamp."""
+        rows = self.as_of_rows(timestamps)
+        return self._rates[self.code_table.intern(codes), rows]
+
+    def convert(self, amounts, timestamps, from_codes, to_codes):
+        """
+        Converts each amount at the rates in effect on its timestamp.
+        One searchsorted to find the rows, then one gather-multiply-divide.
+        """
+        rows = self.as_of_rows(timestamps)
+        from_rates = self._rates[self.code_table.intern(from_codes), rows]
+        to_rates = self._rates[self.code_table.intern(to_codes), rows]
+        return np.asarray(amounts, dtype=np.float64) * from_rates / to_rates
+
+    def _to_days(self, timestamps):
+        # Any datetime64 unit (or ISO strings) is floored to whole days
+        return np.asarray(timestamps, dtype="datetime64[D]").astype(np.int64)
@@ -1,82 +1,81 @@
+import argparse
+import time
 import tkinter as tk
-import math
-
-# --- Backend Arithmetic Functions (from your previous solution) ---
-# These functions are designed to accept a variable number of arguments (*numbers)
-# For the GUI, they will typically be called with two arguments (first_operand, second_operand)
-# to fit the standard calculator interaction flow.
-
-def add(*numbers):
-    """Adds a variable number of numbers. Returns 0 if no numbers."""
-    if not numbers:
-        return 0
-    return sum(numbers)
-
-def subtract(*numbers):
-    """Subtracts a variable number of numbers.
-    The first number is the initial value, and subsequent numbers are subtracted from it.
-    Returns 0 if no numbers. If one number, returns that number."""
-    if not numbers:
-        return 0
-    if len(numbers) == 1:
-        return numbers[0]
-    
-    result = numbers[0]
-    for num in numbers[1:]:
-        result -= num
-    return result
-
-def multiply(*numbers):
-    """Multiplies a variable number of numbers. Returns 1 if no numbers."""
-    if not numbers:
-        return 1
-    
-    result = 1
-    for num in numbers:
-        result *= num
-    return result
-
-def divide(*numbers):
-    """Divides the first number by subsequent numbers.
-    Handles division by zero errors by raising a ValueError.
-    Returns 1 if no numbers. If one number, returns that number."""
-    if not numbers:
-        return 1
-    if len(numbers) == 1:
-        return numbers[0]
-    
-    result = numbers[0]
-    for num in numbers[1:]:
-        if num == 0:
-            raise ValueError("Division by zero is not allowed.")
-        result /= num
-    return result
-
-# --- Advanced Math Functions (Bonus) ---
-
-def power(base, exponent):
-    """Calculates the base raised to the power of the exponent."""
-    return base ** exponent
-
-def square_root(number):
-    """Calculates the square root of a number.
-    Handles negative numbers by raising a ValueError."""
-    if number < 0:
-        raise ValueError("Cannot calculate the square root of a negative number.")
-    return math.sqrt(number)
+from tkinter import ttk
+
+import instrumentation
+
+# --- Backend Arithmetic Functions ---
+# The arithmetic lives in the calc_core package, shared with "python assignment2.py".
+# The GUI sends each operation to it by name with two operands
+# (first_operand, second_operand) through the worker below.
+# Invalid input raises ValueError, which the GUI shows on the display.
+
+# --- Background Computation ---
+# '=' and '√' run in a worker process (calc_core.worker), so a slow calculation
+# never freezes the window. The GUI polls for the result every POLL_INTERVAL_MS
+# (about once per frame at 60 fps); Cancel, or CALCULATION_TIMEOUT seconds
+# without a result, stops the worker.
+from calc_core.worker import ComputeWorker
+# Every calculation is also appended to a history tape on disk (calc_core.history);
+# repeating a calculation is answered from its memo without the worker.
+from calc_core.history import HistoryTape
+# --metrics FILE (or APP_METRICS) records every handler's latency, each
+# calculation's round trip and the errors shown; see instrumentation.py.
+
+POLL_INTERVAL_MS = 16
+CALCULATION_TIMEOUT = 10.0
+HISTORY_FILE = "calculator_history.ndjson"
+
+# --- Keyboard Input ---
+# Keys map onto the same handlers as the buttons. Pasted text that is a number
+# replaces the display; anything else is evaluated as an expression
+# (calc_core.expr, e.g. "2 + 3 * (4 - 1) ^ 2") in the worker process.
+# Display changes are buffered in a plain str and drawn at most once per frame.
+FRAME_INTERVAL_MS = 16
+OPERATOR_KEYS = {'+': '+', '-': '-', '*': '*', 'x': '*', '/': '/', '^': '^'}
+
+
+class LatencyRecorder:
+    """
+    Collects handler latencies per event name.
+    Pass one to CalculatorGUI(latency_hook=recorder) to time every input event.
+    """
+
+    def __init__(self):
+        self.samples = {}
+
+    def __call__(self, event_name, seconds):
+        self.samples.setdefault(event_name, []).append(seconds)
+
+    def summary(self):
+        """Returns {event_name: (count, p50_ms, p99_ms, max_ms)}."""
+        rows = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+            rows[name] = (len(ordered), pick(0.50), pick(0.99), ordered[-1] * 1000)
+        return rows
+
 
 # --- GUI Implementation using Tkinter ---
 
 class CalculatorGUI:
-    def __init__(self, master):
+    def __init__(self, master, latency_hook=None):
         self.master = master
+        # Optional callable(event_name, seconds), called after every input handler
+        self.latency_hook = latency_hook
         master.title("GODFRED BANSAH AI CALCULATOR ")
-        master.geometry("300x400") # Set a fixed size for better appearance
+        master.geometry("300x420") # Set a fixed size for better appearance
         master.resizable(False, False) # Prevent resizing
 
         # --- Calculator State Variables ---
-        # Stores the text currently displayed on the calculator screen
+        # Stores the text currently displayed on the calculator screen.
+        # display_value is the source of truth; current_input (shown by the
+        # Entry) is only updated from it once per frame, see set_display
+        self.display_value = "0"
         self.current_input = tk.StringVar(value="0") 
+        self.redraw_pending = None
         # Stores the first operand of a binary operation (e.g., '5' in '5 + 3')
         self.first_operand = None
         # Stores the operator selected (+, -, *, /, ^)
@@ -84,6 +83,17 @@ class CalculatorGUI:
         # Flag to indicate if the next digit pressed should clear the display
         # (e.g., after an operator or '=' is pressed)
         self.new_input_needed = True 
+        # Operator to apply once the running background calculation finishes
+        # (set when an operator is pressed while a result is still pending)
+        self.next_operator = None
+        self.worker = ComputeWorker(timeout=CALCULATION_TIMEOUT)
+        self.worker.start() # Spawn the worker now so the first '=' doesn't wait for it
+        self.history = HistoryTape(HISTORY_FILE)
+        self.pending_expression = None # Text of the calculation the worker is running
+        self.pending_op = None
+        self.calculation_started = None
+        self.history_window = None
+        master.protocol("WM_DELETE_WINDOW", self.close)
 
         # --- Display Entry Widget ---
         # An Entry widget to show input and results. Set to 'readonly' to prevent direct typing.
@@ -100,7 +110,7 @@ class CalculatorGUI:
             ('4', 2, 0), ('5', 2, 1), ('6', 2, 2), ('*', 2, 3),
             ('1', 3, 0), ('2', 3, 1), ('3', 3, 2), ('-', 3, 3),
             ('0', 4, 0), ('.', 4, 1), ('=', 4, 2), ('+', 4, 3),
-            ('C', 5, 0), ('√', 5, 1), ('^', 5, 2)
+            ('C', 5, 0), ('√', 5, 1), ('^', 5, 2), ('Cancel', 5, 3)
         ]
 
         # --- Create and Place Buttons ---
@@ -110,19 +120,27 @@ class CalculatorGUI:
             
             # Assign command based on button type
             if text == '=':
-                button.config(command=self.calculate)
+                button.config(command=self.timed('=', self.calculate))
             elif text in ('/', '*', '-', '+', '^'): # Operators and Power
-                button.config(command=lambda op=text: self.set_operator(op))
+                button.config(command=self.timed(text, lambda op=text: self.set_operator(op)))
             elif text == 'C': # Clear button
-                button.config(command=self.clear_display)
+                button.config(command=self.timed('C', self.clear_display))
             elif text == '√': # Square Root button
-                 button.config(command=self.do_square_root)
+                 button.config(command=self.timed('√', self.do_square_root))
+            elif text == 'Cancel': # Stops a running calculation
+                button.config(command=self.timed('Cancel', self.cancel_calculation), font=('Arial', 10), padx=2, state='disabled')
+                self.cancel_button = button
             else: # Number and decimal point buttons
-                button.config(command=lambda num=text: self.button_press(num))
+                button.config(command=self.timed('digit', lambda num=text: self.button_press(num)))
             
             # Place button in grid
             button.grid(row=row, column=col, sticky="nsew", padx=2, pady=2)
 
+        # --- Progress Indicator ---
+        # Animates while a calculation runs in the background
+        self.progress = ttk.Progressbar(master, mode='indeterminate')
+        self.progress.grid(row=6, column=0, columnspan=4, sticky="ew", padx=10, pady=(0, 5))
+
         # --- Configure Grid Weights ---
         # This makes the buttons expand to fill the window space dynamically
         for i in range(6): # Rows 0 (display) to 5 (last row of buttons)
@@ -130,33 +148,132 @@ class CalculatorGUI:
         for i in range(4): # Columns 0 to 3
             master.grid_columnconfigure(i, weight=1)
 
+        # --- Keyboard and Paste Bindings ---
+        # Bound on the window, so they work whichever widget has focus
+        master.bind('<Key>', self.timed('key', self.on_key))
+        for sequence in ('<Control-v>', '<Control-V>', '<Shift-Insert>'):
+            master.bind(sequence, self.timed('paste', self.on_paste))
+        self.display.bind('<<Paste>>', lambda event: 'break') # Handled by on_paste
+
+    def timed(self, event_name, handler):
+        """
+        Wraps an event handler so its latency is reported to latency_hook.
+        Without a hook the handler is returned unchanged (no overhead).
+        """
+        if self.latency_hook is None:
+            return handler
+        hook = self.latency_hook
+        def wrapper(*args):
+            start = time.perf_counter()
+            try:
+                return handler(*args)
+            finally:
+                hook(event_name, time.perf_counter() - start)
+        return wrapper
+
+    def set_display(self, text):
+        """
+        Changes the displayed text. The Entry is redrawn at most once per frame,
+        so a burst of key presses or a paste costs one redraw.
+        """
+        self.display_value = text
+        if self.redraw_pending is None:
+            self.redraw_pending = self.master.after(FRAME_INTERVAL_MS, self.redraw_display)
+
+    def redraw_display(self):
+        self.redraw_pending = None
+        if self.current_input.get() != self.display_value:
+            self.current_input.set(self.display_value)
+
+    def on_key(self, event):
+        """
+        Routes a key press to the matching button handler.
+        """
+        char = event.char
+        if event.keysym in ('Return', 'KP_Enter') or char == '=':
+            self.calculate()
+        elif event.keysym == 'BackSpace':
+            self.backspace()
+        elif event.keysym == 'Escape' or char in ('c', 'C'):
+            self.clear_display()
+        elif char in OPERATOR_KEYS:
+            self.set_operator(OPERATOR_KEYS[char])
+        elif char == 'r': # r for root
+            self.do_square_root()
+        elif char == 'h': # h for history
+            self.show_history()
+        elif char.isdigit() or char == '.':
+            self.button_press(char)
+        else:
+            return None
+        return 'break'
+
+    def backspace(self):
+        """
+        Deletes the last character of the number being typed.
+        """
+        if self.worker.busy or self.new_input_needed:
+            return
+        self.set_display(self.display_value[:-1] or "0")
+
+    def on_paste(self, event=None):
+        """
+        Pastes a number onto the display, or evaluates a pasted expression
+        (any length) in the worker process like '='.
+        """
+        if self.worker.busy:
+            return 'break'
+        try:
+            text = self.master.clipboard_get().strip()
+        except tk.TclError: # Empty clipboard
+            return 'break'
+        if not text:
+            return 'break'
+        try:
+            float(text)
+        except ValueError:
+            # An expression: its result replaces the display, like after '='
+            self.first_operand = None
+            self.operator = None
+            self.next_operator = None
+            self.start_calculation('expr', text)
+        else:
+            self.set_display(text)
+            self.new_input_needed = False
+        return 'break'
+
     def button_press(self, num):
         """
         Handles number and decimal point button presses.
         Updates the display string.
         """
-        current = self.current_input.get()
+        if self.worker.busy: # Ignore input until the result is in (or cancelled)
+            return
+        current = self.display_value
         
         # If starting a new number (after operator/equals, or initial "0", or error state)
         if self.new_input_needed or current == "0" or current == "Error":
             if num == '.': # If starting with '.', prepend "0"
-                self.current_input.set("0.")
+                self.set_display("0.")
             else:
-                self.current_input.set(num)
+                self.set_display(num)
             self.new_input_needed = False
         elif num == '.' and '.' in current:
             pass # Do nothing if decimal already exists in the current number
         else:
-            self.current_input.set(current + num)
+            self.set_display(current + num)
 
     def clear_display(self):
         """
         Clears the display and resets all calculator state variables.
+        Also cancels a running calculation.
         """
-        self.current_input.set("0")
+        self.cancel_calculation()
+        self.set_display("0")
         self.first_operand = None
         self.operator = None
         self.new_input_needed = True
+        self.next_operator = None
 
     def set_operator(self, op):
         """
@@ -164,11 +281,15 @@ class CalculatorGUI:
         If a previous operation is pending (e.g., 5 + 3, then user presses another +),
         it calculates the pending operation first.
         """
+        if self.worker.busy:
+            # A result is on its way; apply this operator to it when it arrives
+            self.next_operator = op
+            return
         try:
-            current_value = float(self.current_input.get())
+            current_value = float(self.display_value)
         except ValueError:
             # Handle cases where current display is "Error" or invalid
-            self.current_input.set("Error")
+            self.set_display("Error")
             self.first_operand = None
             self.operator = None
             self.new_input_needed = True
@@ -176,108 +297,217 @@ class CalculatorGUI:
 
         if self.first_operand is not None and self.operator is not None:
             # If there's a pending operation (e.g., 5 + 3, then user presses *),
-            # calculate the previous operation first (5+3=8), then use 8 as first_operand for *
-            self.calculate()
-            # The result of calculate() will be in current_input, so use that as the new first_operand
-            try:
-                self.first_operand = float(self.current_input.get())
-            except ValueError: # In case calculate resulted in an error
-                self.first_operand = None
-                self.operator = None
-                self.new_input_needed = True
-                return
-            self.operator = op # Set the new operator
-        else:
-            # If no pending operation, just store the current display as the first operand
-            self.first_operand = current_value
-            self.operator = op
-            
+            # calculate the previous operation first (5+3=8); when the result
+            # arrives it becomes the first_operand for *
+            self.calculate(next_operator=op)
+            return
+
+        # If no pending operation, just store the current display as the first operand
+        self.first_operand = current_value
+        self.operator = op
         self.new_input_needed = True # Next digit pressed will start a new number
 
-    def calculate(self):
+    def calculate(self, next_operator=None):
         """
-        Performs the calculation based on the stored first_operand, operator,
+        Starts the calculation based on the stored first_operand, operator,
         and the current number on the display (second_operand).
+        The result is shown by finish_calculation once the worker returns it.
+        next_operator, if given, becomes the pending operator after the result.
         """
-        # Do nothing if there's no pending operation
-        if self.first_operand is None or self.operator is None:
+        # Do nothing if there's no pending operation, or one is already running
+        if self.first_operand is None or self.operator is None or self.worker.busy:
             return 
 
         try:
-            second_operand = float(self.current_input.get())
+            second_operand = float(self.display_value)
         except ValueError:
             # Handle cases where the second operand is invalid
-            self.current_input.set("Error")
-            self.first_operand = None
-            self.operator = None
-            self.new_input_needed = True
+            self.show_error("Error")
             return
 
-        result = None
-        try:
-            # Call the appropriate backend function with the two operands
-            if self.operator == '+':
-                result = add(self.first_operand, second_operand)
-            elif self.operator == '-':
-                result = subtract(self.first_operand, second_operand)
-            elif self.operator == '*':
-                result = multiply(self.first_operand, second_operand)
-            elif self.operator == '/':
-                result = divide(self.first_operand, second_operand)
-            elif self.operator == '^':
-                result = power(self.first_operand, second_operand)
-            
-            # Display the result
-            self.current_input.set(str(result))
-            # Set the result as the new first_operand for potential chained operations
-            self.first_operand = result 
-            self.operator = None # Clear the operator after calculation
-            self.new_input_needed = True # Next digit will start a new number
-
-        except ValueError as e: # Catch specific errors from backend functions (e.g., division by zero, sqrt negative)
-            self.current_input.set(f"Error: {e}")
-            self.first_operand = None
-            self.operator = None
-            self.new_input_needed = True
-        except Exception as e: # Catch any other unexpected errors
-            self.current_input.set("Error")
-            self.first_operand = None
-            self.operator = None
-            self.new_input_needed = True
-            print(f"An unexpected error occurred during calculation: {e}") # For debugging
+        self.next_operator = next_operator
+        self.start_calculation(self.operator, self.first_operand, second_operand)
 
     def do_square_root(self):
         """
-        Calculates the square root of the number currently on the display.
+        Starts calculating the square root of the number currently on the display.
         """
+        if self.worker.busy:
+            return
         try:
-            num = float(self.current_input.get())
-            result = square_root(num)
-            self.current_input.set(str(result))
-            self.new_input_needed = True
-            self.first_operand = result # Make result available for further operations
-            self.operator = None # Clear any pending operator
-        except ValueError as e:
-            self.current_input.set(f"Error: {e}")
-            self.first_operand = None
-            self.operator = None
-            self.new_input_needed = True
-        except Exception as e:
-            self.current_input.set("Error")
-            self.first_operand = None
-            self.operator = None
-            self.new_input_needed = True
-            print(f"An unexpected error occurred during square root: {e}") # For debugging
+            num = float(self.display_value)
+        except ValueError:
+            self.show_error("Error")
+            return
+        self.next_operator = None
+        self.start_calculation('√', num)
+
+    # --- Background Calculation Handling ---
+
+    def start_calculation(self, op, *operands):
+        """
+        Sends the operation to the worker process and starts polling for the result.
+        Calculations already on the history tape are answered from its memo.
+        """
+        if op == 'expr':
+            expression = operands[0]
+        elif op == '√':
+            expression = f"√({operands[0]!r})"
+        else:
+            expression = f"{operands[0]!r} {op} {operands[1]!r}"
+        outcome = self.history.lookup(expression)
+        if outcome is not None:
+            instrumentation.count("calculations_total", op=op, status="memo")
+            self.apply_outcome(*outcome)
+            self.history.record(expression, *outcome)
+            return
+        self.pending_expression = expression
+        self.pending_op = op
+        self.calculation_started = time.perf_counter()
+        self.worker.submit(op, *operands)
+        self.progress.start(15)
+        self.cancel_button.config(state='normal')
+        self.master.after(POLL_INTERVAL_MS, self.poll_calculation)
+
+    def poll_calculation(self):
+        """
+        Checks for the worker's result without blocking; reschedules itself
+        until the calculation finishes, fails, times out or is cancelled.
+        """
+        if not self.worker.busy: # Cancelled in the meantime
+            return
+        outcome = self.worker.poll()
+        if outcome is None:
+            self.master.after(POLL_INTERVAL_MS, self.poll_calculation)
+            return
+        self.stop_progress()
+        instrumentation.observe("calculation_seconds", time.perf_counter() - self.calculation_started,
+                                op=self.pending_op, status=outcome[0])
+        self.apply_outcome(*outcome)
+        self.history.record(self.pending_expression, *outcome)
+
+    def apply_outcome(self, status, value):
+        if status == "ok":
+            self.finish_calculation(value)
+        else: # "error" (e.g. division by zero, sqrt negative), "timeout" or "failed"
+            self.show_error(f"Error: {value}", kind=status)
+
+    def finish_calculation(self, result):
+        """
+        Displays a result from the worker.
+        """
+        self.set_display(str(result))
+        # Set the result as the new first_operand for potential chained operations
+        self.first_operand = result 
+        self.operator = self.next_operator # Usually None: the operation is complete
+        self.next_operator = None
+        self.new_input_needed = True # Next digit will start a new number
+
+    def cancel_calculation(self):
+        """
+        Stops a running calculation (Cancel button); the display keeps its value.
+        """
+        if not self.worker.busy:
+            return
+        self.worker.cancel()
+        instrumentation.observe("calculation_seconds", time.perf_counter() - self.calculation_started,
+                                op=self.pending_op, status="cancelled")
+        self.stop_progress()
+        self.next_operator = None
+        self.new_input_needed = True
+
+    def stop_progress(self):
+        self.progress.stop()
+        self.cancel_button.config(state='disabled')
+
+    def show_error(self, message, kind="invalid input"):
+        """
+        Shows an error on the display and resets the pending operation.
+        kind labels it in the error counts ("error", "timeout", "failed", "invalid input").
+        """
+        instrumentation.record_error("calculator", kind)
+        self.set_display(message)
+        self.first_operand = None
+        self.operator = None
+        self.next_operator = None
+        self.new_input_needed = True
+
+    # --- History Window ---
+
+    def show_history(self):
+        """
+        Opens (or raises) the history tape window: a search box and the newest
+        matching calculations. Double-click an entry to put its result on the display.
+        """
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.lift()
+            return
+        window = tk.Toplevel(self.master)
+        window.title("History")
+        window.geometry("320x300")
+        search_text = tk.StringVar()
+        search_entry = tk.Entry(window, textvariable=search_text)
+        search_entry.pack(fill='x', padx=5, pady=5)
+        listbox = tk.Listbox(window, font=('Arial', 11))
+        listbox.pack(fill='both', expand=True, padx=5, pady=(0, 5))
+        shown = []
+
+        def refresh(*_):
+            term = search_text.get().strip()
+            shown[:] = self.history.search(term, 200) if term else self.history.recent(200)
+            listbox.delete(0, 'end')
+            for entry in shown:
+                outcome = entry.value if entry.status == "ok" else f"Error: {entry.value}"
+                listbox.insert('end', f"{entry.expression} = {outcome}")
+
+        def recall(_event):
+            selection = listbox.curselection()
+            if selection and shown[selection[0]].status == "ok" and not self.worker.busy:
+                self.set_display(str(shown[selection[0]].value))
+                self.new_input_needed = True
+
+        search_text.trace_add('write', refresh)
+        listbox.bind('<Double-Button-1>', recall)
+        refresh()
+        search_entry.focus_set()
+        self.history_window = window
+
+    def close(self):
+        """
+        Stops the worker process, closes the history tape and the window.
+        """
+        self.worker.close()
+        self.history.close()
+        self.master.destroy()
 
 
 # --- Main Application Execution ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tkinter calculator.")
+    parser.add_argument("--latency", action="store_true", help="Print per-event handler latency on exit.")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.configure(args)
+    recorder = LatencyRecorder() if args.latency else None
+    # Handler latencies go to the recorder, the metrics, or both
+    metrics_hook = instrumentation.hook("calculator")
+    if recorder is not None and metrics_hook is not None:
+        latency_hook = lambda name, seconds: (recorder(name, seconds), metrics_hook(name, seconds))
+    else:
+        latency_hook = recorder or metrics_hook
+
     # Create the main Tkinter window
     root = tk.Tk()
     # Create an instance of our CalculatorGUI class
-    calculator = CalculatorGUI(root)
+    calculator = CalculatorGUI(root, latency_hook=latency_hook)
+    # With metrics on: F9 starts / stops a profile, F10 takes a memory snapshot
+    instrumentation.bind_keys(root)
     # Start the Tkinter event loop (makes the window appear and respond to interactions)
     root.mainloop()
 
+    if recorder is not None:
+        for name, (count, p50, p99, worst) in sorted(recorder.summary().items()):
+            print(f"{name:>7}: {count:6} events, p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {worst:.3f} ms")
+
     
 
@@ -1,32 +1,73 @@
+import argparse
 import os
 
+import instrumentation
+from todo_bulk import export_tasks, import_tasks, iter_pages
+from todo_index import IndexedTaskStore
+from todo_journal import JournaledTaskStore
+from todo_sqlite import SqliteTaskStore
+
 TODO_FILE = "todo_list.txt"
+TODO_DB_FILE = "todo_list.db"
+PAGE_SIZE = 20
+
+# Tasks live in a journaled store (todo_journal.py): every add or delete is
+# appended to a journal straight away, so nothing is lost if the program
+# stops before "Exit", and several copies of the program can share the list.
+# Existing todo_list.txt files are read as they are.
+# With --backend sqlite, tasks are kept in todo_list.db instead (todo_sqlite.py),
+# which pages through huge lists and has indexed word search.
+# Every task has a stable ID, shown in brackets, used to delete it.
+# Viewing reads one page at a time, and whole lists can be imported from or
+# exported to text / CSV / NDJSON files (todo_bulk.py).
+# Tasks can carry a priority (!1 to !5), a due date (due:2025-01-31) and
+# #tags; an in-memory index (todo_index.py) answers "due next", "overdue"
+# and "tagged" without reading the whole list.
+# --metrics FILE (or APP_METRICS) records how long loading, saving and the
+# work behind each menu action take (not the typing); see instrumentation.py.
 
-def load_tasks():
-    if not os.path.exists(TODO_FILE):
-        return []
-    with open(TODO_FILE, "r") as file:
-        tasks = [line.strip() for line in file.readlines()]
-    return tasks
+@instrumentation.timed("file_seconds", file="tasks", op="load")
+def load_tasks(backend="journal"):
+    if backend == "sqlite":
+        first_run = not os.path.exists(TODO_DB_FILE)
+        tasks = SqliteTaskStore(TODO_DB_FILE)
+        if first_run and os.path.exists(TODO_FILE):
+            # Bring the existing list over once
+            old_tasks = JournaledTaskStore(TODO_FILE)
+            tasks.add_many(task for _, task in old_tasks.items())
+            old_tasks.close()
+        return IndexedTaskStore(tasks)
+    return IndexedTaskStore(JournaledTaskStore(TODO_FILE))
 
+@instrumentation.timed("file_seconds", file="tasks", op="save")
 def save_tasks(tasks):
-    with open(TODO_FILE, "w") as file:
-        for task in tasks:
-            file.write(task + "\n")
+    # Changes are already saved as they happen; this just makes sure they are on disk
+    tasks.close()
 
 def display_tasks(tasks):
-    if not tasks:
+    shown = 0
+    for page in iter_pages(tasks, PAGE_SIZE):
+        if shown == 0:
+            print("\nYour To-Do List:")
+        elif input("Press Enter for more, or q to stop: ").strip().lower() == 'q':
+            break
+        for task_id, task in page:
+            print(f"[{task_id}] {task}")
+        shown += len(page)
+    if shown == 0:
         print("No tasks in your list.")
-    else:
-        print("\nYour To-Do List:")
-        for idx, task in enumerate(tasks, start=1):
-            print(f"{idx}. {task}")
     print()
 
 def add_task(tasks):
-    task = input("Enter a new task: ").strip()
+    task = input("Enter a new task (optional: !1-!5 priority, due:YYYY-MM-DD, #tags): ").strip()
     if task:
-        tasks.append(task)
+        try:
+            with instrumentation.timer("command_seconds", app="todo", command="add"):
+                tasks.add(task)
+        except ValueError as e:
+            instrumentation.record_error("todo", e)
+            print(f"{e}\n")
+            return
         print("Task added!\n")
     else:
         print("No task entered.\n")
@@ -34,25 +75,108 @@ def add_task(tasks):
 def delete_task(tasks):
     display_tasks(tasks)
     try:
-        index = int(input("Enter the number of the task to delete: "))
-        if 1 <= index <= len(tasks):
-            removed = tasks.pop(index - 1)
-            print(f"Removed task: {removed}\n")
-        else:
-            print("Invalid task number.\n")
-    except ValueError:
+        task_id = int(input("Enter the ID of the task to delete: "))
+        with instrumentation.timer("command_seconds", app="todo", command="delete"):
+            removed = tasks.delete(task_id)
+        print(f"Removed task: {removed}\n")
+    except ValueError as e:
+        instrumentation.record_error("todo", e)
         print("Please enter a valid number.\n")
+    except KeyError as e:
+        instrumentation.record_error("todo", e)
+        print("No task has that ID (it may have been deleted already).\n")
+
+def search_tasks(tasks):
+    words = input("Enter words to search for: ").strip()
+    try:
+        with instrumentation.timer("command_seconds", app="todo", command="search"):
+            found = tasks.search(words, PAGE_SIZE)
+    except ValueError as e:
+        instrumentation.record_error("todo", e)
+        print(f"{e}\n")
+        return
+    if not found:
+        print("No matching tasks.\n")
+        return
+    print("\nMatching tasks (newest first):")
+    for row in found:
+        print(f"[{row[0]}] {row[1]}")
+    print()
+
+def show_due_tasks(tasks):
+    with instrumentation.timer("command_seconds", app="todo", command="due"):
+        tasks.refresh()
+        overdue = tasks.index.overdue(count=PAGE_SIZE)
+        due_next = tasks.index.next_due(PAGE_SIZE + len(overdue))[len(overdue):]  # Overdue tasks come first
+    if overdue:
+        print("\nOverdue:")
+        for task in overdue:
+            print(f"[{task.id}] {task.text}")
+    if due_next:
+        print("\nDue next:")
+        for task in due_next:
+            print(f"[{task.id}] {task.text}")
+    if not overdue and not due_next:
+        print("No tasks have a due date (add one with due:YYYY-MM-DD).")
+    print()
+
+def show_tagged_tasks(tasks):
+    tasks.refresh()
+    tag = input(f"Tag ({', '.join('#' + tag for tag in sorted(tasks.index.tags)[:10]) or 'none yet'}): ").strip()
+    with instrumentation.timer("command_seconds", app="todo", command="tagged"):
+        found = tasks.index.with_tag(tag, PAGE_SIZE)
+    if not found:
+        print("No tasks with that tag.\n")
+        return
+    print()
+    for task in found:
+        print(f"[{task.id}] {task.text}")
+    print()
+
+def import_file(tasks):
+    path = input("File to import (.txt, .csv or .ndjson): ").strip()
+    try:
+        with instrumentation.timer("command_seconds", app="todo", command="import"):
+            imported, skipped, invalid = import_tasks(
+                tasks, path, on_error=lambda line_number, message: print(f"Line {line_number}: {message}"))
+    except (OSError, ValueError) as e:
+        instrumentation.record_error("todo", e)
+        print(f"Import failed: {e}\n")
+        return
+    print(f"Imported {imported} tasks ({skipped} duplicates, {invalid} invalid rows skipped).\n")
+
+def export_file(tasks):
+    path = input("File to export to (.txt, .csv or .ndjson): ").strip()
+    try:
+        with instrumentation.timer("command_seconds", app="todo", command="export"):
+            count = export_tasks(tasks, path)
+    except OSError as e:
+        instrumentation.record_error("todo", e)
+        print(f"Export failed: {e}\n")
+        return
+    print(f"Exported {count} tasks.\n")
 
-def main():
-    tasks = load_tasks()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="To-do list.")
+    parser.add_argument("--backend", choices=("journal", "sqlite"), default="journal",
+                        help="Where tasks are stored (default: journal, in todo_list.txt).")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure(args)
+    tasks = load_tasks(args.backend)
 
     while True:
         print("=== To-Do List Menu ===")
         print("1. View tasks")
         print("2. Add task")
         print("3. Delete task")
-        print("4. Exit")
-        choice = input("Choose an option (1-4): ").strip()
+        print("4. Search tasks")
+        print("5. Show due and overdue tasks")
+        print("6. Show tasks with a tag")
+        print("7. Import tasks from a file")
+        print("8. Export tasks to a file")
+        print("9. Exit")
+        choice = input("Choose an option (1-9): ").strip()
 
         if choice == '1':
             display_tasks(tasks)
@@ -61,6 +185,16 @@ def main():
         elif choice == '3':
             delete_task(tasks)
         elif choice == '4':
+            search_tasks(tasks)
+        elif choice == '5':
+            show_due_tasks(tasks)
+        elif choice == '6':
+            show_tagged_tasks(tasks)
+        elif choice == '7':
+            import_file(tasks)
+        elif choice == '8':
+            export_file(tasks)
+        elif choice == '9':
             save_tasks(tasks)
             print("Goodbye! Tasks saved.")
             break
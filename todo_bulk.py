@@ -0,0 +1,351 @@
+import argparse
+import contextlib
+import csv
+import datetime
+import hashlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# --- Bulk Import / Export ---
+# Moves tasks in and out of a to-do store (todo_journal or todo_sqlite) as a
+# stream, so the files involved never have to fit in memory:
+#
+#   text     one task per line
+#   csv      a header row with a "text" (or "task" / "title") column, plus
+#            optional status, priority and due columns (used by SQLite)
+#   ndjson   one JSON object per line with the same keys
+#
+# A row that cannot be read (bad JSON, a priority that is not a whole number,
+# a due date that is not YYYY-MM-DD) is skipped and reported, not fatal.
+#
+# Imports are deduplicated: each task's normalized text (case and spacing
+# ignored) is reduced to a 64-bit hash, kept in a HashIndex of sorted NumPy
+# runs at 8 bytes per task. Existing tasks are hashed first, so re-importing a
+# file adds nothing. Rows are written to the store in chunks.
+
+CHUNK_SIZE = 50_000
+PAGE_SIZE = 20
+TEXT_KEYS = ("text", "task", "title")
+
+
+def text_hash(text):
+    """64-bit hash of a task's text, ignoring case and spacing."""
+    normalized = " ".join(text.split()).casefold().encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(normalized, digest_size=8).digest(), "little")
+
+
+class HashIndex:
+    """
+    A set of 64-bit hashes stored as sorted, disjoint NumPy runs. Adding a run
+    merges it with equally sized older runs (like a binary counter), so there
+    are O(log n) runs and lookups are a binary search in each.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    def contains(self, hashes):
+        """Returns a boolean mask: which of the (uint64) hashes are already present."""
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, hashes)
+            np.minimum(positions, len(run) - 1, out=positions)
+            found |= run[positions] == hashes
+        return found
+
+    def add_new(self, hashes):
+        """
+        Adds a chunk of hashes and returns a mask of the ones that were new:
+        not in the index and not repeated earlier in the chunk.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        unique, first_positions = np.unique(hashes, return_index=True)
+        fresh = ~self.contains(unique)
+        new_mask = np.zeros(len(hashes), dtype=bool)
+        new_mask[first_positions[fresh]] = True
+        run = unique[fresh]
+        while self._runs and len(self._runs[-1]) <= len(run):
+            run = np.sort(np.concatenate((self._runs.pop(), run)))
+        if len(run):
+            self._runs.append(run)
+        return new_mask
+
+
+# --- Reading Import Files ---
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl"):
+        return "ndjson"
+    return "text"
+
+
+def _priority(value):
+    """A priority from 1 to 5 (out-of-range numbers are clamped). Raises ValueError unless a whole number."""
+    if value is None or value == "":
+        return 3
+    try:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError
+        number = value if isinstance(value, int) else float(value)
+        if number != int(number):
+            raise ValueError
+    except (ValueError, OverflowError):  # OverflowError: int() of an infinity
+        raise ValueError(f"Invalid priority {value!r}; use a whole number from 1 to 5.") from None
+    return min(5, max(1, int(number)))
+
+
+def _due(value):
+    """A YYYY-MM-DD due date or None. Raises ValueError for anything else."""
+    if value is None or value == "":
+        return None
+    try:
+        return datetime.date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid due date {value!r}; use YYYY-MM-DD.") from None
+
+
+def _record_from_mapping(mapping):
+    text = next((mapping[key] for key in TEXT_KEYS if mapping.get(key)), None)
+    if text is None:
+        return None
+    # Other trackers use other statuses; anything unrecognized falls back to the default
+    status = mapping.get("status") if mapping.get("status") in ("open", "done") else "open"
+    return str(text), status, _priority(mapping.get("priority")), _due(mapping.get("due"))
+
+
+def iter_records(file, file_format, on_error=None):
+    """
+    Yields (text, status, priority, due) tuples from an open text file.
+    Rows without task text are skipped. An invalid row raises ValueError, or,
+    if on_error is given, is skipped after calling on_error(line_number, message).
+    """
+    def invalid(line_number, error):
+        if on_error is None:
+            raise ValueError(f"Line {line_number}: {error}") from error
+        on_error(line_number, str(error))
+
+    if file_format == "text":
+        for line in file:
+            text = line.strip()
+            if text:
+                yield text, "open", 3, None
+    elif file_format == "csv":
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [column.strip().lower() for column in header]
+        if not any(key in columns for key in TEXT_KEYS):
+            # No header row: the first column is the task
+            for row in itertools.chain([header], reader):
+                if row and row[0].strip():
+                    yield row[0].strip(), "open", 3, None
+            return
+        for row in reader:
+            try:
+                record = _record_from_mapping(dict(zip(columns, row)))
+            except ValueError as e:
+                invalid(reader.line_num, e)
+                continue
+            if record is not None:
+                yield record
+    elif file_format == "ndjson":
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value = json.loads(line)
+                record = _record_from_mapping(value) if isinstance(value, dict) else (str(value), "open", 3, None)
+            except ValueError as e:  # json.JSONDecodeError is a ValueError
+                invalid(line_number, e)
+                continue
+            if record is not None:
+                yield record
+    else:
+        raise ValueError(f"Unknown format: {file_format!r}")
+
+
+def _open(path, mode):
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+# --- Import / Export ---
+
+def import_tasks(store, path, file_format=None, dedupe=True, chunk_size=CHUNK_SIZE, on_error=None):
+    """
+    Streams tasks from a file ("-" for stdin) into the store. Invalid rows are
+    skipped; on_error(line_number, message), if given, is called for each.
+    Returns (imported, skipped_duplicates, invalid).
+    """
+    file_format = file_format or detect_format(path)
+    index = HashIndex()
+    if dedupe:
+        existing = store.iter_items()
+        while True:
+            chunk = list(itertools.islice(existing, chunk_size))
+            if not chunk:
+                break
+            index.add_new(np.fromiter((text_hash(text) for _, text in chunk), dtype=np.uint64, count=len(chunk)))
+
+    imported = skipped = invalid = 0
+
+    def skip_invalid(line_number, message):
+        nonlocal invalid
+        invalid += 1
+        if on_error is not None:
+            on_error(line_number, message)
+
+    structured = hasattr(store, "page")  # SQLite keeps status / priority / due
+    with _open(path, "r") as file:
+        records = iter_records(file, file_format, skip_invalid)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            if dedupe:
+                keep = index.add_new(np.fromiter((text_hash(record[0]) for record in chunk),
+                                                 dtype=np.uint64, count=len(chunk)))
+                chunk = list(itertools.compress(chunk, keep))
+                skipped += len(keep) - len(chunk)
+            store.add_many(chunk if structured else [record[0] for record in chunk])
+            imported += len(chunk)
+    return imported, skipped, invalid
+
+
+def export_tasks(store, path, file_format=None):
+    """Streams every task into a file ("-" for stdout). Returns the number written."""
+    file_format = file_format or detect_format(path)
+    rows = store.iter_rows() if hasattr(store, "iter_rows") else (
+        (task_id, text, "open", 3, None) for task_id, text in store.iter_items())
+    count = 0
+    with _open(path, "w") as file:
+        if file_format == "csv":
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(("id", "text", "status", "priority", "due"))
+        for task_id, text, status, priority, due in rows:
+            if file_format == "csv":
+                writer.writerow((task_id, text, status, priority, due or ""))
+            elif file_format == "ndjson":
+                file.write(json.dumps({"id": task_id, "text": text, "status": status,
+                                       "priority": priority, "due": due}) + "\n")
+            else:
+                file.write(text + "\n")
+            count += 1
+    return count
+
+
+def iter_pages(store, page_size=PAGE_SIZE):
+    """
+    Yields lists of (id, text) pairs, one page at a time. Only the current
+    page is ever held in memory; the store is read lazily between pages.
+    """
+    items = store.iter_items()
+    while True:
+        page = list(itertools.islice(items, page_size))
+        if not page:
+            return
+        yield page
+
+
+# --- Benchmark ---
+
+def _peak_memory_mb():
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark(task_count=1_000_000, duplicate_every=10, backends=("journal", "sqlite"), directory=None):
+    """
+    Writes an NDJSON file of task_count tasks (every `duplicate_every`-th one
+    repeats an earlier task, and a few invalid rows follow), then imports and
+    exports it with each backend.
+    Returns {backend: (import_seconds, imported, skipped, export_seconds)}.
+    """
+    from todo_journal import JournaledTaskStore
+    from todo_sqlite import SqliteTaskStore
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+        source = os.path.join(temp_dir, "tasks.ndjson")
+        with open(source, "w", encoding="utf-8") as file:
+            for i in range(task_count):
+                number = i // 2 if i % duplicate_every == duplicate_every - 1 else i
+                file.write(json.dumps({"text": f"Migrated task {number}", "priority": 1 + number % 5}) + "\n")
+            bad_rows = ('{"text": "a", "priority": 1e400}', '{"text": "b", "due": {"x": 1}}', '{"text": ')
+            file.write("\n".join(bad_rows) + "\n")
+        for backend in backends:
+            if backend == "sqlite":
+                store = SqliteTaskStore(os.path.join(temp_dir, "todo_list.db"))
+            else:
+                store = JournaledTaskStore(os.path.join(temp_dir, "todo_list.txt"))
+            start = time.perf_counter()
+            imported, skipped, invalid = import_tasks(store, source)
+            import_seconds = time.perf_counter() - start
+            assert invalid == len(bad_rows)
+            start = time.perf_counter()
+            export_tasks(store, os.path.join(temp_dir, f"export-{backend}.csv"))
+            export_seconds = time.perf_counter() - start
+            store.close()
+            results[backend] = (import_seconds, imported, skipped, export_seconds)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export for the to-do list.")
+    parser.add_argument("--backend", choices=("journal", "sqlite"), default="journal")
+    parser.add_argument("--format", choices=("text", "csv", "ndjson"), help="File format (default: from the extension).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Import tasks from a file ('-' for stdin).")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--keep-duplicates", action="store_true")
+    export_parser = subparsers.add_parser("export", help="Export tasks to a file ('-' for stdout).")
+    export_parser.add_argument("path")
+    bench_parser = subparsers.add_parser("bench", help="Benchmark import and export.")
+    bench_parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        for backend, (import_seconds, imported, skipped, export_seconds) in benchmark(args.tasks).items():
+            print(f"{backend:>7}: import {args.tasks / import_seconds:10,.0f} rows/s "
+                  f"({imported:,} added, {skipped:,} duplicates), "
+                  f"export {imported / export_seconds:10,.0f} rows/s")
+        print(f"peak memory {_peak_memory_mb():,.0f} MB")
+        return
+
+    from todo_journal import JournaledTaskStore
+    from todo_sqlite import SqliteTaskStore
+    store = SqliteTaskStore("todo_list.db") if args.backend == "sqlite" else JournaledTaskStore("todo_list.txt")
+    try:
+        if args.command == "import":
+            imported, skipped, invalid = import_tasks(
+                store, args.path, args.format, dedupe=not args.keep_duplicates,
+                on_error=lambda line_number, message: print(f"Line {line_number}: {message}", file=sys.stderr))
+            print(f"Imported {imported:,} tasks ({skipped:,} duplicates, {invalid:,} invalid rows skipped).",
+                  file=sys.stderr)
+        else:
+            count = export_tasks(store, args.path, args.format)
+            print(f"Exported {count:,} tasks.", file=sys.stderr)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+import argparse
+import datetime
+import heapq
+import itertools
+import random
+import re
+import time
+
+# --- Task Records and Scheduling Index ---
+# Tasks carry their details inline, so every store and import/export format
+# keeps them without a schema change:
+#
+#   "Pay rent !1 due:2025-02-01 #home #bills"
+#       !1 .. !5            priority (1 = highest, default 3)
+#       due:YYYY-MM-DD      due date
+#       #tag                any number of tags
+#
+# TaskIndex keeps compact Task records (__slots__) plus:
+#   - a heap ordered by (due date, priority) for "next N due" and "overdue"
+#   - a heap ordered by (priority, due date) for "top N by priority"
+#   - a tag -> task IDs map
+# Queries pop the k results off a heap and push them back: O(k log n), no scan.
+# Heap entries carry the serial number of the add() that pushed them, so the
+# entries of a removed or replaced task are recognised as stale and skipped when
+# popped; the heaps are rebuilt once more than half their entries are stale.
+
+DEFAULT_PRIORITY = 3
+NO_DUE_DATE = datetime.date.max.toordinal()
+
+PRIORITY_PATTERN = re.compile(r"(?<!\S)!([1-5])(?!\S)")
+DUE_PATTERN = re.compile(r"(?<!\S)due:(\S+)")
+TAG_PATTERN = re.compile(r"(?<!\S)#(\w[\w-]*)")
+
+
+def parse_due(value):
+    """Parses a YYYY-MM-DD date into a day ordinal. Raises ValueError if invalid."""
+    try:
+        return datetime.date.fromisoformat(value).toordinal()
+    except ValueError:
+        raise ValueError(f"Invalid due date {value!r}; use YYYY-MM-DD.") from None
+
+
+class Task:
+    """One task. due is a date ordinal (see due_date) or None; tags is a tuple."""
+
+    __slots__ = ("id", "text", "status", "priority", "due", "tags")
+
+    def __init__(self, task_id, text, status="open", priority=DEFAULT_PRIORITY, due=None, tags=()):
+        self.id = task_id
+        self.text = text
+        self.status = status
+        self.priority = priority
+        self.due = due
+        self.tags = tags
+
+    @classmethod
+    def from_text(cls, task_id, text, status="open", strict=False):
+        """
+        Builds a Task from text with inline !priority, due:date and #tags.
+        With strict=True an invalid due date raises ValueError; otherwise it is ignored.
+        """
+        priority = PRIORITY_PATTERN.search(text)
+        due = DUE_PATTERN.search(text)
+        due_ordinal = None
+        if due:
+            try:
+                due_ordinal = parse_due(due.group(1))
+            except ValueError:
+                if strict:
+                    raise
+        tags = tuple(dict.fromkeys(tag.lower() for tag in TAG_PATTERN.findall(text)))
+        return cls(task_id, text, status, int(priority.group(1)) if priority else DEFAULT_PRIORITY, due_ordinal, tags)
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds a Task from an SQLite (id, text, status, priority, due) row."""
+        task_id, text, status, priority, due = row
+        task = cls.from_text(task_id, text, status)
+        task.priority = priority
+        if due:
+            try:
+                task.due = parse_due(due)
+            except ValueError:
+                pass
+        return task
+
+    @property
+    def due_date(self):
+        return None if self.due is None else datetime.date.fromordinal(self.due)
+
+    def __repr__(self):
+        return f"Task({self.id!r}, {self.text!r})"
+
+
+class TaskIndex:
+    """
+    Tasks by ID, with heaps for due-date and priority queries and a tag index.
+    Build it from Task records; keep it in sync with add() and remove().
+    """
+
+    def __init__(self, tasks=()):
+        self.tasks = {}
+        self.tags = {}  # tag -> {task id: None}, in insertion order
+        self._serials = {}  # task id -> serial of its live heap entries
+        self._next_serial = itertools.count()
+        self._stale = 0
+        for task in tasks:
+            self.tasks[task.id] = task
+            self._index_tags(task)
+        self._rebuild_heaps()
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self.tasks
+
+    def _rebuild_heaps(self):
+        # heapify is O(n), cheaper than n pushes
+        open_tasks = [task for task in self.tasks.values() if task.status == "open"]
+        serials = self._serials
+        for task in open_tasks:
+            serials[task.id] = next(self._next_serial)
+        self._due_heap = [(task.due, task.priority, task.id, serials[task.id])
+                          for task in open_tasks if task.due is not None]
+        self._priority_heap = [(task.priority, NO_DUE_DATE if task.due is None else task.due, task.id,
+                                serials[task.id]) for task in open_tasks]
+        heapq.heapify(self._due_heap)
+        heapq.heapify(self._priority_heap)
+        self._stale = 0
+
+    def _index_tags(self, task):
+        for tag in task.tags:
+            self.tags.setdefault(tag, {})[task.id] = None
+
+    def add(self, task):
+        self.tasks[task.id] = task
+        self._index_tags(task)
+        if task.status == "open":
+            serial = self._serials[task.id] = next(self._next_serial)
+            if task.due is not None:
+                heapq.heappush(self._due_heap, (task.due, task.priority, task.id, serial))
+            heapq.heappush(self._priority_heap,
+                           (task.priority, NO_DUE_DATE if task.due is None else task.due, task.id, serial))
+
+    def remove(self, task_id):
+        """Removes a task and returns it. Raises KeyError for an unknown ID."""
+        task = self.tasks.pop(task_id)
+        for tag in task.tags:
+            tagged = self.tags[tag]
+            del tagged[task_id]
+            if not tagged:
+                del self.tags[tag]
+        if task.status == "open":
+            del self._serials[task_id]
+            self._stale += 1 + (task.due is not None)
+            if self._stale > (len(self._due_heap) + len(self._priority_heap)) // 2:
+                self._rebuild_heaps()
+        return task
+
+    def _take(self, heap, count, before=None):
+        """
+        Pops up to `count` live entries (only those with key < before, if given),
+        pushes them back, and returns their tasks in heap order.
+        """
+        taken = []
+        while heap and len(taken) < count:
+            entry = heap[0]
+            if before is not None and entry[0] >= before:
+                break
+            heapq.heappop(heap)
+            if self._serials.get(entry[2]) == entry[3]:
+                taken.append(entry)
+            else:
+                self._stale -= 1  # Entry of a removed or replaced task: drop it for good
+        for entry in taken:
+            heapq.heappush(heap, entry)
+        return [self.tasks[entry[2]] for entry in taken]
+
+    def next_due(self, count=10):
+        """The `count` open tasks due soonest (ties: higher priority first)."""
+        return self._take(self._due_heap, count)
+
+    def overdue(self, today=None, count=100):
+        """Up to `count` open tasks due before today, most overdue first."""
+        today = today or datetime.date.today()
+        return self._take(self._due_heap, count, before=today.toordinal())
+
+    def top_priority(self, count=10):
+        """The `count` open tasks with the highest priority (ties: due soonest first)."""
+        return self._take(self._priority_heap, count)
+
+    def with_tag(self, tag, count=None):
+        """Tasks with a tag, oldest first."""
+        task_ids = self.tags.get(tag.lower().lstrip("#"), {})
+        return [self.tasks[task_id] for task_id in itertools.islice(task_ids, count)]
+
+
+class IndexedTaskStore:
+    """
+    Wraps a to-do store (todo_journal or todo_sqlite) and keeps a TaskIndex in
+    sync with it. Everything else is passed through to the store. The index is
+    built the first time it is used, so opening a list that is only listed or
+    edited does not parse every task.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._structured = hasattr(store, "iter_rows")  # SQLite: details also go in columns
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._rebuild()
+        return self._index
+
+    def _rebuild(self):
+        _, self._changes = self.store.changes_since()  # Taken first, so nothing falls in between
+        self._last_id = None
+        self._index = TaskIndex(self._load())
+
+    def _load(self, after=None):
+        if self._structured:
+            records = (Task.from_row(row) for row in self.store.iter_rows(after))
+        else:
+            records = (Task.from_text(task_id, text) for task_id, text in self.store.iter_items(after))
+        for task in records:
+            self._last_id = task.id
+            yield task
+
+    def _reload(self, task_id):
+        try:
+            if self._structured:
+                return Task.from_row(self.store.get_row(task_id))
+            return Task.from_text(task_id, self.store.get(task_id))
+        except KeyError:
+            return None  # Deleted
+
+    def refresh(self):
+        """
+        Catches the index up with the store: tasks deleted or changed since the
+        last look (by another process too) are dropped or re-read, and new ones
+        added. IDs are never reused, so new tasks are those above the last ID seen.
+        """
+        if self._index is None:
+            return  # Not built yet; it will read the store as it is then
+        changed, self._changes = self.store.changes_since(self._changes)
+        if changed is None:
+            self._rebuild()
+            return
+        for task_id in changed:
+            if task_id in self.index:
+                self.index.remove(task_id)
+                task = self._reload(task_id)
+                if task is not None:
+                    self.index.add(task)
+        for task in self._load(self._last_id):
+            self.index.add(task)
+
+    def add(self, text):
+        """Adds a task; an invalid due date raises ValueError before anything is saved."""
+        task = Task.from_text(None, text, strict=True)
+        if self._structured:
+            due = task.due_date.isoformat() if task.due is not None else None
+            task_id = self.store.add(text, priority=task.priority, due=due)
+        else:
+            task_id = self.store.add(text)
+        self.refresh()  # Indexes the new task, and any added by others before it
+        return task_id
+
+    def add_many(self, rows):
+        count = self.store.add_many(rows)
+        self.refresh()
+        return count
+
+    def delete(self, task_id):
+        try:
+            return self.store.delete(task_id)
+        finally:
+            self.refresh()  # Drops it, also when another process deleted it first
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+
+# --- Benchmark ---
+
+def _random_tasks(count, seed=0):
+    rng = random.Random(seed)
+    today = datetime.date.today().toordinal()
+    tags = [f"tag{i}" for i in range(50)]
+    for task_id in range(count):
+        due = today + rng.randrange(-30, 365) if rng.random() < 0.7 else None
+        yield Task(task_id, f"Task {task_id}", priority=rng.randint(1, 5), due=due,
+                   tags=tuple(rng.sample(tags, rng.randint(0, 2))))
+
+
+def benchmark(task_count=1_000_000, queries=1_000):
+    """
+    Builds an index of task_count random tasks and compares its queries with
+    scanning every task, then times keeping the index in sync on add/remove.
+    Returns {name: seconds per call}.
+    """
+    tasks = list(_random_tasks(task_count))
+    results = {}
+    start = time.perf_counter()
+    index = TaskIndex(tasks)
+    results["build"] = time.perf_counter() - start
+    today = datetime.date.today()
+
+    scans = {
+        "next 10 due": lambda: heapq.nsmallest(10, (task for task in tasks if task.due is not None),
+                                               key=lambda task: (task.due, task.priority, task.id)),
+        "100 overdue": lambda: sorted((task for task in tasks if task.due is not None and task.due < today.toordinal()),
+                                      key=lambda task: (task.due, task.priority, task.id))[:100],
+        "top 10 priority": lambda: heapq.nsmallest(10, tasks, key=lambda task: (task.priority, task.due or NO_DUE_DATE, task.id)),
+        "tag, first 20": lambda: [task for task in tasks if "tag7" in task.tags][:20],
+    }
+    indexed = {
+        "next 10 due": lambda: index.next_due(10),
+        "100 overdue": lambda: index.overdue(today, 100),
+        "top 10 priority": lambda: index.top_priority(10),
+        "tag, first 20": lambda: index.with_tag("tag7", 20),
+    }
+    for name in scans:
+        start = time.perf_counter()
+        expected = scans[name]()
+        scan_seconds = time.perf_counter() - start
+        assert [task.id for task in expected] == [task.id for task in indexed[name]()]
+        start = time.perf_counter()
+        for _ in range(queries):
+            indexed[name]()
+        results[name] = (scan_seconds, (time.perf_counter() - start) / queries)
+
+    new_tasks = list(_random_tasks(queries, seed=1))
+    for task in new_tasks:
+        task.id += task_count
+    start = time.perf_counter()
+    for task in new_tasks:
+        index.add(task)
+    for task in new_tasks:
+        index.remove(task.id)
+    results["add + remove"] = (time.perf_counter() - start) / queries
+
+    # Replacing a task (as IndexedTaskStore.refresh does) must retire its old entries
+    for task in index.top_priority(5) + index.overdue(today, 5):
+        index.remove(task.id)
+        index.add(Task(task.id, task.text, status="done", priority=task.priority, due=task.due, tags=task.tags))
+    for task in index.next_due(5):
+        index.remove(task.id)
+        index.add(Task(task.id, task.text, priority=5, due=task.due, tags=task.tags))
+    for task in index.next_due(3):
+        index.remove(task.id)
+        index.add(Task(task.id, task.text, priority=task.priority, due=task.due, tags=task.tags))
+    tasks = list(index.tasks.values())
+    open_tasks = [task for task in tasks if task.status == "open"]
+    assert ([task.id for task in index.next_due(10)] ==
+            [task.id for task in heapq.nsmallest(10, (task for task in open_tasks if task.due is not None),
+                                                 key=lambda task: (task.due, task.priority, task.id))])
+    assert ([task.id for task in index.top_priority(10)] ==
+            [task.id for task in heapq.nsmallest(10, open_tasks,
+                                                 key=lambda task: (task.priority, task.due or NO_DUE_DATE, task.id))])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the to-do scheduling index.")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    results = benchmark(args.tasks)
+    print(f"{args.tasks:,} tasks, index built in {results.pop('build'):.2f}s")
+    maintenance = results.pop("add + remove")
+    for name, (scan_seconds, index_seconds) in results.items():
+        print(f"  {name:<16} full scan {scan_seconds * 1000:9.2f} ms   index {index_seconds * 1e6:9.2f} us")
+    print(f"  {'add + remove':<16} {maintenance * 1e6:9.2f} us per task")
+
+
+if __name__ == "__main__":
+    main()
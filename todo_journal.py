@@ -0,0 +1,540 @@
+import argparse
+import glob
+import itertools
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# --- Journaled Task Storage ---
+# Instead of rewriting the whole to-do file on exit, every change is appended
+# to a journal as one small record, so a save costs O(change) and a crash loses
+# at most the last few milliseconds:
+#
+#   todo_list.txt              snapshot: a header line, then "id<TAB>text" lines
+#   todo_list.txt.journal.G    changes since snapshot generation G:
+#                                "+id<TAB>text"   task added
+#                                "-id"            task deleted
+#                                ">G+1"           later changes are in journal G+1
+#   todo_list.txt.lock         advisory lock shared by every process
+#
+# Records are fsync'ed in batches (every SYNC_EVERY records or SYNC_INTERVAL
+# seconds, whichever comes first). Once the journal outgrows the task list it
+# is compacted: appends switch to journal G+1 straight away, and a background
+# thread writes snapshot G+1 (temp file + atomic rename) and removes journal G.
+# Startup loads the snapshot and replays the journals that follow it.
+# A plain one-task-per-line file from the original script is read as a snapshot.
+#
+# Several processes can use the same list at once. Each change is made under
+# the lock file: the process first replays records other processes appended
+# since it last looked (an optimistic merge, usually zero records), then
+# allocates IDs and appends its own record. Deleting a task that another
+# process already deleted raises KeyError like any unknown ID.
+# changes_since() lists the IDs deleted meanwhile, for views kept in sync with
+# the list (todo_index).
+
+SNAPSHOT_HEADER = "#todo-snapshot v1"
+SYNC_EVERY = 256
+SYNC_INTERVAL = 0.05
+COMPACT_MIN_RECORDS = 100_000
+CHANGE_LOG_MIN = 1024  # Deleted IDs kept for changes_since() before starting over
+
+
+class _FileLock:
+    """Exclusive advisory lock on a file; re-entrant within one process."""
+
+    def __init__(self, path):
+        self._file = open(path, "a+b")
+        self._depth = 0
+
+    def __enter__(self):
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK gives up after 10 seconds; keep waiting
+                        pass
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def close(self):
+        self._file.close()
+
+
+def _snapshot_generation(path):
+    """Generation of the snapshot on disk (0 for none or a plain task file)."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            first = file.readline()
+    except FileNotFoundError:
+        return 0
+    if not first.startswith(SNAPSHOT_HEADER):
+        return 0
+    return int(dict(item.split("=", 1) for item in first.split()[2:])["generation"])
+
+
+class JournaledTaskStore:
+    """
+    Tasks with stable integer IDs, kept in memory in insertion order and
+    persisted through a snapshot plus an append-only journal.
+    """
+
+    def __init__(self, path, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL,
+                 compact_after=COMPACT_MIN_RECORDS):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+        self._file_lock = _FileLock(f"{path}.lock")
+        self._pending = 0
+        self._compactor = None
+        self._journal = None
+        self._reader = None
+        self._deleted_ids = []  # Every deletion seen since _changes_epoch began
+        self._changes_epoch = 0
+        with self._lock, self._file_lock:
+            self._load()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+
+    # --- Loading and Merging ---
+
+    def _journal_path(self, generation):
+        return f"{self.path}.journal.{generation}"
+
+    def _load(self):
+        """Reads the snapshot and replays every journal after it (file lock held)."""
+        self._tasks = {}  # id -> text; dicts keep insertion order
+        self._next_id = 0
+        self._forget_changes()  # Deletions before the snapshot are not known
+        self._generation = 0
+        self._journal_records = 0
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as file:
+                first = file.readline()
+                if first.startswith(SNAPSHOT_HEADER):
+                    fields = dict(item.split("=", 1) for item in first.split()[2:])
+                    self._generation = int(fields["generation"])
+                    self._next_id = int(fields["next_id"])
+                    for line in file:
+                        task_id, _, text = line.rstrip("\n").partition("\t")
+                        self._tasks[int(task_id)] = text
+                elif first:
+                    # Original format: one task per line, IDs assigned in order
+                    for line in [first, *file]:
+                        self._tasks[self._next_id] = line.strip()
+                        self._next_id += 1
+
+        generations = sorted(int(name.rsplit(".", 1)[1]) for name in glob.glob(glob.escape(self.path) + ".journal.*"))
+        for generation in generations:
+            if generation < self._generation:
+                os.remove(self._journal_path(generation))  # Already in the snapshot
+            elif generation > self._generation:
+                break  # Reached by following ">" records
+        self._open_journal(self._generation)
+        self._catch_up()
+
+    def _open_journal(self, generation):
+        if self._pending:
+            self._sync_locked()  # Our records in the journal being left
+        for handle in (self._journal, self._reader):
+            if handle is not None:
+                handle.close()
+        self._generation = generation
+        self._journal = open(self._journal_path(generation), "ab")
+        self._reader = open(self._journal_path(generation), "rb")
+        self._read_offset = 0
+        self._journal_records = 0
+
+    def _catch_up(self):
+        """
+        Applies records appended since this process last read the journal,
+        following ">" records into newer journals (file lock held).
+        """
+        while True:
+            self._reader.seek(self._read_offset)
+            data = self._reader.read()
+            if not data:
+                return
+            complete = data.rfind(b"\n") + 1
+            next_generation = None
+            for line in data[:complete].decode("utf-8").splitlines():
+                kind = line[0]
+                if kind == "+":
+                    task_id, _, text = line[1:].partition("\t")
+                    task_id = int(task_id)
+                    self._tasks[task_id] = text
+                    self._next_id = max(self._next_id, task_id + 1)
+                elif kind == "-":
+                    task_id = int(line[1:])
+                    if self._tasks.pop(task_id, None) is not None:
+                        self._note_deleted(task_id)
+                elif kind == ">":
+                    next_generation = int(line[1:])
+                self._journal_records += 1
+            if complete != len(data):
+                # Torn final record from a crashed writer (writers hold the lock)
+                os.truncate(self._journal_path(self._generation), self._read_offset + complete)
+            self._read_offset += complete
+            if next_generation is None:
+                return
+            if not os.path.exists(self._journal_path(next_generation)) \
+                    and _snapshot_generation(self.path) > next_generation:
+                self._load()  # Fell behind a compaction that already removed that journal
+                return
+            self._open_journal(next_generation)
+
+    def refresh(self):
+        """Picks up changes made by other processes."""
+        with self._lock, self._file_lock:
+            self._catch_up()
+
+    def _note_deleted(self, task_id):
+        self._deleted_ids.append(task_id)
+        if len(self._deleted_ids) > max(CHANGE_LOG_MIN, len(self._tasks)):
+            self._forget_changes()  # Rebuilding a view is now no dearer than replaying them
+
+    def _forget_changes(self):
+        self._deleted_ids = []
+        self._changes_epoch += 1
+
+    def changes_since(self, token=None):
+        """
+        IDs of tasks deleted (by any process) since `token`. Returns (ids,
+        new_token); pass new_token back next time. token=None starts now. ids
+        is None when the store can no longer tell (it reloaded, or the log was
+        trimmed), and a view built on it should be rebuilt.
+        """
+        self.refresh()
+        with self._lock:
+            current = (self._changes_epoch, len(self._deleted_ids))
+            if token is None:
+                return [], current
+            if token[0] != self._changes_epoch:
+                return None, current
+            return self._deleted_ids[token[1]:], current
+
+    # --- Reading ---
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def get(self, task_id):
+        return self._tasks[task_id]
+
+    def items(self):
+        """Returns (id, text) pairs in the order the tasks were added."""
+        self.refresh()
+        with self._lock:
+            return list(self._tasks.items())
+
+    def iter_items(self, after=None):
+        """
+        Yields (id, text) pairs lazily in ID order (IDs only ever grow, and the
+        dict keeps insertion order), starting after ID `after`.
+        """
+        self.refresh()
+        while True:
+            try:
+                items = self._tasks.items()
+                if after is not None:
+                    newer = sum(1 for _ in itertools.takewhile(lambda task_id: task_id > after, reversed(self._tasks)))
+                    if newer <= len(self._tasks) // 2:
+                        # A short tail (the usual catch-up): read it from the end, O(newer)
+                        items = list(itertools.islice(reversed(items), newer))[::-1]
+                    else:
+                        items = itertools.islice(items, len(self._tasks) - newer, None)
+                for task_id, text in items:
+                    yield task_id, text
+                    after = task_id
+                return
+            except RuntimeError:  # The list changed while paused between pages; resume
+                continue
+
+    def ids(self):
+        self.refresh()
+        with self._lock:
+            return list(self._tasks)
+
+    def search(self, text, limit=20):
+        """Returns up to `limit` (id, text) pairs containing every word, newest first."""
+        words = text.lower().split()
+        if not words:
+            raise ValueError("Enter at least one word to search for.")
+        found = []
+        for task_id, task in reversed(self.items()):
+            lowered = task.lower()
+            if all(word in lowered for word in words):
+                found.append((task_id, task))
+                if len(found) == limit:
+                    break
+        return found
+
+    # --- Changes ---
+
+    def add(self, text):
+        """Adds a task and returns its ID."""
+        text = " ".join(text.split())  # One line, no tabs
+        with self._lock, self._file_lock:
+            self._catch_up()
+            task_id = self._next_id
+            self._next_id += 1
+            self._tasks[task_id] = text
+            self._append(f"+{task_id}\t{text}\n")
+        return task_id
+
+    def add_many(self, texts):
+        """Adds many tasks with one journal write. Returns the number added."""
+        texts = [" ".join(text.split()) for text in texts]
+        with self._lock, self._file_lock:
+            self._catch_up()
+            first_id = self._next_id
+            self._next_id += len(texts)
+            self._tasks.update(zip(range(first_id, self._next_id), texts))
+            self._append("".join(f"+{task_id}\t{text}\n" for task_id, text in enumerate(texts, first_id)),
+                         record_count=len(texts))
+        return len(texts)
+
+    def delete(self, task_id):
+        """Deletes a task and returns its text. Raises KeyError for an unknown ID."""
+        with self._lock, self._file_lock:
+            self._catch_up()
+            text = self._tasks.pop(task_id)
+            self._note_deleted(task_id)
+            self._append(f"-{task_id}\n")
+        return text
+
+    def _append(self, record, record_count=1):
+        # Written through before the lock is released, so other processes
+        # never see half a record; only the fsync is batched
+        data = record.encode("utf-8")
+        self._journal.write(data)
+        self._journal.flush()
+        self._read_offset += len(data)
+        self._journal_records += record_count
+        self._pending += record_count
+        if self._pending >= self.sync_every:
+            self._sync_locked()
+        if self._journal_records > max(self.compact_after, len(self._tasks)) and self._compactor is None:
+            self.compact()
+
+    # --- Durability ---
+
+    def _sync_locked(self):
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._pending = 0
+
+    def sync(self):
+        """Forces every change so far onto disk."""
+        with self._lock:
+            if self._pending:
+                self._sync_locked()
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.sync_interval):
+            self.sync()
+
+    def compact(self, wait=False):
+        """
+        Starts writing a new snapshot in the background and switches appends to
+        a fresh journal. With wait=True, returns once the snapshot is on disk.
+        """
+        with self._lock, self._file_lock:
+            compactor = self._compactor
+            if compactor is None:
+                self._catch_up()
+                generation = self._generation + 1
+                self._journal.write(f">{generation}\n".encode("utf-8"))
+                self._sync_locked()
+                self._open_journal(generation)
+                state = list(self._tasks.items())
+                compactor = threading.Thread(target=self._write_snapshot,
+                                             args=(state, generation, self._next_id), daemon=True)
+                self._compactor = compactor
+                compactor.start()
+        if wait:
+            compactor.join()
+
+    def _write_snapshot(self, state, generation, next_id):
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(f"{SNAPSHOT_HEADER} generation={generation} next_id={next_id}\n")
+            file.writelines(f"{task_id}\t{text}\n" for task_id, text in state)
+            file.flush()
+            os.fsync(file.fileno())
+        with self._lock, self._file_lock:
+            # Another process may have written a newer snapshot meanwhile
+            if _snapshot_generation(self.path) < generation:
+                os.replace(temp_path, self.path)
+            else:
+                os.remove(temp_path)
+            current = _snapshot_generation(self.path)
+            for name in glob.glob(glob.escape(self.path) + ".journal.*"):
+                if int(name.rsplit(".", 1)[1]) < current:
+                    try:
+                        os.remove(name)
+                    except PermissionError:  # Still open in another process on Windows
+                        pass
+            self._compactor = None
+
+    def close(self):
+        """Waits for a running compaction, syncs the journal and closes it."""
+        self._closed.set()
+        self._flusher.join()
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            self._sync_locked()
+            self._journal.close()
+            self._reader.close()
+            self._file_lock.close()
+
+
+# --- Benchmark ---
+
+def benchmark(task_count=1_000_000, directory=None):
+    """
+    Compares saving one change with a full rewrite (the original save_tasks)
+    against a journal append at task_count tasks, and times adds, compaction
+    and startup. Returns {name: seconds}.
+    """
+    timings = {}
+    with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+        path = os.path.join(temp_dir, "todo_list.txt")
+        tasks = [f"Task number {i}" for i in range(task_count)]
+
+        start = time.perf_counter()
+        with open(path, "w") as file:
+            for task in tasks:
+                file.write(task + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        timings["full_rewrite_save"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = JournaledTaskStore(path)
+        timings["load_plain_file"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.add("One more task")
+        store.sync()
+        timings["journal_save"] = time.perf_counter() - start
+
+        adds = min(task_count, 200_000)
+        start = time.perf_counter()
+        for i in range(adds):
+            store.add(f"Added task {i}")
+        store.sync()
+        timings["adds"] = (time.perf_counter() - start, adds)
+
+        start = time.perf_counter()
+        store.compact(wait=True)
+        timings["compaction"] = time.perf_counter() - start
+        for task_id in store.ids()[:1000]:
+            store.delete(task_id)
+        store.close()
+
+        start = time.perf_counter()
+        store = JournaledTaskStore(path)
+        timings["load_snapshot_and_tail"] = time.perf_counter() - start
+        assert len(store) == task_count + 1 + adds - 1000
+        store.close()
+    return timings
+
+
+# --- Concurrency Stress Test ---
+
+def _stress_writer(path, writer, count, compact_after, results):
+    store = JournaledTaskStore(path, compact_after=compact_after)
+    start = time.perf_counter()
+    for i in range(count):
+        task_id = store.add(f"writer {writer} task {i}")
+        if i % 10 == 9:
+            # Delete and re-add one task now and then, so deletes race with adds too
+            store.delete(task_id)
+            store.add(f"writer {writer} task {i}")
+    store.close()
+    results.put(time.perf_counter() - start)
+
+
+def stress_test(writers=4, tasks_per_writer=5_000, compact_after=2_000, directory=None):
+    """
+    Runs `writers` processes adding tasks to one list at the same time, with
+    compactions happening along the way, then reopens the list and checks
+    that every task survived exactly once.
+    Returns (operations_per_second, task_count).
+    """
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+        path = os.path.join(temp_dir, "todo_list.txt")
+        results = context.Queue()
+        processes = [context.Process(target=_stress_writer, args=(path, writer, tasks_per_writer, compact_after, results))
+                     for writer in range(writers)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+        if any(process.exitcode != 0 for process in processes):
+            raise RuntimeError("A writer process failed.")
+
+        store = JournaledTaskStore(path)
+        texts = [text for _, text in store.items()]
+        store.close()
+        expected = {f"writer {writer} task {i}" for writer in range(writers) for i in range(tasks_per_writer)}
+        if len(texts) != len(expected) or set(texts) != expected:
+            missing = len(expected - set(texts))
+            raise AssertionError(f"Lost updates: {missing} missing, {len(texts) - len(set(texts))} duplicated.")
+    operations = writers * tasks_per_writer * 1.2  # Every tenth add also deletes and re-adds
+    return operations / elapsed, len(texts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark or stress-test the journaled to-do store.")
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="Tasks in the list.")
+    parser.add_argument("--stress", type=int, metavar="WRITERS", help="Run the multi-process stress test instead.")
+    parser.add_argument("--per-writer", type=int, default=5_000, help="Tasks each stress-test writer adds.")
+    args = parser.parse_args(argv)
+    if args.stress:
+        rate, count = stress_test(args.stress, args.per_writer)
+        print(f"{args.stress} writers: all {count:,} tasks survived, {rate:,.0f} ops/s")
+        return
+    timings = benchmark(args.tasks)
+    seconds, adds = timings.pop("adds")
+    print(f"{args.tasks:,} tasks")
+    for name, value in timings.items():
+        print(f"  {name:<24} {value * 1000:10.2f} ms")
+    print(f"  {'adds':<24} {adds / seconds:10,.0f} tasks/s")
+
+
+if __name__ == "__main__":
+    main()
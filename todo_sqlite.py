@@ -0,0 +1,338 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+# --- SQLite Task Storage ---
+# Optional backend for "to do list.py" ("--backend sqlite"). Tasks get stable
+# integer IDs (AUTOINCREMENT: the ID of a deleted task is never handed out
+# again) and status / priority / due-date columns, each with an index.
+# An FTS5 table (kept in sync by triggers) gives word search over the task text.
+# Triggers also log every deleted or updated task ID to task_changes (one small
+# row per change), so views built on the table can catch up: changes_since().
+# Only the last CHANGE_LOG_LIMIT changes are kept; a view further behind than
+# that is told to rebuild instead.
+#
+# Viewing uses keyset ("cursor") paging: each page query starts from the last
+# row of the previous page (WHERE (priority, id) > (?, ?) ...), so only one
+# screen of tasks is read, however deep into the list the user is.
+#
+# WAL mode lets several processes read and write the same database at once.
+
+DEFAULT_DB_FILE = "todo_list.db"
+PAGE_SIZE = 20
+STATUSES = ("open", "done")
+DEFAULT_PRIORITY = 3  # 1 (highest) to 5 (lowest)
+CHANGE_LOG_LIMIT = 10_000  # Changes kept for changes_since(); older ones are pruned in blocks of 1024
+
+# order name -> (sort columns, extra filter); the task id always breaks ties
+ORDERS = {
+    "id": ((), ""),
+    "priority": (("priority",), ""),
+    "due": (("due",), "due IS NOT NULL"),  # Only tasks that have a due date
+}
+
+TASKS_TABLE = """
+CREATE TABLE IF NOT EXISTS {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'open',
+    priority INTEGER NOT NULL DEFAULT 3,
+    due TEXT
+);
+"""
+
+SCHEMA = TASKS_TABLE.format(name="tasks") + """
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS tasks_by_priority ON tasks(priority);
+CREATE INDEX IF NOT EXISTS tasks_by_due ON tasks(due);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(text, content='tasks', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF text ON tasks BEGIN
+    INSERT INTO tasks_fts(tasks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO tasks_fts(rowid, text) VALUES (new.id, new.text);
+END;
+
+CREATE TABLE IF NOT EXISTS task_changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, id INTEGER NOT NULL);
+CREATE TRIGGER IF NOT EXISTS tasks_log_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO task_changes(id) VALUES (old.id);
+END;
+CREATE TRIGGER IF NOT EXISTS tasks_log_update AFTER UPDATE ON tasks BEGIN
+    INSERT INTO task_changes(id) VALUES (old.id);
+END;
+CREATE TRIGGER IF NOT EXISTS task_changes_prune AFTER INSERT ON task_changes WHEN new.seq % 1024 = 0 BEGIN
+    DELETE FROM task_changes WHERE seq <= new.seq - {limit};
+END;
+""".format(limit=CHANGE_LOG_LIMIT)
+
+COLUMNS = "id, text, status, priority, due"
+
+
+def _fts_query(text):
+    """Turns free text into a safe FTS5 query: every word must match as a prefix."""
+    words = [word.replace('"', '""') for word in text.split()]
+    if not words:
+        raise ValueError("Enter at least one word to search for.")
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class SqliteTaskStore:
+    """
+    Tasks in an SQLite database. Rows are (id, text, status, priority, due)
+    tuples; due is an ISO date string ("2025-01-31") or None.
+    """
+
+    def __init__(self, path=DEFAULT_DB_FILE):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.connection.executescript(SCHEMA)
+
+    def _migrate(self):
+        """Rebuilds a tasks table from before AUTOINCREMENT, keeping every ID."""
+        row = self.connection.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tasks'").fetchone()
+        if row is None or "AUTOINCREMENT" in row[0].upper():
+            return
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute(TASKS_TABLE.format(name="tasks_autoincrement"))
+            self.connection.execute(f"INSERT INTO tasks_autoincrement ({COLUMNS}) SELECT {COLUMNS} FROM tasks")
+            self.connection.execute("DROP TABLE tasks")  # Its indexes and triggers go too; SCHEMA recreates them
+            self.connection.execute("ALTER TABLE tasks_autoincrement RENAME TO tasks")
+
+    def _check(self, status=None, priority=None):
+        if status is not None and status not in STATUSES:
+            raise ValueError(f"Status must be one of: {', '.join(STATUSES)}.")
+        if priority is not None and not 1 <= priority <= 5:
+            raise ValueError("Priority must be between 1 and 5.")
+
+    # --- Changes ---
+
+    def add(self, text, status="open", priority=DEFAULT_PRIORITY, due=None):
+        """Adds a task and returns its ID."""
+        self._check(status, priority)
+        cursor = self.connection.execute(
+            "INSERT INTO tasks (text, status, priority, due) VALUES (?, ?, ?, ?)", (text, status, priority, due))
+        return cursor.lastrowid
+
+    def add_many(self, rows):
+        """
+        Adds many tasks in one transaction. rows yields task texts or
+        (text, status, priority, due) tuples. Returns the number added.
+        """
+        rows = ((row, "open", DEFAULT_PRIORITY, None) if isinstance(row, str) else row for row in rows)
+        with self.connection:
+            self.connection.execute("BEGIN")
+            cursor = self.connection.executemany(
+                "INSERT INTO tasks (text, status, priority, due) VALUES (?, ?, ?, ?)", rows)
+        return cursor.rowcount
+
+    def delete(self, task_id):
+        """Deletes a task and returns its text. Raises KeyError for an unknown ID."""
+        row = self.connection.execute("DELETE FROM tasks WHERE id = ? RETURNING text", (task_id,)).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+        return row[0]
+
+    def set_status(self, task_id, status):
+        self._check(status=status)
+        if self.connection.execute("UPDATE tasks SET status = ? WHERE id = ?", (status, task_id)).rowcount == 0:
+            raise KeyError(task_id)
+
+    # --- Reading ---
+
+    def get(self, task_id):
+        """Returns the text of one task. Raises KeyError for an unknown ID."""
+        return self.get_row(task_id)[1]
+
+    def get_row(self, task_id):
+        """Returns the full row of one task. Raises KeyError for an unknown ID."""
+        row = self.connection.execute(f"SELECT {COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise KeyError(task_id)
+        return row
+
+    def changes_since(self, token=None):
+        """
+        IDs of tasks deleted or updated (by any process) since `token`. Returns
+        (ids, new_token); pass new_token back next time. token=None starts now.
+        ids is None when changes since `token` may have been pruned, and a view
+        built on the table should be rebuilt.
+        """
+        with self.connection:
+            self.connection.execute("BEGIN")  # One snapshot for both queries
+            last = self.connection.execute("SELECT coalesce(max(seq), 0) FROM task_changes").fetchone()[0]
+            if token is None:
+                return [], last
+            if token < last - CHANGE_LOG_LIMIT:
+                return None, last
+            rows = self.connection.execute(
+                "SELECT id FROM task_changes WHERE seq > ? AND seq <= ? ORDER BY seq", (token, last)).fetchall()
+        return list(dict.fromkeys(task_id for task_id, in rows)), last
+
+    def __contains__(self, task_id):
+        return self.connection.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone() is not None
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM tasks").fetchone()[0]
+
+    def page(self, cursor=None, limit=PAGE_SIZE, order="id", status=None):
+        """
+        Returns (rows, next_cursor) for one page of tasks. Pass next_cursor
+        back in to get the following page; it is None after the last page.
+        order is "id" (oldest first), "priority" (highest first) or "due" (soonest first).
+        """
+        self._check(status)
+        sort_columns, extra_filter = ORDERS[order]
+        key_columns = (*sort_columns, "id")
+        conditions, parameters = [], []
+        if extra_filter:
+            conditions.append(extra_filter)
+        if status is not None:
+            conditions.append("status = ?")
+            parameters.append(status)
+        if cursor is not None:
+            conditions.append(f"({', '.join(key_columns)}) > ({', '.join('?' * len(key_columns))})")
+            parameters.extend(cursor)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            f"SELECT {COLUMNS} FROM tasks {where} ORDER BY {', '.join(key_columns)} LIMIT ?",
+            (*parameters, limit)).fetchall()
+        if len(rows) < limit:
+            return rows, None
+        last = rows[-1]
+        positions = {"id": 0, "priority": 3, "due": 4}
+        return rows, tuple(last[positions[column]] for column in key_columns)
+
+    def iter_rows(self, after=None, batch_size=1000):
+        """Yields full rows in ID order, starting after ID `after`, one page at a time."""
+        cursor = None if after is None else (after,)
+        while True:
+            rows, cursor = self.page(cursor, limit=batch_size)
+            yield from rows
+            if cursor is None:
+                return
+
+    def iter_items(self, after=None):
+        """Yields (id, text) pairs in ID order, starting after ID `after`."""
+        for row in self.iter_rows(after):
+            yield row[0], row[1]
+
+    def items(self):
+        return self.iter_items()
+
+    def ids(self):
+        return [task_id for task_id, _ in self.items()]
+
+    def search(self, text, limit=PAGE_SIZE):
+        """
+        Returns up to `limit` rows whose text contains every word (as a prefix),
+        newest first. Rowid order (not relevance) lets FTS5 stop at the limit
+        instead of ranking every match.
+        """
+        return self.connection.execute(
+            f"SELECT {', '.join('t.' + column for column in COLUMNS.split(', '))} "
+            "FROM tasks_fts JOIN tasks t ON t.id = tasks_fts.rowid "
+            "WHERE tasks_fts MATCH ? ORDER BY tasks_fts.rowid DESC LIMIT ?", (_fts_query(text), limit)).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+
+# --- Benchmark ---
+
+def _flat_file_operations(path):
+    """The original script's path: load every line, pop by position, rewrite the file."""
+    timings = {}
+    start = time.perf_counter()
+    with open(path, "r") as file:
+        loaded = [line.strip() for line in file.readlines()]
+    timings["open"] = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded[len(loaded) // 2:len(loaded) // 2 + PAGE_SIZE]
+    timings["view page"] = time.perf_counter() - start
+    start = time.perf_counter()
+    [task for task in loaded if "report" in task][:PAGE_SIZE]
+    timings["search"] = time.perf_counter() - start
+    start = time.perf_counter()
+    loaded.pop(len(loaded) // 2)
+    loaded.append("One more task")
+    with open(path, "w") as file:
+        for task in loaded:
+            file.write(task + "\n")
+    timings["delete + add + save"] = time.perf_counter() - start
+    return timings
+
+
+def _sqlite_operations(path, task_count):
+    timings = {}
+    start = time.perf_counter()
+    store = SqliteTaskStore(path)
+    timings["open"] = time.perf_counter() - start
+    start = time.perf_counter()
+    store.page((task_count // 2,))
+    timings["view page"] = time.perf_counter() - start
+    start = time.perf_counter()
+    store.search("report")
+    timings["search"] = time.perf_counter() - start
+    start = time.perf_counter()
+    store.delete(task_count // 2)
+    store.add("One more task")
+    timings["delete + add + save"] = time.perf_counter() - start
+    store.close()
+    return timings
+
+
+def benchmark(sizes=(10**4, 10**5, 10**6), directory=None):
+    """
+    Times opening, viewing one page from the middle, searching, and one
+    delete + add + save at each list size, for the flat file and SQLite.
+    Returns {size: {"flat": timings, "sqlite": timings, "build": seconds}}.
+    """
+    words = ("call", "email", "report", "groceries", "meeting", "invoice", "review")
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory(dir=directory) as temp_dir:
+            tasks = [f"{words[i % 7]} {words[(i // 7) % 7]} number {i}" for i in range(size)]
+            flat_path = os.path.join(temp_dir, "todo_list.txt")
+            with open(flat_path, "w") as file:
+                file.writelines(task + "\n" for task in tasks)
+            db_path = os.path.join(temp_dir, "todo_list.db")
+            start = time.perf_counter()
+            store = SqliteTaskStore(db_path)
+            store.add_many(tasks)
+            store.close()
+            build_seconds = time.perf_counter() - start
+            del tasks
+            results[size] = {
+                "flat": _flat_file_operations(flat_path),
+                "sqlite": _sqlite_operations(db_path, size),
+                "build": build_seconds,
+            }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite to-do store against the flat file.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5, 10**6],
+                        help="List sizes to test (10000000 takes a few minutes).")
+    args = parser.parse_args(argv)
+    for size, result in benchmark(args.sizes).items():
+        print(f"{size:,} tasks (SQLite bulk load {result['build']:.1f}s)")
+        for operation in result["flat"]:
+            flat_ms = result["flat"][operation] * 1000
+            sqlite_ms = result["sqlite"][operation] * 1000
+            print(f"  {operation:<20} flat file {flat_ms:10.2f} ms   sqlite {sqlite_ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()